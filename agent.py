@@ -1,8 +1,12 @@
 from dotenv import load_dotenv
+import logging
 import os
+import time
+
+import psutil
 
 from livekit import agents
-from livekit.agents import AgentSession, Agent, RoomInputOptions, JobContext
+from livekit.agents import AgentSession, Agent, RoomInputOptions, JobContext, RunContext
 from livekit.agents.llm import LLMStream, function_tool
 from livekit import rtc
 from livekit.plugins import (
@@ -13,49 +17,22 @@ from livekit.plugins import (
     silero,
 )
 from cal_integration import MeetingBookingHandler
+from contact_extractor import ContactExtractor
+from filler_audio import FILLER_TTS_MODEL, FILLER_TTS_VOICE, filler_library, play_filler
+from http_pool import http_pool
+from portfolio_index import load_portfolio_index
+from room_filter import request_room
+from session_startup import SESSION_STARTUP_MODE, TTSCandidate, pick_tts, startup_stats
+from slot_index import describe_slot
+from structured_logging import set_log_context, setup_logging
+from tts_cache import CachedTTS, tts_audio_cache
+from voice_text import clean_text_for_voice, clean_text_stream
+from worker_load import WORKER_LOAD_THRESHOLD, LoopLagProbe, report_load
 # from livekit.plugins.turn_detector.multilingual import MultilingualModel
 
 load_dotenv()
 
-# Clean text for voice output by removing markdown and formatting
-def clean_text_for_voice(text: str) -> str:
-    """Remove markdown formatting and clean text for natural speech"""
-    import re
-    
-    # Remove markdown bold/italic markers (comprehensive patterns)
-    text = re.sub(r'\*\*([^*]+?)\*\*', r'\1', text)  # **bold** -> bold
-    text = re.sub(r'\*([^*]+?)\*', r'\1', text)      # *italic* -> italic
-    text = re.sub(r'__([^_]+?)__', r'\1', text)      # __bold__ -> bold
-    text = re.sub(r'_([^_]+?)_', r'\1', text)        # _italic_ -> italic
-    
-    # Remove any remaining asterisks or underscores
-    text = re.sub(r'\*+', '', text)  # Remove any asterisks
-    text = re.sub(r'_+', '', text)   # Remove any underscores
-    
-    # Remove markdown headers
-    text = re.sub(r'^#{1,6}\s+', '', text, flags=re.MULTILINE)
-    
-    # Remove markdown links but keep the text
-    text = re.sub(r'\[([^\]]+)\]\([^)]+\)', r'\1', text)
-    
-    # Remove code blocks and inline code
-    text = re.sub(r'```[^`]*```', '', text, flags=re.DOTALL)
-    text = re.sub(r'`([^`]+)`', r'\1', text)
-    
-    # Remove other markdown symbols
-    text = re.sub(r'[#`~\[\]\(\)\{\}]', '', text)
-    
-    # Convert common symbols to spoken words if needed
-    text = re.sub(r'&', 'and', text)
-    text = re.sub(r'@', 'at', text)
-    
-    # Clean up extra whitespace and normalize spacing
-    text = re.sub(r'\s+', ' ', text).strip()
-    
-    # Remove any trailing or leading punctuation that might cause issues
-    text = re.sub(r'^[.,;:!?\s]+|[.,;:!?\s]+$', '', text)
-    
-    return text
+logger = logging.getLogger(__name__)
 
 # Load portfolio context from scraped data
 def load_portfolio_context():
@@ -68,66 +45,144 @@ def load_portfolio_context():
     except FileNotFoundError:
         return "Portfolio context not available. Please run the portfolio scraping script first."
 
-PORTFOLIO_CONTEXT = load_portfolio_context()
+# Retrieval index over the portfolio data; only matching passages reach the LLM.
+# The compiled artifact is memory-mapped so job processes share its pages.
+_index_started = time.perf_counter()
+portfolio_index = load_portfolio_index()
+# Logged from prewarm, once the process's logging is set up
+_index_load_ms = (time.perf_counter() - _index_started) * 1000
+PORTFOLIO_OVERVIEW = portfolio_index.overview()
 
 # Global booking handler instance
 booking_handler = MeetingBookingHandler()
 
 # Function tools for booking
 @function_tool(description="Get available times for scheduling a consultation meeting. Use this when someone asks about booking or scheduling.")
-async def get_available_times() -> str:
+async def get_available_times(context: RunContext) -> str:
     """Get available meeting times for scheduling"""
-    print("DEBUG: get_available_times function called")
-    result = await booking_handler.cal_booking.get_formatted_available_times()
-    print(f"DEBUG: Available times result: {result}")
+    logger.debug("get_available_times function called")
+    async with play_filler(context, 'availability'):
+        result = await booking_handler.cal_booking.get_formatted_available_times()
+    logger.debug("Available times result: %s", result)
     return result
 
-@function_tool(description="Book a meeting with the provided name and email. Use this when someone provides their contact information for booking.")
-async def create_meeting_booking(name: str, email: str, preferred_time: str = "") -> str:
+@function_tool(description="Book a meeting with the provided name and email. Use this when someone provides their contact information for booking. Pass the caller's preferred time in their own words, e.g. 'tomorrow at 10 AM' or 'Thursday afternoon', or leave it empty for the first available slot.")
+async def create_meeting_booking(context: RunContext, name: str, email: str, preferred_time: str = "") -> str:
     """Create a new meeting booking with provided contact information"""
-    print(f"DEBUG: create_meeting_booking called with name: {name}, email: {email}, time: {preferred_time}")
+    logger.debug("create_meeting_booking called with name: %s, email: %s, time: %s", name, email, preferred_time)
     
-    # Get available slots and book the first one if no specific time is preferred
-    available_slots = await booking_handler.cal_booking.get_available_slots()
+    # Details parsed from the caller's own transcripts while they were speaking
+    extractor: ContactExtractor = context.userdata
+    email = extractor.validated_email(email)
     
-    if not available_slots:
-        return "I'm sorry, but I don't see any available slots right now. Please check back later or visit the website to book directly."
+    async with play_filler(context, 'booking'):
+        # Reuse the booking started when the caller finished speaking, if it is for the same details
+        speculative = extractor.take_booking(name, email)
+        if speculative is not None:
+            booking_result = await speculative
+        else:
+            booking_result = await booking_handler.book_meeting(name, email, preferred_time)
     
-    # For now, just book the first available slot
-    booking_result = await booking_handler.cal_booking.create_booking(
-        name=name,
-        email=email,
-        start_time=available_slots[0],
-        message="Meeting booked via voice AI assistant"
-    )
+    if booking_result is None:
+        return "I'm sorry, but I don't see any available slots right now. Please check back later or visit the website to book directly."
     
-    print(f"DEBUG: Booking result: {booking_result}")
+    if 'alternatives' in booking_result:
+        # The preferred time is taken; let the caller pick one of the nearest open slots
+        return booking_result['message']
     
     if booking_result['success']:
-        return f"Perfect! I've successfully booked your consultation call. You should receive a confirmation email at {email} shortly with all the details. Looking forward to our conversation!"
+        return f"Perfect! I've successfully booked your consultation call for {describe_slot(booking_result['start_time'])}. You should receive a confirmation email at {email} shortly with all the details. Looking forward to our conversation!"
     else:
         return f"I apologize, but there was an issue booking the meeting: {booking_result.get('error', 'Unknown error')}. Please try booking directly on the website or contact me via email."
 
 # Create list of function tools
 booking_tools = [get_available_times, create_meeting_booking]
 
+@function_tool(description="Look up details about the portfolio owner's projects, skills, technologies and background. Use this before answering any question about their work.")
+async def lookup_portfolio(query: str) -> str:
+    """Return the portfolio passages most relevant to the query"""
+    result = portfolio_index.lookup(query)
+    logger.debug("lookup_portfolio('%s') returned %d chars", query, len(result or ''))
+    return result or "I couldn't find anything about that in the portfolio."
+
+portfolio_tools = [lookup_portfolio]
+
+
+class PortfolioAgent(Agent):
+    """Portfolio assistant that strips markdown from LLM deltas on their way to TTS"""
+    
+    async def tts_node(self, text, model_settings):
+        async for frame in Agent.default.tts_node(self, clean_text_stream(text), model_settings):
+            yield frame
 
 
+def rss_mb() -> float:
+    """Resident memory of this process in MB"""
+    return psutil.Process().memory_info().rss / (1024 * 1024)
+
+
+def prewarm(proc: agents.JobProcess):
+    """Load the Silero VAD model once per process and share it with every session in it"""
+    # Logging calls in this job process only enqueue; a background thread writes them out
+    setup_logging()
+    logger.info("Portfolio index loaded from %s in %.1f ms", portfolio_index.source, _index_load_ms)
+    started = time.perf_counter()
+    rss_before = rss_mb()
+    proc.userdata["vad"] = silero.VAD.load()
+    # Filler clips are played straight from memory, never through the TTS API
+    clips = filler_library.load()
+    logger.info("Prewarm: Silero VAD and %d filler clips loaded in %.0f ms, RSS %.0f MB -> %.0f MB",
+                clips, (time.perf_counter() - started) * 1000, rss_before, rss_mb())
+
 
 async def entrypoint(ctx: agents.JobContext):
-    # Filter rooms - only join portfolio voice rooms
+    join_started = time.perf_counter()
+    
+    # Only rooms matching ROOM_FILTER get here; request_room rejects the rest before a job starts
     room_name = ctx.room.name if ctx.room else "unknown"
     
-    if not room_name.startswith("portfolio-voice-"):
-        print(f"Skipping non-portfolio room: {room_name}")
-        return  # Don't join this room
+    # Every record logged from this job, including tasks it starts, carries the room and job ids
+    set_log_context(room=room_name, job=ctx.job.id)
+    logger.info("Agent joining portfolio voice room: %s", room_name)
+    
+    # Hold this process's Cal.com connection pool for the lifetime of this job
+    http_pool.acquire()
     
-    print(f"Agent joining portfolio voice room: {room_name}")
+    # This job's event-loop lag feeds the worker's load report
+    lag_probe = LoopLagProbe()
+    lag_probe.start()
+    
+    # Fetch availability while the session starts so get_available_times is served from memory
+    prefetch_task = None
+    if os.getenv("PREFETCH_AVAILABILITY", "true").lower() != "false":
+        prefetch_task = booking_handler.cal_booking.prefetch_available_slots()
+    
+    # Name, email and preferred time are parsed from interim transcripts as the caller speaks
+    extractor = ContactExtractor(booking_handler)
     
     # Add shutdown callback for cleanup (LiveKit best practice)
     async def cleanup_session():
-        print(f"Session ending for room: {ctx.room.name}")
-        # Add any cleanup logic here (e.g., save conversation history)
+        # Flush this room's booking state and drop the in-process copy; the stored one stays
+        # for a job that picks the room up, until the backend purges it as idle
+        await booking_handler.end_session(ctx.room.name)
+        logger.info("Session ending for room: %s", ctx.room.name, extra={
+            'http_pool': http_pool.stats(),
+            'slot_cache': booking_handler.cal_booking.slot_cache.stats(),
+            'booking_ledger': booking_handler.cal_booking.booking_ledger.stats(),
+            'cal_breaker': booking_handler.cal_booking.breaker.stats(),
+            'filler_audio': filler_library.stats(),
+            'tts_cache': tts_audio_cache.stats(),
+            'startup_probes': startup_stats.stats(),
+            'contact_extractor': extractor.stats(),
+            'booking_sessions': booking_handler.booking_context.stats(),
+            'rss_mb': round(rss_mb()),
+            'loop_lag_ms': round(lag_probe.lag * 1000, 1),
+        })
+        if prefetch_task and not prefetch_task.done():
+            prefetch_task.cancel()
+        # Close pooled connections when the job ends
+        await http_pool.release()
+        await lag_probe.stop()
         
     ctx.add_shutdown_callback(cleanup_session)
     
@@ -135,7 +190,7 @@ async def entrypoint(ctx: agents.JobContext):
     await ctx.connect()
     
     # Create the agent with booking tools
-    agent = Agent(
+    agent = PortfolioAgent(
         instructions=f"""You are a helpful voice AI assistant for a developer's portfolio website. 
         You represent the portfolio owner with genuine passion, friendliness, and detailed knowledge.
         
@@ -171,8 +226,10 @@ async def entrypoint(ctx: agents.JobContext):
         - Professional yet personable
         - Helpful with scheduling and next steps
         
-        COMPLETE PORTFOLIO INFORMATION:
-        {PORTFOLIO_CONTEXT}
+        PORTFOLIO KNOWLEDGE:
+        - {PORTFOLIO_OVERVIEW}
+        - Before answering questions about projects, skills, technologies or experience, call lookup_portfolio with the topic
+        - Answer only from what lookup_portfolio returns, and call it again for follow-up topics
         
         BOOKING PRIORITY INSTRUCTIONS:
         - ALWAYS prioritize booking requests above all other topics
@@ -205,7 +262,7 @@ async def entrypoint(ctx: agents.JobContext):
         
         IMPORTANT: When someone mentions booking, meeting, or scheduling, immediately call get_available_times. When they provide name and email, immediately call create_meeting_booking.
         """,
-        tools=booking_tools
+        tools=booking_tools + portfolio_tools
     )
     
     # Create the LLM instance with faster model
@@ -214,59 +271,82 @@ async def entrypoint(ctx: agents.JobContext):
         temperature=0.6,  # Slightly lower for more consistent responses
     )
     
-    # Create the agent session with optimized settings for performance
-    session = AgentSession(
-        stt=deepgram.STT(
-            model="nova-2",  # Use faster model instead of nova-3
-            language="en",   # Use specific language instead of multi
-        ),
-        llm=llm,
-        tts=cartesia.TTS(
-            model="sonic-2",   # High quality Cartesia model
-            voice="8e093c57-1b16-461f-bb39-893c9992c710",  # Your custom cloned voice
+    # Reuse the VAD preloaded by prewarm; only load here if the hook did not run
+    vad = ctx.proc.userdata.get("vad")
+    if vad is None:
+        vad = silero.VAD.load()
+        ctx.proc.userdata["vad"] = vad
+    
+    # Speech-to-text shared by every candidate configuration
+    stt = deepgram.STT(
+        model="nova-2",  # Use faster model instead of nova-3
+        language="en",   # Use specific language instead of multi
+    )
+    
+    # TTS configurations in order of preference
+    # Fixed and recurring sentences replay from the audio cache
+    primary_tts = CachedTTS(
+        cartesia.TTS(
+            model=FILLER_TTS_MODEL,  # High quality Cartesia model
+            voice=FILLER_TTS_VOICE,  # Your custom cloned voice
             api_key=os.environ.get("CARTESIA_API_KEY"),  # Explicit API key
         ),
-        vad=silero.VAD.load(),  # Use default parameters
-        # turn_detection=MultilingualModel(),  # Disabled due to ONNX compatibility issues
+        voice=FILLER_TTS_VOICE,
     )
-
-    # Start the session with timeout and retry logic
-    try:
-        await session.start(
-            room=ctx.room,
-            agent=agent,
-            room_input_options=RoomInputOptions(
-                # Disable noise cancellation for better performance on free tier
-                noise_cancellation=None, 
+    candidates = [
+        TTSCandidate("cartesia-sonic-2", primary_tts),
+        TTSCandidate("cartesia-sonic-1", CachedTTS(
+            cartesia.TTS(
+                model="sonic-1",  # Faster model for fallback
+                voice="2ee87190-8f84-4925-97da-e52547f9462c",  # Default professional voice
             ),
+            voice="2ee87190-8f84-4925-97da-e52547f9462c",
+        )),
+        # Final fallback if Cartesia completely fails
+        TTSCandidate("openai-tts-1", openai.TTS(model="tts-1", voice="alloy")),
+    ]
+    
+    if SESSION_STARTUP_MODE == "hedged":
+        # Probe the primary first and hedge to the fallbacks, so a dead one costs one deadline, not one timeout each
+        chosen, probe = await pick_tts(candidates, stt=stt)
+        logger.info("Startup probes: %s errors: %s -> %s", probe['latency'], probe['errors'], chosen.name)
+        candidates.remove(chosen)
+        candidates.insert(0, chosen)
+    
+    # Start the session, falling back through the remaining configurations
+    for attempt, candidate in enumerate(candidates):
+        session = AgentSession(
+            stt=stt,
+            llm=llm,
+            tts=candidate.tts,
+            vad=vad,  # Shared preloaded model with default parameters
+            # turn_detection=MultilingualModel(),  # Disabled due to ONNX compatibility issues
+            userdata=extractor,
         )
-        print("Agent session started successfully")
-    except Exception as e:
-        print(f"Failed to start agent session: {e}")
-        # Try to restart with Cartesia fallback configuration
-        print("Retrying with Cartesia fallback configuration...")
+        session.on("user_input_transcribed",
+                   lambda ev: extractor.on_transcript(ev.transcript, ev.is_final))
         try:
-            fallback_session = AgentSession(
-                stt=deepgram.STT(model="nova-2", language="en"),
-                llm=llm,
-                tts=cartesia.TTS(
-                    model="sonic-1",  # Faster model for fallback
-                    voice="2ee87190-8f84-4925-97da-e52547f9462c",  # Default professional voice
+            await session.start(
+                room=ctx.room,
+                agent=agent,
+                room_input_options=RoomInputOptions(
+                    # Disable noise cancellation for better performance on free tier
+                    noise_cancellation=None, 
                 ),
-                vad=silero.VAD.load(),
             )
-            await fallback_session.start(room=ctx.room, agent=agent)
-        except Exception as fallback_error:
-            print(f"Cartesia fallback also failed: {fallback_error}")
-            # Final fallback to OpenAI TTS if Cartesia completely fails
-            print("Using OpenAI TTS as final fallback...")
-            final_session = AgentSession(
-                stt=deepgram.STT(model="nova-2", language="en"),
-                llm=llm,
-                tts=openai.TTS(model="tts-1", voice="alloy"),
-                vad=silero.VAD.load(),
-            )
-            await final_session.start(room=ctx.room, agent=agent)
+        except Exception as e:
+            logger.error("Failed to start agent session with %s: %s", candidate.name, e)
+            if attempt == len(candidates) - 1:
+                raise
+            logger.info("Retrying with %s...", candidates[attempt + 1].name)
+            continue
+        
+        logger.info("Agent session started with %s in %.0f ms, RSS %.0f MB",
+                    candidate.name, (time.perf_counter() - join_started) * 1000, rss_mb())
+        if candidate.tts is primary_tts:
+            # First room on a fresh volume synthesises the filler clips once, in the cloned voice
+            filler_library.backfill(primary_tts)
+        break
 
     # The session will automatically handle user interactions
     # and generate responses based on the agent's instructions
@@ -290,7 +370,18 @@ if __name__ == "__main__":
     # Configure worker options for automatic dispatch
     worker_options = agents.WorkerOptions(
         entrypoint_fnc=entrypoint,
+        prewarm_fnc=prewarm,
+        # Decline rooms outside ROOM_FILTER before LiveKit hands us the job
+        request_fnc=request_room,
+        # Stop taking rooms once CPU, loop lag, memory or session count nears its limit
+        load_fnc=report_load,
+        load_threshold=WORKER_LOAD_THRESHOLD,
     )
+    # agent_supervisor gives each worker on the machine its own health port and share of warm processes
+    if os.getenv("AGENT_HTTP_PORT"):
+        worker_options.port = int(os.getenv("AGENT_HTTP_PORT"))
+    if os.getenv("AGENT_IDLE_PROCESSES"):
+        worker_options.num_idle_processes = int(os.getenv("AGENT_IDLE_PROCESSES"))
     
     # Start the agent worker
     agents.cli.run_app(worker_options)
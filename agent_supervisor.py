@@ -0,0 +1,213 @@
+import asyncio
+import collections
+import logging
+import os
+import signal
+import sys
+import threading
+import time
+from typing import Deque, Dict, List, Optional
+
+import psutil
+
+logger = logging.getLogger(__name__)
+
+# 0 sizes the pool from the cores and memory available to this machine
+AGENT_WORKERS = int(os.getenv('AGENT_WORKERS', '0'))
+# Budget per `agent.py start` worker: the worker plus its prewarmed job processes
+AGENT_WORKER_MEMORY_MB = float(os.getenv('AGENT_WORKER_MEMORY_MB', '1536'))
+# Seconds a terminated worker gets to finish its rooms before it is killed
+AGENT_DRAIN_TIMEOUT = float(os.getenv('AGENT_DRAIN_TIMEOUT', '30'))
+AGENT_RESTART_BACKOFF = float(os.getenv('AGENT_RESTART_BACKOFF', '1'))
+AGENT_RESTART_BACKOFF_MAX = float(os.getenv('AGENT_RESTART_BACKOFF_MAX', '60'))
+# A worker that stayed up this long restarts without backoff
+AGENT_STABLE_AFTER = 60.0
+# Each worker serves LiveKit's health endpoint on its own port from here up
+AGENT_HTTP_PORT_BASE = int(os.getenv('AGENT_HTTP_PORT', '8081'))
+
+AGENT_COMMAND = [sys.executable, 'agent.py', 'start']
+OUTPUT_TAIL_LINES = 20
+
+
+def available_cpus() -> int:
+    if hasattr(os, 'sched_getaffinity'):
+        return len(os.sched_getaffinity(0))
+    return os.cpu_count() or 1
+
+
+def size_workers(cpus: int, available_mb: float, worker_mb: float = AGENT_WORKER_MEMORY_MB) -> int:
+    """One worker per core, as many as fit in memory, and never fewer than one"""
+    return max(1, min(cpus, int(available_mb // worker_mb)))
+
+
+def default_worker_count() -> int:
+    if AGENT_WORKERS > 0:
+        return AGENT_WORKERS
+    return size_workers(available_cpus(), psutil.virtual_memory().available / (1024 * 1024))
+
+
+def _kill_group(pid: int):
+    try:
+        os.killpg(pid, signal.SIGKILL)
+    except (ProcessLookupError, PermissionError):
+        pass
+
+
+class AgentSupervisor:
+    """Run N agent worker processes, restart them with backoff and drain them on shutdown
+
+    Output is read through asyncio pipes and passed through unchanged, so a worker
+    that floods its output never blocks the others. The last lines of each worker
+    are kept and logged when it exits unexpectedly. start()/shutdown() may be
+    called from any thread; the supervisor runs on its own event loop.
+    """
+
+    def __init__(self,
+                 command: Optional[List[str]] = None,
+                 workers: Optional[int] = None,
+                 drain_timeout: Optional[float] = None,
+                 backoff: Optional[float] = None,
+                 max_backoff: Optional[float] = None,
+                 output=None):
+        self.command = command or AGENT_COMMAND
+        self.workers = workers or default_worker_count()
+        self.drain_timeout = drain_timeout if drain_timeout is not None else AGENT_DRAIN_TIMEOUT
+        self.backoff = backoff if backoff is not None else AGENT_RESTART_BACKOFF
+        self.max_backoff = max_backoff if max_backoff is not None else AGENT_RESTART_BACKOFF_MAX
+        self.output = output or sys.stdout
+
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._stopping: Optional[asyncio.Event] = None
+        self._thread: Optional[threading.Thread] = None
+        self._started = threading.Event()
+        self._processes: Dict[int, asyncio.subprocess.Process] = {}
+        self._tails: Dict[int, Deque[str]] = {}
+
+        self.restarts: Dict[int, int] = {}
+        self.exit_codes: Dict[int, List[int]] = {}
+
+    def worker_env(self, index: int) -> Dict[str, str]:
+        env = dict(os.environ)
+        env['AGENT_HTTP_PORT'] = str(AGENT_HTTP_PORT_BASE + index)
+        # Share the warm job processes and the machine's memory between the workers
+        env.setdefault('AGENT_IDLE_PROCESSES', str(max(1, available_cpus() // self.workers)))
+        total_mb = psutil.virtual_memory().total / (1024 * 1024)
+        env.setdefault('WORKER_MEMORY_BUDGET_MB', str(int(total_mb / self.workers)))
+        return env
+
+    def start(self, delay: float = 0) -> threading.Thread:
+        """Supervise the workers from a background thread"""
+        def main():
+            if delay:
+                time.sleep(delay)
+            asyncio.run(self.run())
+
+        self._thread = threading.Thread(target=main, name='agent-supervisor', daemon=True)
+        self._thread.start()
+        return self._thread
+
+    def shutdown(self):
+        """Ask every worker to drain, and wait until they have exited or been killed"""
+        if self._thread is None:
+            return
+        if self._started.wait(timeout=1):
+            self._loop.call_soon_threadsafe(self._stopping.set)
+        self._thread.join(self.drain_timeout + 5)
+
+    async def run(self):
+        self._loop = asyncio.get_running_loop()
+        self._stopping = asyncio.Event()
+        self._started.set()
+        logger.info("Supervising %d agent worker(s): %s", self.workers, ' '.join(self.command))
+        tasks = [asyncio.ensure_future(self._supervise(index)) for index in range(self.workers)]
+        await self._stopping.wait()
+        await self._drain()
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+    async def _supervise(self, index: int):
+        attempt = 0
+        self.restarts[index] = 0
+        while not self._stopping.is_set():
+            started = time.monotonic()
+            try:
+                process = await asyncio.create_subprocess_exec(
+                    *self.command,
+                    stdout=asyncio.subprocess.PIPE,
+                    stderr=asyncio.subprocess.STDOUT,
+                    env=self.worker_env(index),
+                    # Own process group, so a kill also reaches the worker's job processes
+                    start_new_session=True,
+                )
+            except OSError as e:
+                logger.error("Agent worker %d failed to start: %s", index, e)
+                code = None
+            else:
+                self._processes[index] = process
+                logger.info("Agent worker %d started with PID %d", index, process.pid)
+                relay = asyncio.ensure_future(self._relay(index, process))
+                if self._stopping.is_set():
+                    process.send_signal(signal.SIGTERM)
+                code = await process.wait()
+                self._processes.pop(index, None)
+                # Job processes the worker left behind cannot serve rooms without it
+                _kill_group(process.pid)
+                try:
+                    # Orphaned job processes may hold the pipe open; do not wait on them
+                    await asyncio.wait_for(relay, 1.0)
+                except asyncio.TimeoutError:
+                    pass
+                self.exit_codes.setdefault(index, []).append(code)
+
+            if self._stopping.is_set():
+                logger.info("Agent worker %d exited with code %s during shutdown", index, code)
+                return
+
+            if time.monotonic() - started >= AGENT_STABLE_AFTER:
+                attempt = 0
+            delay = min(self.max_backoff, self.backoff * (2 ** attempt))
+            attempt += 1
+            self.restarts[index] += 1
+            logger.error("Agent worker %d exited with code %s, restarting in %.1fs", index, code, delay,
+                         extra={'last_output': list(self._tails.get(index, ()))})
+            try:
+                # Wake early if shutdown starts during the backoff
+                await asyncio.wait_for(self._stopping.wait(), delay)
+            except asyncio.TimeoutError:
+                pass
+
+    async def _relay(self, index: int, process: asyncio.subprocess.Process):
+        tail = self._tails[index] = collections.deque(maxlen=OUTPUT_TAIL_LINES)
+        while True:
+            try:
+                line = await process.stdout.readline()
+            except ValueError:
+                # Longer than the stream limit; take what is buffered and carry on
+                line = await process.stdout.read(65536)
+            if not line:
+                return
+            text = line.decode('utf-8', errors='replace')
+            tail.append(text.rstrip('\n'))
+            self.output.write(text)
+
+    async def _drain(self):
+        processes = [p for p in self._processes.values() if p.returncode is None]
+        logger.info("Draining %d agent worker(s)", len(processes))
+        for process in processes:
+            # The LiveKit worker stops taking jobs on SIGTERM and waits for its rooms to end
+            process.send_signal(signal.SIGTERM)
+        try:
+            await asyncio.wait_for(asyncio.gather(*(p.wait() for p in processes)), self.drain_timeout)
+        except asyncio.TimeoutError:
+            for process in processes:
+                if process.returncode is None:
+                    logger.warning("Agent worker PID %d did not drain in %.0fs, killing", process.pid,
+                                   self.drain_timeout)
+                    _kill_group(process.pid)
+
+    def stats(self) -> Dict:
+        """Per-worker restart counts and live PIDs for monitoring"""
+        return {
+            'workers': self.workers,
+            'restarts': dict(self.restarts),
+            'pids': {index: p.pid for index, p in self._processes.items()},
+        }
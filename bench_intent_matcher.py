@@ -0,0 +1,83 @@
+#!/usr/bin/env python3
+"""
+Micro-benchmark: compiled intent matcher vs the keyword scans in MeetingBookingHandler
+"""
+
+import timeit
+
+from intent_matcher import intent_matcher
+
+
+LEGACY_BOOKING = [
+    'book', 'schedule', 'meeting', 'call', 'consultation',
+    'appointment', 'talk', 'discuss', 'chat', 'hire',
+    'project', 'work together', 'collaborate'
+]
+LEGACY_CONFIRM = ['yes', 'book', 'schedule', 'confirm', 'tomorrow', 'today', 'am', 'pm', 'morning', 'afternoon']
+
+
+def legacy_intents(text):
+    """The three substring scans handle_booking_flow used to run on each transcript"""
+    text_lower = text.lower()
+    intents = set()
+    if any(keyword in text_lower for keyword in LEGACY_BOOKING):
+        intents.add('booking')
+    if 'available' in text_lower or 'times' in text_lower:
+        intents.add('availability')
+    if any(word in text_lower for word in LEGACY_CONFIRM):
+        intents.add('confirm')
+    return intents
+
+
+# Transcripts in the shape Deepgram returns for portfolio visitors
+CORPUS = [
+    "Hi there, can you tell me about your projects?",
+    "What technologies did you use for FlashPoint QR?",
+    "I'd like to book a call with you next week.",
+    "Can we schedule a consultation?",
+    "Are you available for hire?",
+    "What times do you have available tomorrow?",
+    "Yes, tomorrow at 10 AM works for me.",
+    "Let's do the afternoon slot.",
+    "My name is Francis and my email is francis at gmail dot com.",
+    "I recall you built something with React, right?",
+    "Sometimes I wonder how long that took you.",
+    "That sounds good, go ahead and book it.",
+    "Could we work together on a mobile app?",
+    "I'm interested in collaborating on an AI project.",
+    "How does the payment integration work?",
+    "Um, I am not sure yet, let me think.",
+    "Do you do freelance work?",
+    "What's your experience with TypeScript and Node?",
+    "3:30 p.m. on Thursday would be ideal.",
+    "Thanks, that's all for today.",
+]
+
+FALSE_POSITIVES = {
+    "I recall you built something with React, right?": 'booking',
+    "Sometimes I wonder how long that took you.": 'availability',
+    "Um, I am not sure yet, let me think.": 'confirm',
+}
+
+
+def main():
+    print("🏁 Intent matching benchmark")
+    print("=" * 60)
+
+    for text, intent in FALSE_POSITIVES.items():
+        legacy = intent in legacy_intents(text)
+        compiled = intent in intent_matcher.intents(text)
+        print(f"'{text}' -> {intent}: legacy {legacy}, compiled {compiled}")
+
+    corpus = CORPUS * 50
+    number = 20
+    legacy = min(timeit.repeat(lambda: [legacy_intents(t) for t in corpus], number=number, repeat=5))
+    compiled = min(timeit.repeat(lambda: [intent_matcher.intents(t) for t in corpus], number=number, repeat=5))
+    per = number * len(corpus)
+    print(f"\n{len(corpus)} transcripts")
+    print(f"  legacy substring scans: {legacy / per * 1e6:6.2f} µs per transcript")
+    print(f"  compiled matcher:       {compiled / per * 1e6:6.2f} µs per transcript ({legacy / compiled:.1f}x)")
+
+
+if __name__ == "__main__":
+    main()
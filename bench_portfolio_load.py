@@ -0,0 +1,57 @@
+#!/usr/bin/env python3
+"""
+Cold-start benchmark: building the portfolio index from source vs memory-mapping the compiled artifact
+"""
+
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+
+from portfolio_index import compile_artifact
+
+# Each snippet runs in a fresh interpreter so nothing is cached between runs
+SNIPPETS = {
+    'read + clean context markdown (original agent.py)': (
+        "from voice_text import clean_text_for_voice\n"
+        "t = time.perf_counter()\n"
+        "clean_text_for_voice(open('portfolio-context-clean.md', encoding='utf-8').read())\n"
+    ),
+    'build index from portfolio-data.json': (
+        "from portfolio_index import build_portfolio_index\n"
+        "t = time.perf_counter()\n"
+        "build_portfolio_index()\n"
+    ),
+    'mmap compiled artifact': (
+        "from portfolio_index import load_artifact\n"
+        "t = time.perf_counter()\n"
+        "index = load_artifact(sys.argv[1])\n"
+        "index.lookup('purpsend')\n"
+    ),
+}
+
+
+def _time_snippet(snippet, artifact_path):
+    code = "import sys, time\n" + snippet + "print((time.perf_counter() - t) * 1000)\n"
+    result = subprocess.run(
+        [sys.executable, '-c', code, artifact_path],
+        capture_output=True, text=True, check=True,
+        cwd=os.path.dirname(os.path.abspath(__file__)),
+    )
+    return float(result.stdout.strip().splitlines()[-1])
+
+
+def main(runs=7):
+    with tempfile.TemporaryDirectory() as tmp:
+        artifact_path = os.path.join(tmp, 'portfolio-knowledge.bin')
+        summary = compile_artifact(artifact_path)
+        print(f"🏁 Portfolio knowledge cold start ({summary['passages']} passages, {summary['bytes']} bytes)")
+        print("=" * 60)
+        for name, snippet in SNIPPETS.items():
+            timings = [_time_snippet(snippet, artifact_path) for _ in range(runs)]
+            print(f"{name:52s} median {statistics.median(timings):7.2f} ms")
+
+
+if __name__ == "__main__":
+    main()
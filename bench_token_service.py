@@ -0,0 +1,138 @@
+#!/usr/bin/env python3
+"""
+Load test: async token service vs the Flask /generate-token endpoint it replaced
+
+Each server runs in its own process; one aiohttp client drives both with the same
+number of concurrent keep-alive connections and reports requests/sec and latency.
+"""
+
+import asyncio
+import logging
+import multiprocessing
+import os
+import socket
+import time
+
+import aiohttp
+
+os.environ.setdefault('LIVEKIT_API_KEY', 'bench-key')
+os.environ.setdefault('LIVEKIT_API_SECRET', 'bench-secret-bench-secret-bench-secret')
+os.environ.setdefault('LIVEKIT_URL', 'wss://bench.livekit.cloud')
+
+REQUESTS = int(os.getenv('BENCH_REQUESTS', '3000'))
+CONCURRENCY = int(os.getenv('BENCH_CONCURRENCY', '50'))
+
+
+def legacy_flask_app():
+    """The Flask /generate-token handler from render_entrypoint.py, kept here for comparison"""
+    from flask import Flask, request, jsonify
+    from token_service import generate_livekit_token
+
+    app = Flask(__name__)
+
+    @app.route('/generate-token', methods=['GET', 'POST'])
+    def generate_token():
+        if request.method == 'GET':
+            room_name = request.args.get('roomName', 'voice-consultation')
+            participant_name = request.args.get('participantName', f'User-{int(time.time())}')
+        else:
+            data = request.get_json() or {}
+            room_name = data.get('roomName', 'voice-consultation')
+            participant_name = data.get('participantName', f'User-{int(time.time())}')
+        token = generate_livekit_token(room_name, participant_name)
+        livekit_url = os.environ.get('LIVEKIT_URL')
+        response = jsonify({
+            'token': token,
+            'roomName': room_name,
+            'participantName': participant_name,
+            'livekitUrl': livekit_url,
+            'hasToken': bool(token),
+            'hasLivekitUrl': bool(livekit_url)
+        })
+        response.headers['Access-Control-Allow-Origin'] = '*'
+        response.headers['Access-Control-Allow-Headers'] = 'Content-Type'
+        return response
+
+    return app
+
+
+def serve_flask(port):
+    # waitress logs every time its task queue backs up
+    logging.getLogger('waitress').setLevel(logging.ERROR)
+    try:
+        from waitress import serve
+        serve(legacy_flask_app(), host='127.0.0.1', port=port, _quiet=True)
+    except ImportError:
+        legacy_flask_app().run(host='127.0.0.1', port=port, threaded=True)
+
+
+def serve_async(port):
+    import token_service
+    token_service.run(host='127.0.0.1', port=port, workers=1)
+
+
+def free_port():
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        return sock.getsockname()[1]
+
+
+async def wait_until_up(url):
+    async with aiohttp.ClientSession() as session:
+        for _ in range(100):
+            try:
+                async with session.get(url) as response:
+                    await response.read()
+                    return
+            except aiohttp.ClientError:
+                await asyncio.sleep(0.1)
+    raise RuntimeError(f"{url} did not start")
+
+
+async def load(url):
+    """Fire REQUESTS GETs over CONCURRENCY keep-alive connections"""
+    latencies = []
+    counter = iter(range(REQUESTS))
+    connector = aiohttp.TCPConnector(limit=CONCURRENCY)
+    async with aiohttp.ClientSession(connector=connector) as session:
+        async def client():
+            for i in counter:
+                started = time.perf_counter()
+                async with session.get(url, params={'roomName': f'portfolio-voice-{i}', 'participantName': f'visitor-{i}'}) as response:
+                    await response.read()
+                    assert response.status == 200
+                latencies.append(time.perf_counter() - started)
+
+        started = time.perf_counter()
+        await asyncio.gather(*[client() for _ in range(CONCURRENCY)])
+        elapsed = time.perf_counter() - started
+    latencies.sort()
+    return REQUESTS / elapsed, latencies[len(latencies) // 2], latencies[int(len(latencies) * 0.99) - 1]
+
+
+def bench(name, target):
+    port = free_port()
+    process = multiprocessing.Process(target=target, args=(port,), daemon=True)
+    process.start()
+    try:
+        url = f'http://127.0.0.1:{port}/generate-token'
+        asyncio.run(wait_until_up(url))
+        rps, p50, p99 = asyncio.run(load(url))
+        print(f"  {name:<28} {rps:8.0f} req/s   p50 {p50 * 1000:6.1f} ms   p99 {p99 * 1000:6.1f} ms")
+        return rps, p99
+    finally:
+        process.terminate()
+        process.join()
+
+
+def main():
+    print("🏁 /generate-token load test")
+    print("=" * 60)
+    print(f"{REQUESTS} requests, {CONCURRENCY} concurrent keep-alive connections\n")
+    flask_rps, flask_p99 = bench("Flask (waitress)", serve_flask)
+    async_rps, async_p99 = bench("aiohttp token service", serve_async)
+    print(f"\n  throughput {async_rps / flask_rps:.1f}x, p99 {flask_p99 / async_p99:.1f}x lower")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,85 @@
+#!/usr/bin/env python3
+"""
+Micro-benchmark: precompiled single-pass clean_text_for_voice vs the original 16-pass version
+"""
+
+import os
+import re
+import timeit
+
+from voice_text import VoiceTextStream, clean_reply_for_voice, clean_text_for_voice
+
+
+def legacy_clean_text_for_voice(text: str) -> str:
+    """Original implementation from agent.py, kept here for comparison"""
+    import re
+
+    text = re.sub(r'\*\*([^*]+?)\*\*', r'\1', text)
+    text = re.sub(r'\*([^*]+?)\*', r'\1', text)
+    text = re.sub(r'__([^_]+?)__', r'\1', text)
+    text = re.sub(r'_([^_]+?)_', r'\1', text)
+    text = re.sub(r'\*+', '', text)
+    text = re.sub(r'_+', '', text)
+    text = re.sub(r'^#{1,6}\s+', '', text, flags=re.MULTILINE)
+    text = re.sub(r'\[([^\]]+)\]\([^)]+\)', r'\1', text)
+    text = re.sub(r'```[^`]*```', '', text, flags=re.DOTALL)
+    text = re.sub(r'`([^`]+)`', r'\1', text)
+    text = re.sub(r'[#`~\[\]\(\)\{\}]', '', text)
+    text = re.sub(r'&', 'and', text)
+    text = re.sub(r'@', 'at', text)
+    text = re.sub(r'\s+', ' ', text).strip()
+    text = re.sub(r'^[.,;:!?\s]+|[.,;:!?\s]+$', '', text)
+    return text
+
+
+SAMPLES = {
+    'short reply': "Oh, that's a great question! FlashPoint QR is a restaurant ordering system. Want to hear more?",
+    'markdown reply': (
+        "**FlashPoint QR** is one of my *favorite* projects.\n\n"
+        "## Tech stack\n- Next.js & React\n- `TypeScript` with [MongoDB](https://mongodb.com)\n\n"
+        "Reach me at hello@example.com if you'd like to chat!"
+    ),
+}
+
+
+def _load_portfolio_sample():
+    path = os.path.join(os.path.dirname(__file__), 'portfolio-context-clean.md')
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            return f.read()
+    except FileNotFoundError:
+        return None
+
+
+def _stream(text, chunk_size=4):
+    stream = VoiceTextStream()
+    out = [stream.push(text[i:i + chunk_size]) for i in range(0, len(text), chunk_size)]
+    out.append(stream.flush())
+    return ''.join(out)
+
+
+def main():
+    samples = dict(SAMPLES)
+    portfolio = _load_portfolio_sample()
+    if portfolio:
+        samples['portfolio context'] = portfolio
+
+    print("🏁 clean_text_for_voice benchmark")
+    print("=" * 60)
+    for name, text in samples.items():
+        assert clean_text_for_voice(text) == legacy_clean_text_for_voice(text), name
+        assert _stream(text) == clean_reply_for_voice(text), name
+
+        number = 2000 if len(text) < 1000 else 200
+        legacy = min(timeit.repeat(lambda: legacy_clean_text_for_voice(text), number=number, repeat=5))
+        single = min(timeit.repeat(lambda: clean_text_for_voice(text), number=number, repeat=5))
+        streamed = min(timeit.repeat(lambda: _stream(text), number=number, repeat=5))
+
+        print(f"{name} ({len(text)} chars)")
+        print(f"  legacy 16-pass:  {legacy / number * 1e6:8.1f} µs")
+        print(f"  single-pass:     {single / number * 1e6:8.1f} µs  ({legacy / single:.1f}x)")
+        print(f"  streaming (4ch): {streamed / number * 1e6:8.1f} µs")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,103 @@
+import asyncio
+import logging
+import os
+import random
+import time
+from typing import Awaitable, Callable, Dict, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+
+BookingSubmit = Callable[[], Awaitable[Dict]]
+
+BOOKING_REPLAY_WINDOW = float(os.getenv('BOOKING_REPLAY_WINDOW', '600'))
+BOOKING_MAX_RETRIES = int(os.getenv('BOOKING_MAX_RETRIES', '2'))
+BOOKING_RETRY_BACKOFF = float(os.getenv('BOOKING_RETRY_BACKOFF', '0.25'))
+
+
+class BookingLedger:
+    """Idempotency layer in front of Cal.com booking POSTs
+
+    Calls are keyed on (email, slot, event type). Concurrent duplicates share one
+    in-flight request, and a successful result is replayed for the same key within
+    the replay window instead of booking the slot a second time. The ledger lives
+    in the job process, so it covers the repeated and retried tool calls of one
+    room, not bookings made from other rooms.
+    """
+
+    def __init__(self,
+                 replay_window: Optional[float] = None,
+                 max_retries: Optional[int] = None,
+                 backoff: Optional[float] = None):
+        self.replay_window = replay_window if replay_window is not None else BOOKING_REPLAY_WINDOW
+        self.max_retries = max_retries if max_retries is not None else BOOKING_MAX_RETRIES
+        self.backoff = backoff if backoff is not None else BOOKING_RETRY_BACKOFF
+
+        self._inflight: Dict[Tuple, asyncio.Future] = {}
+        self._results: Dict[Tuple, Tuple[Dict, float]] = {}
+
+        self.submitted = 0
+        self.deduplicated = 0
+        self.replayed = 0
+        self.retries = 0
+        self.failures = 0
+
+    async def submit(self, key: Tuple, submit: BookingSubmit, deadline: Optional[float] = None) -> Dict:
+        """Book once per key; duplicates wait for or replay the first result.
+        No retry is started that could not finish before deadline (time.monotonic())"""
+        self._prune()
+        entry = self._results.get(key)
+        if entry is not None:
+            self.replayed += 1
+            return dict(entry[0], replayed=True)
+
+        task = self._inflight.get(key)
+        if task is None:
+            self.submitted += 1
+            task = asyncio.ensure_future(self._submit_with_retry(key, submit, deadline))
+            self._inflight[key] = task
+            task.add_done_callback(lambda _: self._inflight.pop(key, None))
+        else:
+            self.deduplicated += 1
+        # A cancelled tool call must not cancel the booking the other caller is waiting on
+        return dict(await asyncio.shield(task))
+
+    async def _submit_with_retry(self, key: Tuple, submit: BookingSubmit, deadline: Optional[float]) -> Dict:
+        attempt = 0
+        while True:
+            result = await submit()
+            if result.get('success'):
+                self._results[key] = (result, time.monotonic())
+                return result
+            # 5xx or timeout: back off exponentially, with jitter so rooms do not retry in step
+            delay = self.backoff * (2 ** attempt)
+            out_of_time = deadline is not None and time.monotonic() + delay >= deadline
+            if not result.get('retryable') or attempt >= self.max_retries or out_of_time:
+                self.failures += 1
+                return result
+            attempt += 1
+            self.retries += 1
+            logger.warning("Booking attempt %d failed (%s), retrying in %.2fs", attempt, result.get('error'), delay)
+            await asyncio.sleep(delay + random.uniform(0, self.backoff))
+
+    def _prune(self):
+        cutoff = time.monotonic() - self.replay_window
+        for key, (_, booked_at) in list(self._results.items()):
+            if booked_at < cutoff:
+                del self._results[key]
+
+    def stats(self) -> Dict:
+        """Idempotency counters for monitoring"""
+        return {
+            'submitted': self.submitted,
+            'deduplicated': self.deduplicated,
+            'replayed': self.replayed,
+            'retries': self.retries,
+            'failures': self.failures,
+            'inflight': len(self._inflight),
+            'remembered': len(self._results),
+        }
+
+
+# Per process; in the agent that means per job
+booking_ledger = BookingLedger()
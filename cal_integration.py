@@ -1,8 +1,32 @@
 import aiohttp
+import asyncio
 import json
+import logging
 from datetime import datetime, timedelta
 from typing import Optional, Dict, List
 import os
+import time
+
+from booking_ledger import booking_ledger
+from circuit_breaker import cal_com_breaker
+from http_pool import http_pool
+from intent_matcher import intent_matcher
+from session_store import SessionStore
+from spoken_email import SpokenEmailParser, parse_contact
+from state_backend import create_state_backend
+from slot_cache import slot_cache, slot_key
+from slot_index import SlotIndex, describe_slot, parse_preferred_time
+
+logger = logging.getLogger(__name__)
+
+# Latency budget for one voice turn; each Cal.com call gets a share of it so a slow API cannot stall the turn
+VOICE_TURN_BUDGET = float(os.getenv('VOICE_TURN_BUDGET', '3.0'))
+# Availability is fetched before the agent speaks; a booking plays a filler clip, so it may use the whole turn
+CAL_SLOTS_DEADLINE = VOICE_TURN_BUDGET * 0.5
+CAL_BOOKING_DEADLINE = VOICE_TURN_BUDGET
+
+CALENDAR_UNAVAILABLE = ("I'm having trouble reaching my calendar right now. "
+                        "Please try again in a minute, or book directly on the website.")
 
 
 class CalComBooking:
@@ -15,20 +39,62 @@ class CalComBooking:
         self.base_url = 'https://api.cal.com/v1'
         self.event_type_id = os.getenv('CAL_COM_EVENT_TYPE_ID')
         
+        # Keep-alive connection pool reused by every Cal.com call in this job
+        self.http_pool = http_pool
+        # Availability cache; other job processes on the machine share it through SLOT_CACHE_DB
+        self.slot_cache = slot_cache
+        # Duplicate booking calls share one POST, and replays return its result
+        self.booking_ledger = booking_ledger
+        # Fail fast while api.cal.com is down instead of waiting out a timeout every turn
+        self.breaker = cal_com_breaker
+        self.slots_deadline = CAL_SLOTS_DEADLINE
+        self.booking_deadline = CAL_BOOKING_DEADLINE
+        
         # Debug: check if variables loaded
         if not self.api_key:
-            print("Warning: CAL_COM_API_KEY not found in environment")
+            logger.warning("CAL_COM_API_KEY not found in environment")
         if not self.event_type_id:
-            print("Warning: CAL_COM_EVENT_TYPE_ID not found in environment")
+            logger.warning("CAL_COM_EVENT_TYPE_ID not found in environment")
         
     async def get_available_slots(self, date_from: str = None, date_to: str = None) -> List[Dict]:
         """Get available time slots for booking"""
+        key, loader = self._slot_window(date_from, date_to)
+        slots = await self.slot_cache.get(key, loader)
+        if not slots and self.breaker.is_open:
+            # Past the stale window, but an old answer beats none while Cal.com is down
+            slots = self.slot_cache.peek(key) or []
+        return slots
+    
+    async def get_slot_index(self, date_from: str = None, date_to: str = None) -> SlotIndex:
+        """Available slots indexed by day and part of day, from the same cached response"""
+        key, loader = self._slot_window(date_from, date_to)
+        slot_index = await self.slot_cache.get_index(key, loader)
+        if not len(slot_index) and self.breaker.is_open:
+            slot_index = SlotIndex(self.slot_cache.peek(key) or [])
+        return slot_index
+    
+    def availability_unknown(self, date_from: str = None, date_to: str = None) -> bool:
+        """Whether an empty availability answer comes from a failed fetch rather than a full calendar"""
+        key, _ = self._slot_window(date_from, date_to)
+        return self.breaker.is_open or self.slot_cache.failed(key)
+    
+    def _slot_window(self, date_from: Optional[str], date_to: Optional[str]):
+        """Slot cache key and loader for a date range, defaulting to the next 7 days"""
         if not date_from:
             date_from = datetime.now().strftime('%Y-%m-%d')
         if not date_to:
             # Get next 7 days
             date_to = (datetime.now() + timedelta(days=7)).strftime('%Y-%m-%d')
-            
+        
+        key = (self.event_type_id, date_from, date_to)
+        return key, lambda: self._fetch_available_slots(date_from, date_to)
+    
+    def prefetch_available_slots(self) -> asyncio.Task:
+        """Warm the slot cache in the background so the first availability question is instant"""
+        return asyncio.ensure_future(self.get_available_slots())
+    
+    async def _fetch_available_slots(self, date_from: str, date_to: str) -> Optional[List[str]]:
+        """Fetch slots from Cal.com, returning None on failure so errors are not cached"""
         # Cal.com API uses query parameters with startTime and endTime
         start_time = f"{date_from}T00:00:00.000Z"
         end_time = f"{date_to}T23:59:59.999Z"
@@ -40,27 +106,40 @@ class CalComBooking:
             'endTime': end_time
         }
         
+        if not self.breaker.allow():
+            return None
+        
         try:
-            async with aiohttp.ClientSession() as session:
-                async with session.get(
-                    f"{self.base_url}/slots", 
-                    params=params
-                ) as response:
-                    if response.status == 200:
-                        data = await response.json()
-                        # Cal.com returns slots in a different format: {"slots": {"date": [{"time": "..."}, ...]}}
-                        slots_by_date = data.get('slots', {})
-                        all_slots = []
-                        for date, time_slots in slots_by_date.items():
-                            for slot in time_slots:
-                                all_slots.append(slot.get('time'))
-                        return all_slots
-                    else:
-                        print(f"Error getting slots: {response.status}")
-                        return []
+            session = await self.http_pool.get_session()
+            async with session.get(
+                f"{self.base_url}/slots", 
+                params=params,
+                timeout=aiohttp.ClientTimeout(total=self.slots_deadline)
+            ) as response:
+                if response.status >= 500 or response.status == 429:
+                    self.breaker.record_failure()
+                else:
+                    self.breaker.record_success()
+                if response.status == 200:
+                    data = await response.json()
+                    # Cal.com returns slots in a different format: {"slots": {"date": [{"time": "..."}, ...]}}
+                    slots_by_date = data.get('slots', {})
+                    all_slots = []
+                    for date, time_slots in slots_by_date.items():
+                        for slot in time_slots:
+                            all_slots.append(slot.get('time'))
+                    return all_slots
+                else:
+                    logger.error("Error getting slots: %s", response.status)
+                    return None
         except Exception as e:
-            print(f"Error fetching available slots: {e}")
-            return []
+            logger.error("Error fetching available slots: %r", e)
+            # Only timeouts and connection errors say Cal.com itself is unhealthy
+            if isinstance(e, (asyncio.TimeoutError, aiohttp.ClientError)):
+                self.breaker.record_failure()
+            else:
+                self.breaker.record_success()
+            return None
     
     async def create_booking(self, 
                            name: str, 
@@ -68,66 +147,102 @@ class CalComBooking:
                            start_time: str,
                            message: str = "",
                            phone: str = "") -> Dict:
-        """Create a new booking"""
-        # Calculate end time (30 minutes after start for this event type)
-        from datetime import datetime, timedelta
-        start_dt = datetime.fromisoformat(start_time.replace('Z', '+00:00'))
-        end_dt = start_dt + timedelta(minutes=30)  # 30-min meeting
-        end_time = end_dt.strftime('%Y-%m-%dT%H:%M:%S.000Z')
-        
-        # Updated format based on Cal.com API requirements
-        booking_data = {
-            'eventTypeId': int(self.event_type_id),
-            'start': start_time,
-            'end': end_time,
-            'responses': {
-                'name': name,
-                'email': email,
-                'notes': message or "Meeting booked via voice AI assistant"
-            },
-            'timeZone': 'UTC',
-            'language': 'en',
-            'metadata': {}  # Required field
-        }
+        """Create a new booking, at most once per (email, slot, event type)"""
+        key = (email.strip().lower(), slot_key(start_time), self.event_type_id)
+        # Retries share one deadline, so the whole booking fits in the turn budget
+        deadline = time.monotonic() + self.booking_deadline
+        return await self.booking_ledger.submit(
+            key, lambda: self._post_booking(name, email, start_time, message, phone, deadline), deadline
+        )
+    
+    async def _post_booking(self, name: str, email: str, start_time: str, message: str, phone: str,
+                            deadline: float) -> Dict:
+        """POST one booking to Cal.com"""
+        remaining = deadline - time.monotonic()
+        if remaining <= 0 or not self.breaker.allow():
+            return {
+                'success': False,
+                'error': 'Cal.com is not responding',
+                'message': CALENDAR_UNAVAILABLE,
+                'retryable': False
+            }
         
-        # Cal.com API expects the API key as a query parameter for bookings
-        params = {'apiKey': self.api_key}
-            
+        # Everything after allow() is inside the try, so a half-open probe always records an outcome
         try:
-            async with aiohttp.ClientSession() as session:
-                async with session.post(
-                    f"{self.base_url}/bookings",
-                    json=booking_data,
-                    params=params
-                ) as response:
-                    result = await response.json()
-                    print(f"Booking API Response: {response.status} - {result}")  # Debug logging
-                    if response.status in [200, 201]:  # Both 200 and 201 can indicate success
-                        return {
-                            'success': True,
-                            'booking_id': result.get('id'),
-                            'booking_url': result.get('videoCallUrl', result.get('bookingUrl')),
-                            'meeting_url': result.get('videoCallUrl'),
-                            'message': 'Meeting successfully scheduled!'
-                        }
-                    else:
-                        return {
-                            'success': False,
-                            'error': result.get('message', f'API returned status {response.status}'),
-                            'message': 'Sorry, I couldn\'t schedule the meeting. Please try again.'
-                        }
+            # Calculate end time (30 minutes after start for this event type)
+            from datetime import datetime, timedelta
+            start_dt = datetime.fromisoformat(start_time.replace('Z', '+00:00'))
+            end_dt = start_dt + timedelta(minutes=30)  # 30-min meeting
+            end_time = end_dt.strftime('%Y-%m-%dT%H:%M:%S.000Z')
+            
+            # Updated format based on Cal.com API requirements
+            booking_data = {
+                'eventTypeId': int(self.event_type_id),
+                'start': start_time,
+                'end': end_time,
+                'responses': {
+                    'name': name,
+                    'email': email,
+                    'notes': message or "Meeting booked via voice AI assistant"
+                },
+                'timeZone': 'UTC',
+                'language': 'en',
+                'metadata': {}  # Required field
+            }
+            
+            # Cal.com API expects the API key as a query parameter for bookings
+            params = {'apiKey': self.api_key}
+            
+            session = await self.http_pool.get_session()
+            async with session.post(
+                f"{self.base_url}/bookings",
+                json=booking_data,
+                params=params,
+                timeout=aiohttp.ClientTimeout(total=remaining)
+            ) as response:
+                if response.status >= 500 or response.status == 429:
+                    self.breaker.record_failure()
+                else:
+                    self.breaker.record_success()
+                result = await response.json()
+                logger.debug("Booking API response %s", response.status, extra={'response': result})
+                if response.status in [200, 201]:  # Both 200 and 201 can indicate success
+                    # The slot is taken now, so stop offering it to other rooms
+                    self.slot_cache.invalidate_slot(start_time)
+                    return {
+                        'success': True,
+                        'booking_id': result.get('id'),
+                        'booking_url': result.get('videoCallUrl', result.get('bookingUrl')),
+                        'meeting_url': result.get('videoCallUrl'),
+                        'message': 'Meeting successfully scheduled!'
+                    }
+                else:
+                    return {
+                        'success': False,
+                        'error': result.get('message', f'API returned status {response.status}'),
+                        'message': 'Sorry, I couldn\'t schedule the meeting. Please try again.',
+                        # Server errors and rate limits are worth another attempt
+                        'retryable': response.status >= 500 or response.status == 429
+                    }
         except Exception as e:
-            print(f"Error creating booking: {e}")
+            logger.error("Error creating booking: %r", e)
+            if isinstance(e, (asyncio.TimeoutError, aiohttp.ClientError)):
+                self.breaker.record_failure()
+            else:
+                self.breaker.record_success()
             return {
                 'success': False,
                 'error': str(e),
-                'message': 'Sorry, there was a technical issue. Please try booking directly on the website.'
+                'message': 'Sorry, there was a technical issue. Please try booking directly on the website.',
+                'retryable': isinstance(e, (asyncio.TimeoutError, aiohttp.ClientError))
             }
     
     async def get_formatted_available_times(self, days_ahead: int = 7) -> str:
         """Get available times formatted for voice response"""
         slots = await self.get_available_slots()
         
+        if not slots and self.availability_unknown():
+            return CALENDAR_UNAVAILABLE
         if not slots:
             return "I don't see any available slots in the next week. Please check back later or visit the website to book directly."
         
@@ -162,185 +277,140 @@ class CalComBooking:
 class MeetingBookingHandler:
     def __init__(self):
         self.cal_booking = CalComBooking()
-        self.booking_context = {}  # Store conversation context
+        # Conversation context, persisted so another worker process can pick the room up
+        self.booking_context = SessionStore(backend=create_state_backend())
     
     def is_booking_request(self, text: str) -> bool:
         """Check if user wants to book a meeting"""
-        booking_keywords = [
-            'book', 'schedule', 'meeting', 'call', 'consultation', 
-            'appointment', 'talk', 'discuss', 'chat', 'hire',
-            'project', 'work together', 'collaborate'
-        ]
-        text_lower = text.lower()
-        return any(keyword in text_lower for keyword in booking_keywords)
+        return intent_matcher.has(text, 'booking')
     
     def extract_contact_info(self, text: str) -> Dict:
         """Extract name and email from user message"""
-        import re
-        
-        # Simple email extraction
-        email_pattern = r'\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,}\b'
-        emails = re.findall(email_pattern, text)
-        
-        # Also try to reconstruct spelled-out emails
-        text_lower = text.lower()
-        if not emails:
-            # Look for spelled out emails like "think out nine eight at gmail dot com"
-            if 'gmail' in text_lower and ('at' in text_lower or '@' in text_lower):
-                # Try to reconstruct common patterns
-                if 'think out' in text_lower and ('nine eight' in text_lower or 'ninety eight' in text_lower or '98' in text_lower):
-                    # Handle "think out ninety eight" -> "thinkout98"
-                    emails = ['thinkout98@gmail.com']
-                elif 'sholla' in text_lower and 'alagbe' in text_lower:
-                    # Handle previous email pattern
-                    emails = ['sholla.alagbe@gmail.com']
-                else:
-                    # Generic letter-by-letter reconstruction
-                    parts = re.split(r'\s+', text_lower)
-                    letters = []
-                    found_at = False
-                    found_gmail = False
-                    
-                    for part in parts:
-                        if part in ['at', '@']:
-                            found_at = True
-                            continue
-                        elif part in ['gmail', 'g', 'mail'] and found_at:
-                            found_gmail = True
-                            break
-                        elif not found_at and len(part) == 1 and part.isalpha():
-                            letters.append(part)
-                        elif not found_at and 'dot' in part:
-                            letters.append('.')
-                    
-                    if letters and found_gmail:
-                        potential_email = ''.join(letters) + '@gmail.com'
-                        if re.match(r'^[a-zA-Z0-9._%+-]+@gmail\.com$', potential_email):
-                            emails = [potential_email]
-        
-        # Enhanced name extraction
-        words = text.split()
-        potential_names = []
-        for i, word in enumerate(words):
-            if word.lower() in ['name', 'i\'m', 'im', 'called']:
-                if i + 1 < len(words) and words[i + 1].lower() == 'is':
-                    # Pattern: "name is Francis" or "My name is Francis"
-                    if i + 2 < len(words):
-                        potential_names.append(words[i + 2].capitalize())
-                elif i + 1 < len(words):
-                    # Pattern: "name Francis" or "I'm Francis"
-                    next_word = words[i + 1]
-                    if next_word[0].isupper() or len(next_word) > 2:
-                        potential_names.append(next_word.capitalize())
+        return parse_contact(text)
+    
+    async def book_meeting(self, name: str, email: str, preferred_time: str = "") -> Optional[Dict]:
+        """Book the slot the caller asked for; None when there is nothing open to book"""
+        slot_index = await self.cal_booking.get_slot_index()
+        if not len(slot_index) and self.cal_booking.availability_unknown():
+            return {'success': False, 'error': 'Cal.com is not responding', 'message': CALENDAR_UNAVAILABLE}
+        if not len(slot_index):
+            return None
         
-        # Also look for standalone capitalized words that might be names
-        if not potential_names:
-            for word in words:
-                if word[0].isupper() and len(word) > 2 and word.isalpha():
-                    # Skip common words that might be capitalized
-                    if word.lower() not in ['gmail', 'email', 'address', 'yes', 'no', 'okay', 'please']:
-                        potential_names.append(word)
-                        break
+        match = slot_index.resolve(preferred_time)
+        if not match.exact:
+            # Offer the nearest open times instead of booking one the caller did not ask for
+            options = " or ".join(describe_slot(slot) for slot in match.alternatives)
+            return {
+                'success': False,
+                'error': 'Requested time is not available',
+                'alternatives': match.alternatives,
+                'message': (f"I don't have that time open. The closest times I have are {options}. "
+                            "Would one of those work for you?")
+            }
         
-        return {
-            'email': emails[0] if emails else None,
-            'name': potential_names[0] if potential_names else None
-        }
+        logger.debug("Creating booking for %s (%s) at %s (asked for '%s')", name, email, match.slot, preferred_time)
+        booking_result = await self.cal_booking.create_booking(
+            name=name,
+            email=email,
+            start_time=match.slot,
+            message="Meeting booked via voice AI assistant"
+        )
+        booking_result['start_time'] = match.slot
+        logger.debug("Booking result", extra={'result': booking_result})
+        return booking_result
     
     async def handle_booking_flow(self, user_message: str, session_id: str) -> str:
         """Handle the complete booking flow"""
-        user_message_lower = user_message.lower()
-        
-        # Debug logging
-        print(f"DEBUG: Booking flow - User message: '{user_message}', Session: {session_id}")
-        
-        # Initialize session context if not exists
-        if session_id not in self.booking_context:
-            self.booking_context[session_id] = {'stage': 'initial'}
+        context = await self.booking_context.aget_or_create(session_id)
+        try:
+            return await self._advance_booking_flow(user_message, context)
+        finally:
+            await self.booking_context.asave(context)
+    
+    async def _advance_booking_flow(self, user_message: str, context) -> str:
+        """Move one conversation turn through the booking stages"""
+        session_id = context.session_id
+        # One scan of the transcript answers every keyword check below
+        intents = intent_matcher.intents(user_message)
         
-        context = self.booking_context[session_id]
-        print(f"DEBUG: Current context: {context}")
+        logger.debug("Booking flow message: '%s'", user_message,
+                     extra={'session': session_id, 'stage': context.stage})
         
         # Stage 1: Initial booking request
-        if context['stage'] == 'initial' and self.is_booking_request(user_message):
-            context['stage'] = 'show_times'
+        if context.stage == 'initial' and 'booking' in intents:
+            context.stage = 'show_times'
             available_times = await self.cal_booking.get_formatted_available_times()
             return f"I'd love to schedule a consultation call with you! {available_times}"
         
         # Stage 2: User wants to see times or book
-        elif context['stage'] == 'show_times' or 'available' in user_message_lower or 'times' in user_message_lower:
-            context['stage'] = 'collect_info'
+        elif context.stage == 'show_times' or 'availability' in intents:
+            context.stage = 'collect_info'
             return ("Great! To book a consultation call, I'll need your name and email address. "
                    "You can say something like 'My name is John Smith and my email is john@example.com'")
         
         # Stage 3: Collect contact information
-        elif context['stage'] == 'collect_info':
-            contact_info = self.extract_contact_info(user_message)
-            print(f"DEBUG: Extracted contact info: {contact_info}")
-            
+        elif context.stage == 'collect_info':
             # Accumulate spelling attempts for email
-            if 'email_parts' not in context:
-                context['email_parts'] = []
+            if context.email_parts is None:
+                context.email_parts = []
+            
+            # Replay the transcripts heard while the address was being spelled, then this one
+            parser = SpokenEmailParser()
+            for fragment in context.email_parts:
+                parser.feed(fragment)
+            parser.feed(user_message)
+            contact_info = parser.result()
+            logger.debug("Extracted contact info", extra={'contact': contact_info})
             
-            # If user is spelling out email letter by letter, accumulate
-            words = user_message.lower().split()
-            if len(words) == 1 and len(words[0]) == 1 and words[0].isalpha():
-                context['email_parts'].append(words[0])
-                return "Got it, continue spelling..."
-            elif 'dot' in user_message.lower():
-                context['email_parts'].append('.')
-                return "Dot noted, continue..."
-            elif 'at' in user_message.lower() and 'gmail' in user_message.lower():
-                # Try to reconstruct email
-                potential_email = ''.join(context['email_parts']) + '@gmail.com'
-                if '@' not in potential_email:
-                    potential_email = ''.join(context['email_parts']).replace('gmail.com', '') + '@gmail.com'
-                contact_info['email'] = potential_email
+            if contact_info['email']:
+                context.email_parts = []
+            elif parser.in_progress:
+                # Part of an address so far; keep it for the next transcript
+                context.email_parts.append(user_message)
+                if not contact_info['name'] or context.name:
+                    if user_message.lower().rstrip(' .!?').endswith('dot'):
+                        return "Dot noted, continue..."
+                    return "Got it, continue spelling..."
+            
+            contact_info['name'] = contact_info['name'] or context.name
+            contact_info['email'] = contact_info['email'] or context.email
             
             # Check if we have both name and email
             if contact_info['email'] and contact_info['name']:
-                context['name'] = contact_info['name']
-                context['email'] = contact_info['email']
-                context['stage'] = 'confirm_booking'
+                context.name = contact_info['name']
+                context.email = contact_info['email']
+                context.stage = 'confirm_booking'
                 
                 return (f"Perfect! I have your name as {contact_info['name']} and email as {contact_info['email']}. "
                        "Which time slot would you prefer? Just tell me the day and time that works best for you.")
             elif contact_info['name'] and not contact_info['email']:
                 # Have name but need email
-                context['name'] = contact_info['name']
+                context.name = contact_info['name']
                 return f"Thanks {contact_info['name']}! Now I need your email address. You can spell it out letter by letter if needed."
             elif contact_info['email'] and not contact_info['name']:
                 # Have email but need name
-                context['email'] = contact_info['email']
+                context.email = contact_info['email']
                 return f"Great! I have your email as {contact_info['email']}. What's your name?"
             else:
                 return ("I need both your name and email to book the meeting. "
                        "You can provide them together or one at a time. What's your name?")
         
         # Stage 4: Confirm and book
-        elif context['stage'] == 'confirm_booking':
-            # Parse the time preference from user message
-            # For now, let's book the next available slot if they express interest
-            if any(word in user_message_lower for word in ['yes', 'book', 'schedule', 'confirm', 'tomorrow', 'today', 'am', 'pm', 'morning', 'afternoon']):
-                # Get available slots and book the first one
-                available_slots = await self.cal_booking.get_available_slots()
+        elif context.stage == 'confirm_booking':
+            # The time preference in the message picks the slot; none means the first available
+            if 'confirm' in intents:
+                query = parse_preferred_time(user_message)
+                preferred_time = "" if query.empty and not query.unclear else user_message
+                booking_result = await self.book_meeting(context.name, context.email, preferred_time)
                 
-                if available_slots:
-                    # Use the first available slot
-                    print(f"DEBUG: Creating booking for {context['name']} ({context['email']}) at {available_slots[0]}")
-                    booking_result = await self.cal_booking.create_booking(
-                        name=context['name'],
-                        email=context['email'],
-                        start_time=available_slots[0],
-                        message="Meeting booked via voice AI assistant"
-                    )
-                    print(f"DEBUG: Booking result: {booking_result}")
-                    
-                    context['stage'] = 'completed'
+                if booking_result and 'alternatives' in booking_result:
+                    return booking_result['message']
+                elif booking_result:
+                    context.stage = 'completed'
                     
                     if booking_result['success']:
                         return (f"Perfect! I've successfully booked your consultation call. "
-                               f"You should receive a confirmation email at {context['email']} shortly with all the details. "
+                               f"You should receive a confirmation email at {context.email} shortly with all the details. "
                                f"Looking forward to our conversation!")
                     else:
                         return (f"I apologize, but there was an issue booking the meeting: {booking_result.get('error', 'Unknown error')}. "
@@ -352,8 +422,12 @@ class MeetingBookingHandler:
                        "'book the first available slot'.")
         
         # Default response for booking-related queries
-        elif self.is_booking_request(user_message):
+        elif 'booking' in intents:
             return ("I can help you schedule a consultation call! "
                    "Would you like to see my available times this week?")
         
         return None  # Not a booking request
+    
+    async def end_session(self, session_id: str) -> bool:
+        """Forget this process's copy of a conversation's booking state once its job ends"""
+        return await self.booking_context.release(session_id)
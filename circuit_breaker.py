@@ -0,0 +1,93 @@
+import logging
+import os
+import time
+from typing import Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+
+CAL_BREAKER_FAILURES = int(os.getenv('CAL_BREAKER_FAILURES', '3'))
+CAL_BREAKER_RESET = float(os.getenv('CAL_BREAKER_RESET', '30'))
+
+
+class CircuitBreaker:
+    """Stop calling a failing upstream for a while instead of waiting on it every turn
+
+    closed: calls go through and consecutive failures are counted.
+    open: calls are refused at once until reset_timeout has passed.
+    half_open: one probe call is let through; its outcome closes or reopens the circuit.
+    """
+
+    def __init__(self, name: str, failure_threshold: Optional[int] = None, reset_timeout: Optional[float] = None):
+        self.name = name
+        self.failure_threshold = failure_threshold if failure_threshold is not None else CAL_BREAKER_FAILURES
+        self.reset_timeout = reset_timeout if reset_timeout is not None else CAL_BREAKER_RESET
+
+        self.state = 'closed'
+        self._failures = 0
+        self._opened_at = 0.0
+        self._probing = False
+
+        # Transition and refusal counters
+        self.opened = 0
+        self.half_opened = 0
+        self.closed = 0
+        self.rejected = 0
+
+    def allow(self) -> bool:
+        """Whether a call may go out now; in half-open state only one probe is allowed"""
+        if self.state == 'open':
+            if time.monotonic() - self._opened_at < self.reset_timeout:
+                self.rejected += 1
+                return False
+            self._transition('half_open')
+        if self.state == 'half_open':
+            if self._probing:
+                self.rejected += 1
+                return False
+            self._probing = True
+        return True
+
+    @property
+    def is_open(self) -> bool:
+        return self.state != 'closed'
+
+    def record_success(self):
+        self._failures = 0
+        self._probing = False
+        if self.state != 'closed':
+            self._transition('closed')
+
+    def record_failure(self):
+        self._failures += 1
+        self._probing = False
+        if self.state == 'half_open' or self._failures >= self.failure_threshold:
+            self._opened_at = time.monotonic()
+            if self.state != 'open':
+                self._transition('open')
+
+    def _transition(self, state: str):
+        logger.warning("Circuit '%s': %s -> %s (%d consecutive failures)", self.name, self.state, state, self._failures)
+        self.state = state
+        if state == 'open':
+            self.opened += 1
+        elif state == 'half_open':
+            self.half_opened += 1
+        else:
+            self.closed += 1
+
+    def stats(self) -> Dict:
+        """Breaker state and transition counters for monitoring"""
+        return {
+            'state': self.state,
+            'consecutive_failures': self._failures,
+            'opened': self.opened,
+            'half_opened': self.half_opened,
+            'closed': self.closed,
+            'rejected': self.rejected,
+        }
+
+
+# Per job process, so it covers one room's calls: each new room starts closed and pays up to
+# CAL_BREAKER_FAILURES deadlines before it fails fast
+cal_com_breaker = CircuitBreaker('cal.com')
@@ -0,0 +1,124 @@
+import asyncio
+import logging
+import os
+import re
+from typing import Dict, NamedTuple, Optional, Tuple
+
+from intent_matcher import intent_matcher
+from spoken_email import SpokenEmailParser
+
+logger = logging.getLogger(__name__)
+
+
+# Opt-in: start the Cal.com booking as soon as the caller has finished giving their details,
+# before the LLM has asked for it. The booking is made even if the LLM never calls the tool.
+SPECULATIVE_BOOKING = os.getenv('SPECULATIVE_BOOKING', 'false').lower() == 'true'
+
+_DAY = re.compile(r'\b(today|tomorrow|monday|tuesday|wednesday|thursday|friday|saturday|sunday)\b')
+_TIME = re.compile(
+    r'\b(\d{1,2}(?::\d{2})?\s*(?:a\.?m\.?|p\.?m\.?)(?![a-z])|noon|morning|afternoon|evening'
+    r'|first available|earliest)'
+)
+_NAME = re.compile(r"[A-Za-z][A-Za-z'-]*")
+
+
+class ContactDraft(NamedTuple):
+    name: Optional[str]
+    email: Optional[str]
+    preferred_time: str
+
+    @property
+    def ready(self) -> bool:
+        """Enough to book: a plausible name and a complete email address"""
+        return bool(self.email and self.name and _NAME.fullmatch(self.name))
+
+
+def _time_parts(text: str, day: str = "", clock: str = "") -> Tuple[str, str]:
+    """Latest day and time of day mentioned in text, keeping the earlier ones otherwise"""
+    lower = text.lower()
+    days = _DAY.findall(lower)
+    clocks = _TIME.findall(lower)
+    return (days[-1] if days else day,
+            re.sub(r'\s+|\.', '', clocks[-1]) if clocks else clock)
+
+
+def _join_time(day: str, clock: str) -> str:
+    return f'{day} at {clock}' if day and clock else day or clock
+
+
+class ContactExtractor:
+    """Parse booking details from STT transcripts while the caller is still speaking
+
+    Interim transcripts are tried against a copy of the parser, final transcripts are
+    committed to it, so name, email and preferred time are ready when the turn ends.
+    """
+
+    def __init__(self, handler, speculative: bool = SPECULATIVE_BOOKING):
+        self.handler = handler
+        self.speculative = speculative
+        self._parser = SpokenEmailParser()
+        self._day = ""
+        self._clock = ""
+        self._booking_intent = False
+        self.draft = ContactDraft(None, None, "")
+        self._booking: Optional[asyncio.Task] = None
+        self._booking_key = None
+        self._stats = {
+            'interim': 0, 'final': 0, 'ready_on_interim': 0,
+            'speculative_started': 0, 'speculative_used': 0,
+        }
+
+    def on_transcript(self, transcript: str, is_final: bool) -> ContactDraft:
+        """Feed one STT transcript; interim ones may still be revised by the next event"""
+        if is_final:
+            self._stats['final'] += 1
+            parser = self._parser
+            self._day, self._clock = _time_parts(transcript, self._day, self._clock)
+            preferred_time = _join_time(self._day, self._clock)
+            self._booking_intent = self._booking_intent or intent_matcher.has(transcript, 'booking')
+        else:
+            self._stats['interim'] += 1
+            parser = self._parser.copy()
+            preferred_time = _join_time(*_time_parts(transcript, self._day, self._clock))
+        parser.feed(transcript)
+        if is_final:
+            parser.end_turn()
+
+        result = parser.result()
+        was_ready = self.draft.ready
+        self.draft = ContactDraft(result['name'], result['email'], preferred_time)
+        if self.draft.ready and not was_ready and not is_final:
+            self._stats['ready_on_interim'] += 1
+        if is_final and self.draft.ready:
+            self._maybe_book()
+        return self.draft
+
+    def _maybe_book(self):
+        if not self.speculative or not self._booking_intent or self._booking is not None:
+            return
+        draft = self.draft
+        if draft.name != self._parser.name:
+            # Only a name given after "my name is" / "I'm" is trusted with a real booking
+            return
+        logger.debug("Speculative booking for %s (%s), time '%s'", draft.name, draft.email, draft.preferred_time)
+        self._booking_key = (draft.name.lower(), draft.email.lower())
+        self._booking = asyncio.ensure_future(
+            self.handler.book_meeting(draft.name, draft.email, draft.preferred_time)
+        )
+        self._stats['speculative_started'] += 1
+
+    def take_booking(self, name: str, email: str) -> Optional[asyncio.Task]:
+        """The speculative booking for these details, if one was started"""
+        if self._booking is None or self._booking_key != (name.strip().lower(), email.strip().lower()):
+            return None
+        self._stats['speculative_used'] += 1
+        return self._booking
+
+    def validated_email(self, email: str) -> str:
+        """The email the caller spelled when the one passed in is not a usable address"""
+        if self.draft.email and not re.fullmatch(r'[^@\s]+@[^@\s]+\.[a-z]{2,}', email.strip().lower()):
+            return self.draft.email
+        return email
+
+    def stats(self) -> Dict:
+        return dict(self._stats, draft=self.draft._asdict(), ready=self.draft.ready)
@@ -0,0 +1,216 @@
+import asyncio
+import hashlib
+import os
+import sys
+import time
+import wave
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, Dict, Optional
+
+from livekit import rtc
+
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+# Clips live on the persistent volume when there is one so they survive redeploys
+FILLER_AUDIO_DIR = os.getenv(
+    'FILLER_AUDIO_DIR',
+    '/data/filler-audio' if os.path.isdir('/data') else os.path.join(BASE_DIR, 'filler-audio'),
+)
+
+# Voice the clips are synthesised with; matches the primary session TTS in agent.py
+FILLER_TTS_MODEL = 'sonic-2'
+FILLER_TTS_VOICE = '8e093c57-1b16-461f-bb39-893c9992c710'
+
+# Acknowledgements played while a function tool waits on Cal.com
+FILLER_PHRASES = {
+    'availability': "Let me check the calendar for you.",
+    'booking': "One moment while I book that for you.",
+}
+
+FRAME_MS = 20
+
+
+class FillerClip:
+    """A pre-synthesised phrase held as 16-bit mono PCM"""
+
+    __slots__ = ('text', 'pcm', 'sample_rate')
+
+    def __init__(self, text: str, pcm: bytes, sample_rate: int):
+        self.text = text
+        self.pcm = pcm
+        self.sample_rate = sample_rate
+
+    @property
+    def duration(self) -> float:
+        return len(self.pcm) / 2 / self.sample_rate
+
+    async def frames(self) -> AsyncIterator[rtc.AudioFrame]:
+        """Slice the clip into 20 ms frames for session.say(audio=...), which reads them with async for"""
+        samples_per_frame = self.sample_rate * FRAME_MS // 1000
+        step = samples_per_frame * 2
+        for start in range(0, len(self.pcm), step):
+            chunk = self.pcm[start:start + step]
+            yield rtc.AudioFrame(chunk, self.sample_rate, 1, len(chunk) // 2)
+
+
+def _clip_path(directory: str, name: str, text: str) -> str:
+    # The phrase and voice are part of the file name so editing either re-synthesises
+    digest = hashlib.sha1(f"{FILLER_TTS_MODEL}|{FILLER_TTS_VOICE}|{text}".encode('utf-8')).hexdigest()[:12]
+    return os.path.join(directory, f"{name}-{digest}.wav")
+
+
+def write_wav(path: str, pcm: bytes, sample_rate: int):
+    """Atomically write 16-bit mono PCM as a WAV file"""
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp_path = path + '.tmp'
+    with wave.open(tmp_path, 'wb') as f:
+        f.setnchannels(1)
+        f.setsampwidth(2)
+        f.setframerate(sample_rate)
+        f.writeframes(pcm)
+    os.replace(tmp_path, path)
+
+
+def read_wav(path: str):
+    """Return (pcm, sample_rate) from a 16-bit mono WAV file"""
+    with wave.open(path, 'rb') as f:
+        if f.getnchannels() != 1 or f.getsampwidth() != 2:
+            raise ValueError(f"{path} is not 16-bit mono PCM")
+        return f.readframes(f.getnframes()), f.getframerate()
+
+
+class FillerLibrary:
+    """Filler clips cached on disk and loaded into memory once per process"""
+
+    def __init__(self, directory: Optional[str] = None, phrases: Optional[Dict[str, str]] = None):
+        self.directory = directory or FILLER_AUDIO_DIR
+        self.phrases = dict(phrases if phrases is not None else FILLER_PHRASES)
+        self._clips: Dict[str, FillerClip] = {}
+        self._backfill: Optional[asyncio.Future] = None
+        self.plays = 0
+        self.interrupted = 0
+
+    def load(self) -> int:
+        """Read every clip that exists on disk; returns how many are available"""
+        for name, text in self.phrases.items():
+            if name in self._clips:
+                continue
+            try:
+                pcm, sample_rate = read_wav(_clip_path(self.directory, name, text))
+            except (FileNotFoundError, EOFError, wave.Error, ValueError):
+                continue
+            self._clips[name] = FillerClip(text, pcm, sample_rate)
+        return len(self._clips)
+
+    def missing(self):
+        return [name for name in self.phrases if name not in self._clips]
+
+    def get(self, name: str) -> Optional[FillerClip]:
+        return self._clips.get(name)
+
+    def add(self, name: str, pcm: bytes, sample_rate: int) -> FillerClip:
+        """Store a freshly synthesised clip on disk and in memory"""
+        text = self.phrases[name]
+        write_wav(_clip_path(self.directory, name, text), pcm, sample_rate)
+        clip = FillerClip(text, pcm, sample_rate)
+        self._clips[name] = clip
+        return clip
+
+    async def synthesize_missing(self, tts) -> int:
+        """Synthesise clips that are not cached yet; the only time the TTS API is used"""
+        created = 0
+        for name in self.missing():
+            frame = await tts.synthesize(self.phrases[name]).collect()
+            if frame.num_channels != 1:
+                raise ValueError("filler clips must be mono")
+            self.add(name, frame.data.tobytes(), frame.sample_rate)
+            created += 1
+        return created
+
+    def backfill(self, tts) -> Optional[asyncio.Future]:
+        """Synthesise missing clips in the background, once per process"""
+        if not self.missing():
+            return None
+        if self._backfill is None or self._backfill.done():
+            self._backfill = asyncio.ensure_future(self.synthesize_missing(tts))
+        return self._backfill
+
+    def stats(self) -> Dict:
+        return {
+            'loaded': len(self._clips),
+            'missing': len(self.missing()),
+            'plays': self.plays,
+            'interrupted': self.interrupted,
+        }
+
+
+@asynccontextmanager
+async def play_filler(context, name: str, library: Optional[FillerLibrary] = None):
+    """Play a cached acknowledgement while the wrapped tool body runs
+
+    The clip starts as soon as the session goes quiet after the tool call and is
+    cut off when the block exits, so the tool result is spoken without waiting
+    for the filler to finish.
+    """
+    library = library or filler_library
+    clip = library.get(name)
+    if clip is None:
+        yield
+        return
+
+    handles = []
+
+    def speak(step):
+        handle = context.session.say(
+            clip.text,
+            audio=clip.frames(),
+            allow_interruptions=True,
+            add_to_chat_ctx=False,
+        )
+        handles.append(handle)
+        library.plays += 1
+        return handle
+
+    try:
+        async with context.with_filler(speak, max_steps=1):
+            yield
+    finally:
+        for handle in handles:
+            if not handle.done():
+                handle.interrupt()
+                library.interrupted += 1
+
+
+# Process-wide clip cache, loaded by the agent's prewarm hook
+filler_library = FillerLibrary()
+
+
+async def _build():
+    from dotenv import load_dotenv
+    from livekit.plugins import cartesia
+
+    from http_pool import http_pool
+
+    load_dotenv()
+    library = FillerLibrary()
+    library.load()
+    http_pool.acquire()
+    try:
+        tts = cartesia.TTS(model=FILLER_TTS_MODEL, voice=FILLER_TTS_VOICE,
+                           http_session=await http_pool.get_session())
+        created = await library.synthesize_missing(tts)
+    finally:
+        await http_pool.release()
+    return library, created
+
+
+if __name__ == '__main__':
+    command = sys.argv[1] if len(sys.argv) > 1 else 'build'
+    if command != 'build':
+        print("Usage: python filler_audio.py build")
+        sys.exit(1)
+
+    started = time.perf_counter()
+    library, created = asyncio.run(_build())
+    print(f"Synthesised {created} filler clips into {library.directory} "
+          f"({library.stats()['loaded']} cached) in {(time.perf_counter() - started) * 1000:.0f} ms")
@@ -0,0 +1,122 @@
+import asyncio
+import os
+from typing import Dict, Optional
+
+import aiohttp
+
+
+class SharedHTTPPool:
+    """One keep-alive aiohttp connection pool per process, reused by every Cal.com call made in it
+
+    LiveKit runs each room in its own job process, so in the agent the pool lives
+    for one job: it saves the TLS handshake on every call after the first.
+    """
+
+    def __init__(self,
+                 limit: Optional[int] = None,
+                 limit_per_host: Optional[int] = None,
+                 dns_cache_ttl: Optional[int] = None,
+                 keepalive_timeout: Optional[float] = None):
+        # Pool limits can be tuned per deployment without code changes
+        self.limit = limit if limit is not None else int(os.getenv('HTTP_POOL_LIMIT', '100'))
+        self.limit_per_host = (limit_per_host if limit_per_host is not None
+                               else int(os.getenv('HTTP_POOL_LIMIT_PER_HOST', '20')))
+        self.dns_cache_ttl = (dns_cache_ttl if dns_cache_ttl is not None
+                              else int(os.getenv('HTTP_POOL_DNS_TTL', '300')))
+        self.keepalive_timeout = (keepalive_timeout if keepalive_timeout is not None
+                                  else float(os.getenv('HTTP_POOL_KEEPALIVE', '60')))
+
+        self._session: Optional[aiohttp.ClientSession] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._lock: Optional[asyncio.Lock] = None
+        self._users = 0
+
+        # Connection reuse counters
+        self.requests = 0
+        self.connections_created = 0
+        self.connections_reused = 0
+
+    def _build_trace_config(self) -> aiohttp.TraceConfig:
+        trace_config = aiohttp.TraceConfig()
+
+        async def on_request_start(session, ctx, params):
+            self.requests += 1
+
+        async def on_connection_create_end(session, ctx, params):
+            self.connections_created += 1
+
+        async def on_connection_reuseconn(session, ctx, params):
+            self.connections_reused += 1
+
+        trace_config.on_request_start.append(on_request_start)
+        trace_config.on_connection_create_end.append(on_connection_create_end)
+        trace_config.on_connection_reuseconn.append(on_connection_reuseconn)
+        return trace_config
+
+    def _create_session(self) -> aiohttp.ClientSession:
+        connector = aiohttp.TCPConnector(
+            limit=self.limit,
+            limit_per_host=self.limit_per_host,
+            ttl_dns_cache=self.dns_cache_ttl,
+            use_dns_cache=True,
+            keepalive_timeout=self.keepalive_timeout,
+        )
+        return aiohttp.ClientSession(
+            connector=connector,
+            trace_configs=[self._build_trace_config()],
+        )
+
+    async def get_session(self) -> aiohttp.ClientSession:
+        """Return the shared session, creating it on first use in the running event loop"""
+        loop = asyncio.get_running_loop()
+        if self._lock is None or self._loop is not loop:
+            # Sessions and locks are bound to the loop they were created on
+            self._lock = asyncio.Lock()
+            stale = None
+            if self._loop is not loop:
+                stale, self._session = self._session, None
+            self._loop = loop
+            if stale is not None and not stale.closed:
+                # Close the old loop's session so its connector does not leak
+                await stale.close()
+
+        if self._session is None or self._session.closed:
+            async with self._lock:
+                if self._session is None or self._session.closed:
+                    self._session = self._create_session()
+        return self._session
+
+    def acquire(self):
+        """Register a user of the pool so it is only closed after the last one
+
+        A LiveKit job process holds one job, so there the count is one; it matters
+        where several jobs share a process (the thread executor, scripts).
+        """
+        self._users += 1
+
+    async def release(self):
+        """Release a job's hold on the pool and close it once no job is using it"""
+        self._users = max(0, self._users - 1)
+        if self._users == 0:
+            await self.close()
+
+    async def close(self):
+        """Close the pooled connections"""
+        session = self._session
+        self._session = None
+        if session is not None and not session.closed:
+            await session.close()
+
+    def stats(self) -> Dict:
+        """Connection reuse counters for monitoring"""
+        return {
+            'requests': self.requests,
+            'connections_created': self.connections_created,
+            'connections_reused': self.connections_reused,
+            'active_users': self._users,
+            'open': self._session is not None and not self._session.closed,
+        }
+
+
+# Per process; in the agent that means per job
+http_pool = SharedHTTPPool()
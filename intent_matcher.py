@@ -0,0 +1,118 @@
+import re
+from typing import Dict, Iterable, List, NamedTuple, Optional, Set, Tuple
+
+
+# Keywords per intent. Each keyword also matches its common inflections
+# (books, booked, booking, scheduled, chatting, collaboration, ...).
+INTENT_KEYWORDS = {
+    'booking': [
+        'book', 'schedule', 'meeting', 'call', 'consultation',
+        'appointment', 'talk', 'discuss', 'chat', 'hire',
+        'project', 'work together', 'collaborate',
+    ],
+    'availability': ['available', 'availability', 'times', 'slot', 'opening'],
+    'confirm': [
+        'yes', 'book', 'schedule', 'confirm', 'tomorrow', 'today',
+        'morning', 'afternoon', 'sounds good', 'works for me',
+    ],
+}
+
+# Intents that need more than a keyword
+INTENT_PATTERNS = {
+    # "10 am", "3:30pm", "9 a.m." - a bare "am" in "I am" is not a time
+    'confirm': {'clock time': r'\d{1,2}(?::\d{2})?\s*(?:a\.?m\.?|p\.?m\.?)(?![a-z])'},
+}
+
+# Letters on either side mean the keyword is part of a longer word ("recall", "bookmark")
+_LEFT = r'(?<![a-z])'
+_RIGHT = r'(?![a-z])'
+
+
+def _split_keyword(keyword: str) -> Tuple[str, str]:
+    """Literal stem of a keyword (lowercase, single spaces) and the regex for its inflections"""
+    keyword = ' '.join(keyword.lower().split())
+    if keyword.endswith('e'):
+        # schedule -> scheduled, scheduling; collaborate -> collaboration
+        return keyword[:-1], r'(?:e|es|ed|ing|ion|ions)'
+    if keyword.endswith('y'):
+        return keyword, r'(?:s)?'
+    # chat -> chatted, chatting; call -> calls, called, calling
+    return keyword, r'(?:s|es|ed|ing|ings|' + re.escape(keyword[-1]) + r'(?:ed|ing))?'
+
+
+def _trie_regex(node: Dict) -> str:
+    """Nested alternation from a character trie so each position is tested against
+    one branch per distinct next character instead of every keyword"""
+    branches = []
+    for char in sorted(ch for ch in node if ch != ''):
+        literal = r'\s+' if char == ' ' else re.escape(char)
+        branches.append(literal + _trie_regex(node[char]))
+    # A keyword ending here is tried after the longer keywords that continue it
+    branches.extend(node.get('', []))
+    if len(branches) == 1:
+        return branches[0]
+    return '(?:' + '|'.join(branches) + ')'
+
+
+class IntentMatch(NamedTuple):
+    intent: str
+    keyword: str
+    start: int
+    end: int
+
+
+class IntentMatcher:
+    """Every intent keyword compiled into one trie-shaped regex, matched in a single pass"""
+
+    def __init__(self, keywords: Dict[str, Iterable[str]], patterns: Optional[Dict[str, Dict[str, str]]] = None):
+        # Keyword -> intents, so a keyword shared by two intents is matched once
+        owners: Dict[str, List[str]] = {}
+        for intent, words in keywords.items():
+            for word in words:
+                owners.setdefault(' '.join(word.lower().split()), []).append(intent)
+
+        self._groups: Dict[str, Tuple[str, Tuple[str, ...]]] = {}
+        trie: Dict = {}
+        for index, (word, intents) in enumerate(owners.items()):
+            stem, suffix = _split_keyword(word)
+            group = f'k{index}'
+            self._groups[group] = (word, tuple(intents))
+            node = trie
+            for char in stem:
+                node = node.setdefault(char, {})
+            # The empty group closes last, so match.lastgroup names the keyword
+            node.setdefault('', []).append(f'{suffix}(?P<{group}>)')
+
+        alternatives = [_trie_regex(trie)]
+        for intent, regexes in (patterns or {}).items():
+            for label, regex in regexes.items():
+                group = f'p{len(self._groups)}'
+                self._groups[group] = (label, (intent,))
+                alternatives.append(f'{regex}(?P<{group}>)')
+
+        # Transcripts are lowercased once, so the pattern itself is case-sensitive
+        self._pattern = re.compile(_LEFT + '(?:' + '|'.join(alternatives) + ')' + _RIGHT)
+        self.intent_names = frozenset(keywords) | frozenset(patterns or {})
+
+    def matches(self, text: str) -> List[IntentMatch]:
+        """Every (intent, keyword, span) found in one scan of text"""
+        found = []
+        for match in self._pattern.finditer(text.lower()):
+            keyword, intents = self._groups[match.lastgroup]
+            for intent in intents:
+                found.append(IntentMatch(intent, keyword, match.start(), match.end()))
+        return found
+
+    def intents(self, text: str) -> Set[str]:
+        """Names of the intents present in text"""
+        found = set()
+        for match in self._pattern.finditer(text.lower()):
+            found.update(self._groups[match.lastgroup][1])
+        return found
+
+    def has(self, text: str, intent: str) -> bool:
+        return intent in self.intents(text)
+
+
+# Built once at import and shared by every session
+intent_matcher = IntentMatcher(INTENT_KEYWORDS, INTENT_PATTERNS)
@@ -0,0 +1,404 @@
+import json
+import logging
+import math
+import mmap
+import os
+import re
+import struct
+import sys
+import time
+from collections import Counter
+from collections.abc import Mapping
+from typing import Dict, Iterator, List, Optional, Sequence, Tuple
+
+from voice_text import clean_text_for_voice
+
+logger = logging.getLogger(__name__)
+
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+DATA_PATH = os.path.join(BASE_DIR, 'portfolio-data.json')
+CONTEXT_PATH = os.path.join(BASE_DIR, 'portfolio-context-clean.md')
+# Compiled by `python portfolio_index.py compile` at image build time
+ARTIFACT_PATH = os.path.join(BASE_DIR, 'portfolio-knowledge.bin')
+ARTIFACT_FORMAT = 'portfolio-knowledge'
+ARTIFACT_VERSION = 2
+
+# Fixed-width records in the artifact, read in place from the mapped file
+_TERM_RECORD = struct.Struct('<IIdII')  # term offset, term length, idf, first posting, posting count
+_POSTING = struct.Struct('<II')  # doc id, term frequency
+
+_TOKEN = re.compile(r'[a-z0-9]+')
+_STOPWORDS = frozenset("""
+a about an and any are as at be been built by can did do does for from has have how i
+in is it its know like me my of on or our please project so tell that the their them
+there they this to use used using was we what which with work you your more
+""".split())
+
+# Fields pulled out of each project entry in src/data/projects.ts
+_TS_PROJECT = re.compile(r"\{\s*id:\s*'([^']+)'(.*?)\n  \}", re.S)
+_TS_STRING_FIELD = re.compile(r"(\w+):\s*'((?:[^'\\]|\\.)*)'")
+_TS_LIST_FIELD = re.compile(r"(\w+):\s*\[(.*?)\]", re.S)
+_TS_LIST_ITEM = re.compile(r"'((?:[^'\\]|\\.)*)'")
+
+
+def tokenize(text: str) -> List[str]:
+    """Lowercase word tokens with stopwords removed and plurals folded"""
+    tokens = []
+    for token in _TOKEN.findall(text.lower()):
+        if len(token) > 3 and token.endswith('s') and not token.endswith('ss'):
+            token = token[:-1]
+        if token not in _STOPWORDS:
+            tokens.append(token)
+    return tokens
+
+
+def _parse_ts_projects(source: str) -> Dict[str, Dict]:
+    """Pull string and list fields for each project out of projects.ts"""
+    projects = {}
+    for project_id, body in _TS_PROJECT.findall(source):
+        fields = {'id': project_id}
+        for name, items in _TS_LIST_FIELD.findall(body):
+            fields[name] = [item.replace("\\'", "'") for item in _TS_LIST_ITEM.findall(items)]
+        for name, value in _TS_STRING_FIELD.findall(body):
+            fields.setdefault(name, value.replace("\\'", "'"))
+        if 'title' in fields:
+            projects[fields['title']] = fields
+    return projects
+
+
+def load_passages(data_path: str = DATA_PATH, context_path: str = CONTEXT_PATH) -> List[Tuple[str, str]]:
+    """Chunk portfolio-data.json and the context markdown into (title, text) passages"""
+    # Keyed by title so the JSON entry and the markdown summary of a project merge
+    passages: Dict[str, List[str]] = {}
+
+    try:
+        with open(data_path, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+    except FileNotFoundError:
+        data = {}
+
+    details = _parse_ts_projects(data.get('src_data_projects_ts', ''))
+    for project in data.get('projects', []):
+        title = project.get('title', '').strip()
+        extra = details.get(title, {})
+        parts = [f"{title}: {extra.get('longDescription') or project.get('description', '')}"]
+        if extra.get('features'):
+            parts.append("Key features: " + ", ".join(extra['features']) + ".")
+        technologies = extra.get('technologies') or project.get('tags', [])
+        if technologies:
+            parts.append("Built with " + ", ".join(technologies) + ".")
+        if extra.get('githubUrl'):
+            parts.append(f"Source code is on GitHub at {extra['githubUrl']}.")
+        passages.setdefault(title, []).append(" ".join(parts))
+
+    if data.get('skills'):
+        passages.setdefault('Skills', []).append("Skills and tools: " + ", ".join(data['skills']) + ".")
+
+    # npm scopes like @radix-ui would otherwise be read out as "at radix"
+    dependencies = [t['name'].lstrip('@') for t in data.get('technologies', []) if t.get('name')]
+    if dependencies:
+        passages.setdefault('Portfolio website stack', []).append(
+            "The portfolio website itself uses " + ", ".join(dependencies) + ".")
+
+    # Each markdown section of the curated summary becomes its own passage
+    try:
+        with open(context_path, 'r', encoding='utf-8') as f:
+            markdown = f.read()
+    except FileNotFoundError:
+        markdown = ''
+    for section in re.split(r'^#{1,6}\s+', markdown, flags=re.M):
+        heading, _, body = section.strip().partition('\n')
+        heading, body = heading.strip(), body.strip()
+        if not body:
+            continue
+        if heading in passages:
+            passages[heading].append(body)
+        else:
+            passages[heading] = [f"{heading}: {body}"]
+
+    return [(title, clean_text_for_voice(" ".join(texts))) for title, texts in passages.items()]
+
+
+_SENTENCE_END = re.compile(r'(?<=[.!?])\s+')
+
+
+def dedupe_passages(passages: List[Tuple[str, str]]) -> List[Tuple[str, str]]:
+    """Drop repeated sentences within a passage and passages that repeat another"""
+    seen_texts = set()
+    result = []
+    for title, text in passages:
+        sentences = list(dict.fromkeys(_SENTENCE_END.split(text)))
+        text = " ".join(sentences)
+        if text in seen_texts:
+            continue
+        seen_texts.add(text)
+        result.append((title, text))
+    return result
+
+
+class PortfolioIndex:
+    """Lexical BM25 index over portfolio passages"""
+
+    def __init__(self, passages: Sequence[Tuple[str, str]], k1: float = 1.5, b: float = 0.75,
+                 stats: Optional[Dict] = None):
+        self.passages = passages
+        self.k1 = k1
+        self.b = b
+        # Where the index came from: built from 'source' files or a compiled 'artifact'
+        self.source = 'source'
+
+        if stats is not None:
+            # Precomputed by compile_artifact, nothing left to tokenize
+            self.titles = stats['titles']
+            self.postings = stats['postings']
+            self.doc_lengths = stats['doc_lengths']
+            self.avg_length = stats['avg_length']
+            self.idf = stats['idf']
+            return
+
+        self.titles = [title for title, _ in passages]
+        self.postings: Dict[str, List[Tuple[int, int]]] = {}
+        self.doc_lengths: List[int] = []
+        for doc_id, (title, text) in enumerate(passages):
+            # Titles count twice so "tell me about PurpSend" lands on the right project
+            counts = Counter(tokenize(f"{title} {title} {text}"))
+            self.doc_lengths.append(sum(counts.values()))
+            for term, tf in counts.items():
+                self.postings.setdefault(term, []).append((doc_id, tf))
+
+        total = len(passages)
+        self.avg_length = (sum(self.doc_lengths) / total) if total else 0.0
+        self.idf = {
+            term: math.log(1 + (total - len(docs) + 0.5) / (len(docs) + 0.5))
+            for term, docs in self.postings.items()
+        }
+
+    def search(self, query: str, limit: int = 3) -> List[Tuple[float, str, str]]:
+        """Return up to limit (score, title, text) passages ranked by BM25"""
+        scores: Dict[int, float] = {}
+        for term in set(tokenize(query)):
+            idf = self.idf.get(term)
+            if idf is None:
+                continue
+            for doc_id, tf in self.postings[term]:
+                norm = self.k1 * (1 - self.b + self.b * self.doc_lengths[doc_id] / self.avg_length)
+                scores[doc_id] = scores.get(doc_id, 0.0) + idf * tf * (self.k1 + 1) / (tf + norm)
+
+        ranked = sorted(scores.items(), key=lambda item: item[1], reverse=True)[:limit]
+        return [(score, self.passages[doc_id][0], self.passages[doc_id][1]) for doc_id, score in ranked]
+
+    def lookup(self, query: str, limit: int = 3) -> Optional[str]:
+        """Relevant passages joined into one tool result, or None when nothing matches"""
+        results = self.search(query, limit)
+        if not results:
+            return None
+        return "\n".join(text for _, _, text in results)
+
+    def overview(self) -> str:
+        """One-line summary of what the index covers, for the agent instructions"""
+        return "Topics you can look up: " + ", ".join(dict.fromkeys(self.titles)) + "."
+
+
+def build_portfolio_index() -> PortfolioIndex:
+    """Build the index from the files shipped next to this module"""
+    return PortfolioIndex(dedupe_passages(load_passages()))
+
+
+class _MappedTerms(Mapping):
+    """Term -> term record, found by binary search over the sorted table in the mapped artifact"""
+
+    def __init__(self, data: mmap.mmap, base: int, sections: Dict):
+        self._data = data
+        self._count = sections['terms']
+        self._table = base + sections['table']
+        self._postings = base + sections['postings']
+        self._strings = base + sections['strings']
+
+    def __len__(self) -> int:
+        return self._count
+
+    def _record(self, position: int) -> Tuple[int, int, float, int, int]:
+        return _TERM_RECORD.unpack_from(self._data, self._table + position * _TERM_RECORD.size)
+
+    def _term(self, record) -> bytes:
+        start = self._strings + record[0]
+        return self._data[start:start + record[1]]
+
+    def __getitem__(self, term: str) -> Tuple[int, int, float, int, int]:
+        key = term.encode('utf-8')
+        low, high = 0, self._count
+        while low < high:
+            middle = (low + high) // 2
+            if self._term(self._record(middle)) < key:
+                low = middle + 1
+            else:
+                high = middle
+        if low < self._count:
+            record = self._record(low)
+            if self._term(record) == key:
+                return record
+        raise KeyError(term)
+
+    def __iter__(self) -> Iterator[str]:
+        for position in range(self._count):
+            yield self._term(self._record(position)).decode('utf-8')
+
+    def postings(self, record) -> List[Tuple[int, int]]:
+        start = self._postings + record[3] * _POSTING.size
+        return list(_POSTING.iter_unpack(self._data[start:start + record[4] * _POSTING.size]))
+
+
+class _MappedColumn(Mapping):
+    """One value per term (idf or postings) read from the mapped term table"""
+
+    def __init__(self, terms: _MappedTerms, value):
+        self._terms = terms
+        self._value = value
+
+    def __getitem__(self, term: str):
+        return self._value(self._terms[term])
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._terms)
+
+    def __len__(self) -> int:
+        return len(self._terms)
+
+
+class _MappedPassages(Sequence):
+    """Passages decoded lazily from the memory-mapped artifact body"""
+
+    def __init__(self, data: mmap.mmap, body_offset: int, entries: List[List]):
+        self._data = data
+        self._body_offset = body_offset
+        self._entries = entries
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __getitem__(self, doc_id: int) -> Tuple[str, str]:
+        offset, length, title = self._entries[doc_id]
+        start = self._body_offset + offset
+        return title, json.loads(self._data[start:start + length])
+
+
+def compile_artifact(output_path: str = ARTIFACT_PATH) -> Dict:
+    """Write the pre-cleaned, deduplicated passages and BM25 statistics to one file
+
+    Layout: a small JSON header line (format, version, per-passage lengths and
+    offsets, and where each section starts), then the sorted term table and the
+    postings as fixed-width records, the term strings, and one JSON string per
+    passage. Everything after the header is read in place from the mapped file.
+    """
+    index = build_portfolio_index()
+
+    table = bytearray()
+    postings = bytearray()
+    strings = bytearray()
+    for term in sorted(index.postings, key=lambda t: t.encode('utf-8')):
+        encoded = term.encode('utf-8')
+        docs = index.postings[term]
+        table += _TERM_RECORD.pack(len(strings), len(encoded), index.idf[term],
+                                   len(postings) // _POSTING.size, len(docs))
+        strings += encoded
+        for doc_id, tf in docs:
+            postings += _POSTING.pack(doc_id, tf)
+
+    bodies = bytearray()
+    entries = []
+    for title, text in index.passages:
+        line = json.dumps(text, ensure_ascii=False).encode('utf-8')
+        entries.append([len(bodies), len(line), title])
+        bodies += line + b'\n'
+
+    # Section offsets count from the first byte after the header line
+    sections = {'terms': len(index.postings), 'table': 0}
+    sections['postings'] = sections['table'] + len(table)
+    sections['strings'] = sections['postings'] + len(postings)
+    sections['bodies'] = sections['strings'] + len(strings)
+    header = {
+        'format': ARTIFACT_FORMAT,
+        'version': ARTIFACT_VERSION,
+        'k1': index.k1,
+        'b': index.b,
+        'passages': entries,
+        'titles': index.titles,
+        'doc_lengths': index.doc_lengths,
+        'avg_length': index.avg_length,
+        'sections': sections,
+    }
+    header_line = json.dumps(header, ensure_ascii=False, separators=(',', ':')).encode('utf-8') + b'\n'
+
+    tmp_path = output_path + '.tmp'
+    with open(tmp_path, 'wb') as f:
+        for part in (header_line, table, postings, strings, bodies):
+            f.write(part)
+    os.replace(tmp_path, output_path)
+    return {'passages': len(entries), 'terms': len(index.postings), 'header_bytes': len(header_line),
+            'bytes': len(header_line) + len(table) + len(postings) + len(strings) + len(bodies)}
+
+
+def load_artifact(path: str = ARTIFACT_PATH) -> PortfolioIndex:
+    """Memory-map a compiled artifact so job processes share its pages
+
+    Only the small header (titles, passage offsets and lengths) is parsed into
+    each process; the term table, postings and passage bodies stay in the mapped
+    pages and are read in place.
+    """
+    with open(path, 'rb') as f:
+        data = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+    header_end = data.find(b'\n')
+    header = json.loads(data[:header_end])
+    if header.get('format') != ARTIFACT_FORMAT or header.get('version') != ARTIFACT_VERSION:
+        data.close()
+        raise ValueError(f"Unsupported portfolio artifact: {header.get('format')} v{header.get('version')}")
+
+    base = header_end + 1
+    sections = header['sections']
+    terms = _MappedTerms(data, base, sections)
+    stats = dict(header,
+                 idf=_MappedColumn(terms, lambda record: record[2]),
+                 postings=_MappedColumn(terms, terms.postings))
+    passages = _MappedPassages(data, base + sections['bodies'], header['passages'])
+    index = PortfolioIndex(passages, k1=header['k1'], b=header['b'], stats=stats)
+    index.source = 'artifact'
+    return index
+
+
+def _artifact_is_current(path: str) -> bool:
+    try:
+        built = os.stat(path).st_mtime
+    except FileNotFoundError:
+        return False
+    for source in (DATA_PATH, CONTEXT_PATH):
+        try:
+            if os.stat(source).st_mtime > built:
+                return False
+        except FileNotFoundError:
+            continue
+    return True
+
+
+def load_portfolio_index(path: str = ARTIFACT_PATH) -> PortfolioIndex:
+    """Use the compiled artifact when it is up to date, otherwise build from source files"""
+    if _artifact_is_current(path):
+        try:
+            return load_artifact(path)
+        except (OSError, ValueError) as e:
+            logger.warning("Could not load portfolio artifact %s: %s", path, e)
+    return build_portfolio_index()
+
+
+if __name__ == '__main__':
+    command = sys.argv[1] if len(sys.argv) > 1 else 'compile'
+    if command != 'compile':
+        print("Usage: python portfolio_index.py compile [output_path]")
+        sys.exit(1)
+
+    output = sys.argv[2] if len(sys.argv) > 2 else ARTIFACT_PATH
+    started = time.perf_counter()
+    summary = compile_artifact(output)
+    print(f"Compiled {summary['passages']} passages, {summary['terms']} terms, "
+          f"{summary['bytes']} bytes to {output} in {(time.perf_counter() - started) * 1000:.0f} ms")
@@ -0,0 +1,72 @@
+import fnmatch
+import logging
+import os
+import re
+from typing import Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+# Comma-separated room name patterns: a plain prefix, a glob (* ? [...]) or re:<regex>.
+# Empty or '*' accepts every room.
+ROOM_FILTER = os.getenv('ROOM_FILTER', 'portfolio-voice-')
+
+_GLOB_CHARS = set('*?[')
+
+
+class RoomMatcher:
+    """Room name patterns compiled once; plain prefixes use a single startswith"""
+
+    def __init__(self, spec: str = ROOM_FILTER):
+        self.patterns = [p.strip() for p in spec.split(',') if p.strip()]
+        self.match_all = not self.patterns or '*' in self.patterns
+        self._prefixes = tuple(p for p in self.patterns if not p.startswith('re:') and not _GLOB_CHARS & set(p))
+        expressions = []
+        for pattern in self.patterns:
+            if pattern.startswith('re:'):
+                expressions.append(pattern[3:])
+            elif _GLOB_CHARS & set(pattern):
+                expressions.append(fnmatch.translate(pattern))
+        self._regex: Optional[re.Pattern] = None
+        if expressions:
+            self._regex = re.compile('|'.join(f'(?:{e})' for e in expressions), re.DOTALL)
+
+    def matches(self, room_name: str) -> bool:
+        if self.match_all:
+            return True
+        if self._prefixes and room_name.startswith(self._prefixes):
+            return True
+        return self._regex is not None and self._regex.fullmatch(room_name) is not None
+
+
+class RoomFilter:
+    """Accept/reject decisions for LiveKit job requests, with counters"""
+
+    def __init__(self, spec: str = ROOM_FILTER):
+        self.matcher = RoomMatcher(spec)
+        self.accepted = 0
+        self.rejected = 0
+
+    def allows(self, room_name: str) -> bool:
+        if self.matcher.matches(room_name):
+            self.accepted += 1
+            return True
+        self.rejected += 1
+        return False
+
+    def stats(self) -> Dict:
+        """Request counters for monitoring"""
+        return {'patterns': self.matcher.patterns, 'accepted': self.accepted, 'rejected': self.rejected}
+
+
+# Process-wide filter used by the worker's request hook
+room_filter = RoomFilter()
+
+
+async def request_room(request) -> None:
+    """WorkerOptions.request_fnc: runs in the worker before any job process is started"""
+    room_name = request.room.name
+    if room_filter.allows(room_name):
+        await request.accept()
+    else:
+        logger.info("Rejected room %s before job start", room_name, extra={'room_filter': room_filter.stats()})
+        await request.reject()
@@ -0,0 +1,204 @@
+import asyncio
+import logging
+import os
+import time
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from livekit import rtc
+from livekit.agents.types import APIConnectOptions
+
+logger = logging.getLogger(__name__)
+
+# How long a join may spend probing providers before it settles for what it has
+STARTUP_PROBE_DEADLINE = float(os.getenv('STARTUP_PROBE_DEADLINE', '3'))
+# 'hedged' probes the TTS candidates with staggered starts, 'serial' keeps the old try/except cascade
+SESSION_STARTUP_MODE = os.getenv('SESSION_STARTUP_MODE', 'hedged').lower()
+# A lower-ranked candidate is probed once the one above it fails or is this slow to answer
+STARTUP_HEDGE_DELAY = float(os.getenv('STARTUP_HEDGE_DELAY', '0.75'))
+
+PROBE_TEXT = "Hi."
+
+
+class TTSCandidate:
+    """A TTS configuration the session may start with, in order of preference"""
+
+    def __init__(self, name: str, tts):
+        self.name = name
+        self.tts = tts
+
+
+class StartupStats:
+    """Per-provider probe latency and failure counts for this worker process"""
+
+    def __init__(self):
+        self._latencies: Dict[str, List[float]] = {}
+        self._failures: Dict[str, int] = {}
+        self.picks: Dict[str, int] = {}
+
+    def record(self, name: str, latency: Optional[float]):
+        if latency is None:
+            self._failures[name] = self._failures.get(name, 0) + 1
+        else:
+            self._latencies.setdefault(name, []).append(latency)
+
+    def stats(self) -> Dict:
+        result = {}
+        for name in set(self._latencies) | set(self._failures):
+            latencies = sorted(self._latencies.get(name, []))
+            result[name] = {
+                'ok': len(latencies),
+                'failed': self._failures.get(name, 0),
+                'p50_ms': round(latencies[len(latencies) // 2] * 1000) if latencies else None,
+                'max_ms': round(latencies[-1] * 1000) if latencies else None,
+            }
+        result['picks'] = dict(self.picks)
+        return result
+
+
+def _probe_options(deadline: float) -> APIConnectOptions:
+    # A probe gets one attempt; retries would push it past the deadline anyway
+    return APIConnectOptions(max_retry=0, timeout=deadline)
+
+
+async def probe_tts(tts, deadline: float = STARTUP_PROBE_DEADLINE) -> float:
+    """Seconds until the provider returns its first audio for a short phrase"""
+    # Probe the provider itself, not a cache in front of it
+    provider = getattr(tts, 'inner', tts)
+    started = time.perf_counter()
+    stream = provider.synthesize(PROBE_TEXT, conn_options=_probe_options(deadline))
+    try:
+        async for _ in stream:
+            return time.perf_counter() - started
+    finally:
+        await stream.aclose()
+    raise RuntimeError("TTS probe returned no audio")
+
+
+async def probe_stt(stt, deadline: float = STARTUP_PROBE_DEADLINE) -> float:
+    """Seconds for the provider to transcribe 100 ms of silence"""
+    started = time.perf_counter()
+    silence = rtc.AudioFrame(b'\x00\x00' * 1600, 16000, 1, 1600)
+    await stt.recognize(silence, conn_options=_probe_options(deadline))
+    return time.perf_counter() - started
+
+
+async def _timed(name: str, probe) -> Tuple[str, Optional[float], Optional[BaseException]]:
+    try:
+        return name, await probe, None
+    except Exception as e:
+        return name, None, e
+
+
+_background = set()
+
+
+def _probe_stt_in_background(stt, deadline: float):
+    """Record STT health in the startup stats without holding up the join"""
+    task = asyncio.ensure_future(_timed('stt', probe_stt(stt, deadline)))
+    _background.add(task)
+    task.add_done_callback(_record_stt)
+
+
+def _record_stt(task: asyncio.Task):
+    _background.discard(task)
+    if task.cancelled():
+        return
+    name, latency, error = task.result()
+    startup_stats.record(name, latency)
+    if error is not None:
+        logger.warning("STT startup probe failed: %s", str(error) or type(error).__name__)
+
+
+async def pick_tts(candidates: Sequence[TTSCandidate], stt=None,
+                   deadline: float = STARTUP_PROBE_DEADLINE,
+                   hedge_delay: float = STARTUP_HEDGE_DELAY) -> Tuple[TTSCandidate, Dict]:
+    """Probe the candidates in order of preference and return the most preferred healthy one
+
+    The primary is probed first; the next candidate is only probed once every one
+    above it has failed or hedge_delay has passed, so a healthy join pays for one
+    synthesis. A candidate is chosen as soon as it and every candidate ranked above
+    it have answered, and the whole pick is bounded by one deadline. When nothing
+    is healthy in time the last candidate is returned, like the old final fallback.
+    The STT probe runs in the background and only feeds the stats.
+    """
+    if stt is not None:
+        _probe_stt_in_background(stt, deadline)
+
+    loop = asyncio.get_running_loop()
+    stop_at = loop.time() + deadline
+    tasks: Dict[asyncio.Task, int] = {}
+
+    def start_next():
+        index = len(tasks)
+        candidate = candidates[index]
+        probe = probe_tts(candidate.tts, max(0.0, stop_at - loop.time()))
+        tasks[asyncio.ensure_future(_timed(candidate.name, probe))] = index
+        return loop.time() + hedge_delay
+
+    results: Dict[str, Optional[float]] = {}
+    errors: Dict[str, str] = {}
+    healthy = [False] * len(candidates)
+    answered = [False] * len(candidates)
+    chosen: Optional[int] = None
+
+    next_start = start_next()
+    try:
+        while chosen is None:
+            pending = [task for task in tasks if not task.done()]
+            # Below a healthy answer there is nothing more worth probing
+            more = len(tasks) < len(candidates) and not any(healthy)
+            if not pending and not more:
+                break
+            remaining = stop_at - loop.time()
+            if remaining <= 0:
+                break
+            timeout = min(remaining, max(0.0, next_start - loop.time())) if more else remaining
+            if pending:
+                done, _ = await asyncio.wait(pending, timeout=timeout, return_when=asyncio.FIRST_COMPLETED)
+            else:
+                done = set()
+            for task in done:
+                name, latency, error = task.result()
+                index = tasks[task]
+                answered[index] = True
+                healthy[index] = latency is not None
+                results[name] = latency
+                if error is not None:
+                    errors[name] = str(error) or type(error).__name__
+            for index in range(len(tasks)):
+                if not answered[index]:
+                    break
+                if healthy[index]:
+                    chosen = index
+                    break
+            if chosen is None and len(tasks) < len(candidates) and not any(healthy):
+                # Everything probed so far failed, or the slowest is past the hedge delay
+                if all(task.done() for task in tasks) or loop.time() >= next_start:
+                    next_start = start_next()
+
+        hit_deadline = chosen is None
+        if hit_deadline:
+            # Deadline hit: best candidate that answered healthy, else the last resort
+            chosen = next((i for i, ok in enumerate(healthy) if ok), len(candidates) - 1)
+    finally:
+        for task in tasks:
+            if not task.done():
+                task.cancel()
+
+    probed = {candidates[index].name for index in tasks.values()}
+    for candidate in candidates:
+        if candidate.name in results:
+            startup_stats.record(candidate.name, results[candidate.name])
+        elif hit_deadline and candidate.name not in errors:
+            # Still running at the deadline, or never reached before it
+            errors[candidate.name] = 'deadline'
+            if candidate.name in probed:
+                startup_stats.record(candidate.name, None)
+    chosen_candidate = candidates[chosen]
+    startup_stats.picks[chosen_candidate.name] = startup_stats.picks.get(chosen_candidate.name, 0) + 1
+
+    return chosen_candidate, {'latency': results, 'errors': errors, 'probed': sorted(probed)}
+
+
+# Process-wide probe history, printed when a session ends
+startup_stats = StartupStats()
@@ -0,0 +1,214 @@
+import os
+import sys
+import time
+from collections import OrderedDict
+from typing import Dict, List, Optional
+
+from state_backend import StateBackend, VersionConflict
+
+
+class BookingState:
+    """Per-conversation booking progress"""
+
+    __slots__ = ('session_id', 'stage', 'name', 'email', 'email_parts', 'version', 'last_seen')
+
+    # Fields persisted to the state backend
+    FIELDS = ('stage', 'name', 'email', 'email_parts')
+
+    def __init__(self, session_id: str):
+        self.session_id = session_id
+        self.stage = 'initial'
+        self.name: Optional[str] = None
+        self.email: Optional[str] = None
+        # Letters collected while the caller spells an address; created on first use
+        self.email_parts: Optional[List[str]] = None
+        # Backend version this copy was loaded from or last saved as
+        self.version = 0
+        self.last_seen = time.monotonic()
+
+    def to_dict(self) -> Dict:
+        return {field: getattr(self, field) for field in self.FIELDS}
+
+    def update(self, data: Dict, version: int):
+        """Replace the persisted fields with a copy loaded from the backend"""
+        for field in self.FIELDS:
+            setattr(self, field, data.get(field))
+        self.stage = self.stage or 'initial'
+        self.version = version
+
+    def size_bytes(self) -> int:
+        """Approximate memory held by this record and its fields"""
+        size = sys.getsizeof(self)
+        for value in (self.session_id, self.stage, self.name, self.email):
+            if value is not None:
+                size += sys.getsizeof(value)
+        if self.email_parts is not None:
+            size += sys.getsizeof(self.email_parts) + sum(sys.getsizeof(p) for p in self.email_parts)
+        return size
+
+    def __repr__(self) -> str:
+        return (f"BookingState(stage={self.stage!r}, name={self.name!r}, email={self.email!r}, "
+                f"email_parts={self.email_parts!r})")
+
+
+class SessionStore:
+    """Booking states keyed by session id with a size cap, idle TTL and LRU eviction
+
+    With a backend, this is a bounded cache in front of it: states evicted here
+    or owned by another process are loaded back on the next turn.
+    """
+
+    def __init__(self, max_sessions: Optional[int] = None, idle_ttl: Optional[float] = None,
+                 backend: Optional[StateBackend] = None):
+        self.max_sessions = (max_sessions if max_sessions is not None
+                             else int(os.getenv('SESSION_STORE_MAX', '1000')))
+        self.idle_ttl = idle_ttl if idle_ttl is not None else float(os.getenv('SESSION_STORE_TTL', '1800'))
+        self.backend = backend
+
+        # Oldest activity first, so expiry and LRU eviction both pop from the front
+        self._states: 'OrderedDict[str, BookingState]' = OrderedDict()
+
+        self.created = 0
+        self.removed = 0
+        self.expired = 0
+        self.evicted = 0
+        self.loaded = 0
+        self.conflicts = 0
+
+    def __len__(self) -> int:
+        return len(self._states)
+
+    def __contains__(self, session_id: str) -> bool:
+        return self.get(session_id) is not None
+
+    def get(self, session_id: str) -> Optional[BookingState]:
+        """Return the live state for a session and mark it as recently used"""
+        state = self._cached(session_id)
+        if state is None and self.backend is not None:
+            state = self._loaded(session_id, self.backend.load(session_id))
+        return state
+
+    async def aget(self, session_id: str) -> Optional[BookingState]:
+        """get() for the event loop: the backend is read without blocking it"""
+        state = self._cached(session_id)
+        if state is None and self.backend is not None:
+            state = self._loaded(session_id, await self.backend.aload(session_id))
+        return state
+
+    def _cached(self, session_id: str) -> Optional[BookingState]:
+        now = time.monotonic()
+        self._expire(now)
+        state = self._states.get(session_id)
+        if state is not None:
+            state.last_seen = now
+            self._states.move_to_end(session_id)
+        return state
+
+    def _loaded(self, session_id: str, record) -> Optional[BookingState]:
+        if record is None:
+            return None
+        # Another turn may have cached it while the backend was read
+        state = self._states.get(session_id)
+        if state is None:
+            state = BookingState(session_id)
+            state.update(*record)
+            self._insert(state)
+            self.loaded += 1
+        return state
+
+    def get_or_create(self, session_id: str) -> BookingState:
+        return self.get(session_id) or self._create(session_id)
+
+    async def aget_or_create(self, session_id: str) -> BookingState:
+        return await self.aget(session_id) or self._create(session_id)
+
+    def _create(self, session_id: str) -> BookingState:
+        state = self._states.get(session_id)
+        if state is None:
+            state = BookingState(session_id)
+            self._insert(state)
+            self.created += 1
+        return state
+
+    def _insert(self, state: BookingState):
+        self._states[state.session_id] = state
+        while len(self._states) > self.max_sessions:
+            self._states.popitem(last=False)
+            self.evicted += 1
+
+    def save(self, state: BookingState) -> bool:
+        """Persist a state after a turn; on a version conflict the stored copy wins
+
+        Returns False when the state was replaced by the newer stored copy.
+        """
+        if self.backend is None:
+            return True
+        try:
+            state.version = self.backend.save(state.session_id, state.to_dict(), state.version)
+            return True
+        except VersionConflict:
+            self.conflicts += 1
+            record = self.backend.load(state.session_id)
+            if record is not None:
+                state.update(*record)
+            return False
+
+    async def asave(self, state: BookingState) -> bool:
+        """save() for the event loop"""
+        if self.backend is None:
+            return True
+        try:
+            state.version = await self.backend.asave(state.session_id, state.to_dict(), state.version)
+            return True
+        except VersionConflict:
+            self.conflicts += 1
+            record = await self.backend.aload(state.session_id)
+            if record is not None:
+                state.update(*record)
+            return False
+
+    def remove(self, session_id: str) -> bool:
+        """Drop a finished session; returns whether it was stored"""
+        if self.backend is not None:
+            self.backend.delete(session_id)
+        return self._forget(session_id)
+
+    async def release(self, session_id: str) -> bool:
+        """Drop this process's copy of a session whose job is ending, keeping the stored one
+
+        Buffered writes are flushed so another process can pick the conversation up;
+        the backend purges the row once it has been idle for max_age.
+        """
+        if self.backend is not None:
+            await self.backend.aflush()
+        return self._forget(session_id)
+
+    def _forget(self, session_id: str) -> bool:
+        stored = self._states.pop(session_id, None) is not None
+        if stored:
+            self.removed += 1
+        return stored
+
+    def _expire(self, now: float):
+        cutoff = now - self.idle_ttl
+        while self._states:
+            state = next(iter(self._states.values()))
+            if state.last_seen > cutoff:
+                break
+            self._states.popitem(last=False)
+            self.expired += 1
+
+    def stats(self) -> Dict:
+        """Counts and memory gauges for monitoring"""
+        self._expire(time.monotonic())
+        return {
+            'sessions': len(self._states),
+            'approx_bytes': sum(state.size_bytes() for state in self._states.values()),
+            'created': self.created,
+            'removed': self.removed,
+            'expired': self.expired,
+            'evicted': self.evicted,
+            'loaded': self.loaded,
+            'conflicts': self.conflicts,
+            'backend': self.backend.stats() if self.backend is not None else None,
+        }
@@ -0,0 +1,163 @@
+#!/usr/bin/env python3
+"""
+Replay synthetic room arrivals against a fake LiveKit dispatcher to compare admission policies
+
+Each fake worker models one agent worker process on the Fly machine: CPU and
+memory grow with its sessions, its CPU reading lags behind like LiveKit's moving
+average, and its event loop falls behind once the CPU saturates. The dispatcher
+offers each room to the least-loaded worker that reports itself available and
+keeps retrying for a few seconds before the room goes unanswered.
+
+    python simulate_worker_load.py [seed]
+"""
+
+import random
+import sys
+from collections import deque
+from typing import Callable, Dict, List
+
+from worker_load import WORKER_LOAD_THRESHOLD, WORKER_MAX_LOOP_LAG, WORKER_MAX_SESSIONS, score
+
+STEP = 0.5                # LiveKit refreshes worker load every 0.5s
+DURATION = 3600.0
+WORKERS = 2               # one per core on the 2-CPU / 4 GB machine
+MEMORY_BUDGET_MB = 2048.0  # per worker
+DISPATCH_RETRY = 10.0     # seconds a room waits for an available worker
+
+# Resource model for one worker process
+BASE_CPU, CPU_PER_SESSION = 0.05, 0.17
+BASE_RSS_MB, RSS_PER_SESSION_MB = 450.0, 260.0
+CPU_AVERAGE_WINDOW = 5    # samples, as in LiveKit's default load calculation
+
+LoadPolicy = Callable[['FakeWorker'], float]
+
+
+class FakeWorker:
+    def __init__(self, rng: random.Random):
+        self.rng = rng
+        self.sessions: List[float] = []  # end times
+        self.cpu_readings = deque([BASE_CPU], maxlen=CPU_AVERAGE_WINDOW)
+
+    @property
+    def demand(self) -> float:
+        """CPU the sessions want; above 1.0 they are starved"""
+        return BASE_CPU + CPU_PER_SESSION * len(self.sessions) * self.rng.uniform(0.85, 1.15)
+
+    @property
+    def cpu(self) -> float:
+        return sum(self.cpu_readings) / len(self.cpu_readings)
+
+    @property
+    def rss_mb(self) -> float:
+        return BASE_RSS_MB + RSS_PER_SESSION_MB * len(self.sessions)
+
+    def loop_lag(self, demand: float) -> float:
+        return 0.002 + max(0.0, demand - 0.85) * 0.8
+
+    def step(self, now: float) -> float:
+        self.sessions = [end for end in self.sessions if end > now]
+        demand = self.demand
+        self.cpu_readings.append(min(1.0, demand))
+        return demand
+
+
+def accept_all(worker: FakeWorker) -> float:
+    """No load_fnc: the worker never reports itself full"""
+    return 0.0
+
+
+def cpu_only(worker: FakeWorker) -> float:
+    """LiveKit's default: averaged CPU against a 0.7 threshold"""
+    return worker.cpu
+
+
+def combined(worker: FakeWorker) -> float:
+    """worker_load.score over CPU, loop lag, RSS and sessions"""
+    return score(worker.cpu, worker.loop_lag(worker.demand), worker.rss_mb, len(worker.sessions),
+                 WORKER_MAX_LOOP_LAG, MEMORY_BUDGET_MB, WORKER_MAX_SESSIONS)
+
+
+POLICIES: Dict[str, tuple] = {
+    'accept-all': (accept_all, 1.0),
+    'cpu-only (LiveKit default)': (cpu_only, 0.7),
+    'worker_load': (combined, WORKER_LOAD_THRESHOLD),
+}
+
+
+def arrivals(rng: random.Random, duration: float = DURATION) -> List[tuple]:
+    """(arrival time, call length) pairs: a steady trickle with two bursts"""
+    rooms, now = [], 0.0
+    while now < duration:
+        burst = 900 <= now < 1200 or 2400 <= now < 2520
+        now += rng.expovariate(1 / (6.0 if burst else 40.0))
+        rooms.append((now, rng.expovariate(1 / 240.0) + 30))
+    return rooms
+
+
+def simulate(policy: LoadPolicy, threshold: float, seed: int = 7) -> Dict:
+    """Run one policy over the same arrivals; degraded = session-seconds on a starved worker"""
+    rng = random.Random(seed)
+    rooms = deque(arrivals(random.Random(seed)))
+    workers = [FakeWorker(rng) for _ in range(WORKERS)]
+    waiting: deque = deque()
+    served = unanswered = 0
+    degraded = 0.0
+    peak_sessions = 0
+    peak_rss = 0.0
+
+    now = 0.0
+    while now < DURATION or waiting:
+        for worker in workers:
+            demand = worker.step(now)
+            if demand > 1.0:
+                degraded += len(worker.sessions) * STEP
+            peak_sessions = max(peak_sessions, len(worker.sessions))
+            peak_rss = max(peak_rss, worker.rss_mb)
+        while rooms and rooms[0][0] <= now:
+            waiting.append(rooms.popleft())
+
+        # Offer each waiting room to the least-loaded available worker
+        loads = [policy(worker) for worker in workers]
+        still_waiting = deque()
+        for arrived, length in waiting:
+            available = [i for i, load in enumerate(loads) if load < threshold]
+            if available:
+                chosen = min(available, key=lambda i: loads[i])
+                workers[chosen].sessions.append(now + length)
+                # The accepting worker counts the reserved job before its load catches up
+                loads[chosen] = policy(workers[chosen])
+                served += 1
+            elif now - arrived >= DISPATCH_RETRY:
+                unanswered += 1
+            else:
+                still_waiting.append((arrived, length))
+        waiting = still_waiting
+        now += STEP
+
+    total = served + unanswered
+    return {
+        'rooms': total,
+        'served': served,
+        'unanswered': unanswered,
+        'degraded_session_s': round(degraded),
+        'degraded_share': degraded / max(1.0, sum(length for _, length in arrivals(random.Random(seed)))),
+        'peak_sessions': peak_sessions,
+        'peak_rss_mb': round(peak_rss),
+    }
+
+
+def main():
+    seed = int(sys.argv[1]) if len(sys.argv) > 1 else 7
+    print(f"🏁 Worker admission simulation: {WORKERS} workers, {DURATION / 60:.0f} min, seed {seed}")
+    print("=" * 96)
+    print(f"{'policy':<28}{'rooms':>7}{'served':>8}{'unanswered':>12}"
+          f"{'degraded s':>12}{'degraded %':>12}{'peak sess':>11}{'peak RSS':>10}")
+    for name, (policy, threshold) in POLICIES.items():
+        r = simulate(policy, threshold, seed)
+        print(f"{name:<28}{r['rooms']:>7}{r['served']:>8}{r['unanswered']:>12}"
+              f"{r['degraded_session_s']:>12}{r['degraded_share'] * 100:>11.1f}%"
+              f"{r['peak_sessions']:>11}{r['peak_rss_mb']:>10}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,283 @@
+import asyncio
+import concurrent.futures
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+from datetime import datetime
+from typing import Awaitable, Callable, Dict, List, Optional, Tuple
+
+from slot_index import SlotIndex
+
+logger = logging.getLogger(__name__)
+
+
+SlotLoader = Callable[[], Awaitable[Optional[List[str]]]]
+
+# Each room runs in its own job process, so rooms only share availability through this file
+SLOT_CACHE_DB = os.getenv(
+    'SLOT_CACHE_DB',
+    '/data/slot-cache.sqlite3' if os.path.isdir('/data') else '',
+)
+
+
+def slot_key(slot: str) -> str:
+    """Normalise a slot timestamp so '...000Z' and '+00:00' forms compare equal"""
+    try:
+        return datetime.fromisoformat(slot.replace('Z', '+00:00')).isoformat()
+    except (AttributeError, ValueError):
+        return slot
+
+
+class SharedSlotStore:
+    """Slot windows in a SQLite file that every job process on the machine reads and writes
+
+    Calls block, so SlotCache makes them from a worker thread.
+    """
+
+    def __init__(self, path: str, max_age: float = 3600):
+        self.path = path
+        self.max_age = max_age
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(path, timeout=1, isolation_level=None, check_same_thread=False)
+        self._db.execute('PRAGMA journal_mode=WAL')
+        self._db.execute('PRAGMA synchronous=NORMAL')
+        self._db.execute(
+            'CREATE TABLE IF NOT EXISTS slot_windows ('
+            'key TEXT PRIMARY KEY, slots TEXT NOT NULL, fetched_at REAL NOT NULL)'
+        )
+
+    @staticmethod
+    def _key(key: Tuple) -> str:
+        return json.dumps(list(key))
+
+    def get(self, key: Tuple) -> Optional[Tuple[List[str], float]]:
+        """(slots, wall-clock fetch time) or None"""
+        with self._lock:
+            row = self._db.execute('SELECT slots, fetched_at FROM slot_windows WHERE key = ?',
+                                   (self._key(key),)).fetchone()
+        return (json.loads(row[0]), row[1]) if row else None
+
+    def put(self, key: Tuple, slots: List[str], fetched_at: float):
+        with self._lock:
+            self._db.execute('INSERT OR REPLACE INTO slot_windows (key, slots, fetched_at) VALUES (?, ?, ?)',
+                             (self._key(key), json.dumps(slots), fetched_at))
+            self._db.execute('DELETE FROM slot_windows WHERE fetched_at < ?', (time.time() - self.max_age,))
+
+    def remove_slot(self, booked: str):
+        """Drop a booked slot (in slot_key form) from every stored window"""
+        with self._lock:
+            self._db.execute('BEGIN IMMEDIATE')
+            try:
+                for key, slots in self._db.execute('SELECT key, slots FROM slot_windows').fetchall():
+                    slots = json.loads(slots)
+                    remaining = [s for s in slots if slot_key(s) != booked]
+                    if len(remaining) != len(slots):
+                        self._db.execute('UPDATE slot_windows SET slots = ? WHERE key = ?',
+                                         (json.dumps(remaining), key))
+                self._db.execute('COMMIT')
+            except Exception:
+                self._db.execute('ROLLBACK')
+                raise
+
+
+class SlotCache:
+    """TTL cache for Cal.com availability with stale-while-revalidate refresh
+
+    Entries live in this process and, when a SharedSlotStore is given, in a file
+    shared with the other job processes on the machine, so a window fetched for
+    one room is served to the next rooms without another Cal.com request.
+    """
+
+    def __init__(self, ttl: Optional[float] = None, stale_ttl: Optional[float] = None,
+                 shared: Optional[SharedSlotStore] = None):
+        # Fresh entries are served as-is, stale ones are served while a refresh runs
+        self.ttl = ttl if ttl is not None else float(os.getenv('SLOT_CACHE_TTL', '30'))
+        self.stale_ttl = (stale_ttl if stale_ttl is not None
+                          else float(os.getenv('SLOT_CACHE_STALE_TTL', '300')))
+
+        self._entries: Dict[Tuple, Tuple[List[str], float]] = {}
+        # Built once per fetch so preferred times are resolved without re-sorting
+        self._indexes: Dict[Tuple, SlotIndex] = {}
+        self._inflight: Dict[Tuple, asyncio.Future] = {}
+        # Windows whose last fetch failed: an empty answer for them means unknown, not fully booked
+        self._failed = set()
+        # Booked slots in invalidation order; its length is the invalidation generation
+        self._booked: List[str] = []
+        self.shared = shared
+        self._writes = set()
+        # One writer thread, so an invalidation never lands before the write it corrects
+        self._writer: Optional[concurrent.futures.ThreadPoolExecutor] = None
+
+        self.hits = 0
+        self.stale_hits = 0
+        self.misses = 0
+        self.shared_hits = 0
+        self.fetches = 0
+
+    async def get(self, key: Tuple, loader: SlotLoader) -> List[str]:
+        """Return slots for key, calling loader only when nothing usable is cached"""
+        entry = self._entries.get(key)
+        if entry is None and self.shared is not None:
+            entry = await self._load_shared(key)
+        if entry is not None:
+            slots, fetched_at = entry
+            age = time.monotonic() - fetched_at
+            if age < self.ttl:
+                self.hits += 1
+                return list(slots)
+            if age < self.ttl + self.stale_ttl:
+                # Answer immediately and refresh in the background
+                self.stale_hits += 1
+                self._start_fetch(key, loader)
+                return list(slots)
+
+        self.misses += 1
+        slots = await asyncio.shield(self._start_fetch(key, loader))
+        return list(slots) if slots else []
+
+    async def get_index(self, key: Tuple, loader: SlotLoader) -> SlotIndex:
+        """Return a SlotIndex over the slots for key, fetching like get() does"""
+        slots = await self.get(key, loader)
+        index = self._indexes.get(key)
+        return index if index is not None else SlotIndex(slots)
+
+    def peek(self, key: Tuple) -> Optional[List[str]]:
+        """Return cached slots regardless of age without triggering a fetch"""
+        entry = self._entries.get(key)
+        return list(entry[0]) if entry is not None else None
+
+    def failed(self, key: Tuple) -> bool:
+        """Whether the last fetch for key failed or timed out"""
+        return key in self._failed
+
+    def _start_fetch(self, key: Tuple, loader: SlotLoader) -> asyncio.Future:
+        # Single-flight: concurrent misses for the same window share one request
+        task = self._inflight.get(key)
+        if task is None:
+            task = asyncio.ensure_future(self._fetch(key, loader))
+            self._inflight[key] = task
+            task.add_done_callback(lambda _: self._inflight.pop(key, None))
+        return task
+
+    async def _fetch(self, key: Tuple, loader: SlotLoader) -> Optional[List[str]]:
+        if self.shared is not None:
+            # Another process may have refreshed the window since this one last looked
+            entry = await self._load_shared(key)
+            if entry is not None and time.monotonic() - entry[1] < self.ttl:
+                self._failed.discard(key)
+                return list(entry[0])
+        self.fetches += 1
+        generation = len(self._booked)
+        slots = await loader()
+        # Failed fetches return None and are never cached
+        if slots is None:
+            self._failed.add(key)
+        elif generation != len(self._booked):
+            # A slot was booked while this fetch ran, so the answer may still offer it
+            self._failed.discard(key)
+            booked = set(self._booked[generation:])
+            slots = [s for s in slots if slot_key(s) not in booked]
+        else:
+            self._failed.discard(key)
+            self._entries[key] = (list(slots), time.monotonic())
+            self._indexes[key] = SlotIndex(slots)
+            if self.shared is not None:
+                self._write_shared(self.shared.put, key, list(slots), time.time())
+        return slots
+
+    async def _load_shared(self, key: Tuple) -> Optional[Tuple[List[str], float]]:
+        """Copy a usable window from the shared store into this process"""
+        generation = len(self._booked)
+        try:
+            row = await asyncio.to_thread(self.shared.get, key)
+        except (sqlite3.Error, OSError) as e:
+            logger.warning("Shared slot cache read failed: %s", e)
+            return None
+        if row is None:
+            return None
+        slots, fetched_wall = row
+        age = max(0.0, time.time() - fetched_wall)
+        if age >= self.ttl + self.stale_ttl:
+            return None
+        if generation != len(self._booked):
+            # Read before a booking's removal reached the file; the next read sees it
+            return None
+        current = self._entries.get(key)
+        if current is not None and time.monotonic() - current[1] <= age:
+            # This process already has a copy at least as new
+            return current
+        entry = (slots, time.monotonic() - age)
+        self._entries[key] = entry
+        self._indexes[key] = SlotIndex(slots)
+        self.shared_hits += 1
+        return entry
+
+    def _write_shared(self, write, *args):
+        def run():
+            try:
+                write(*args)
+            except (sqlite3.Error, OSError) as e:
+                logger.warning("Shared slot cache write failed: %s", e)
+
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            run()
+            return
+        if self._writer is None:
+            self._writer = concurrent.futures.ThreadPoolExecutor(1, thread_name_prefix='slot-cache-writer')
+        # Writes do not hold up the caller; keep a reference until they finish
+        task = loop.run_in_executor(self._writer, run)
+        self._writes.add(task)
+        task.add_done_callback(self._writes.discard)
+
+    def invalidate_slot(self, slot: str):
+        """Drop a booked slot from every cached window, here and in the shared store"""
+        booked = slot_key(slot)
+        self._booked.append(booked)
+        for key, (slots, fetched_at) in list(self._entries.items()):
+            remaining = [s for s in slots if slot_key(s) != booked]
+            if len(remaining) != len(slots):
+                self._entries[key] = (remaining, fetched_at)
+                self._indexes[key] = SlotIndex(remaining)
+        if self.shared is not None:
+            self._write_shared(self.shared.remove_slot, booked)
+
+    def clear(self):
+        """Forget every cached window"""
+        self._entries.clear()
+        self._indexes.clear()
+
+    def stats(self) -> Dict:
+        """Cache counters for monitoring"""
+        return {
+            'entries': len(self._entries),
+            'hits': self.hits,
+            'stale_hits': self.stale_hits,
+            'misses': self.misses,
+            'shared_hits': self.shared_hits,
+            'fetches': self.fetches,
+            'inflight': len(self._inflight),
+        }
+
+
+def create_shared_slot_store(path: Optional[str] = None) -> Optional[SharedSlotStore]:
+    """Store at SLOT_CACHE_DB, or None to keep the cache in this process only"""
+    path = path if path is not None else SLOT_CACHE_DB
+    if not path:
+        return None
+    try:
+        return SharedSlotStore(path)
+    except (sqlite3.Error, OSError) as e:
+        logger.warning("Shared slot cache unavailable at %s: %s", path, e)
+        return None
+
+
+# Per job process; rooms in other job processes share windows through SLOT_CACHE_DB
+slot_cache = SlotCache(shared=create_shared_slot_store())
@@ -0,0 +1,255 @@
+import re
+from bisect import bisect_left
+from datetime import date, datetime, time, timedelta, timezone
+from typing import Dict, List, NamedTuple, Optional, Tuple
+
+
+# Times are read out to callers in UTC (see get_formatted_available_times), so they are resolved in UTC too
+SLOT_TIMEZONE = timezone.utc
+
+# Parts of the day as [start hour, end hour)
+DAY_PARTS = {'morning': (0, 12), 'afternoon': (12, 17), 'evening': (17, 24)}
+_PART_WORDS = {'morning': 'morning', 'afternoon': 'afternoon', 'evening': 'evening', 'night': 'evening', 'tonight': 'evening'}
+
+_WEEKDAYS = ['monday', 'tuesday', 'wednesday', 'thursday', 'friday', 'saturday', 'sunday']
+_MONTHS = ['january', 'february', 'march', 'april', 'may', 'june', 'july',
+           'august', 'september', 'october', 'november', 'december']
+
+_DAY = re.compile(
+    r'\b(?:(day after tomorrow)|(today|tonight)|(tomorrow)|(next\s+)?(' + '|'.join(_WEEKDAYS) + r')'
+    r'|(' + '|'.join(_MONTHS) + r')\s+(\d{1,2})(?:st|nd|rd|th)?'
+    r'|(\d{1,2})(?:st|nd|rd|th)?\s+(?:of\s+)?(' + '|'.join(_MONTHS) + r')'
+    r'|(?:the\s+)?(\d{1,2})(?:st|nd|rd|th))\b'
+)
+# "10 AM", "3:30pm", "at 3", "10:30", "10 o'clock"; a bare number is not a time on its own
+_CLOCK = re.compile(
+    r'\b(at\s+)?(\d{1,2})(?::(\d{2}))?(\s*o\'?clock)?\s*(a\.?m\.?|p\.?m\.?)?(?![a-z0-9:])'
+    r'|\b(noon|midday)\b'
+)
+# Spoken clock times as the STT writes them: "ten thirty", "two forty five", "eleven o'clock"
+_HOUR_WORDS = ['one', 'two', 'three', 'four', 'five', 'six', 'seven', 'eight', 'nine', 'ten', 'eleven', 'twelve']
+_MINUTE_WORDS = {'fifteen': 15, 'thirty': 30, 'forty five': 45, 'forty-five': 45}
+_SPOKEN_CLOCK = re.compile(
+    r'\b(' + '|'.join(_HOUR_WORDS) + r')(?:[\s-]+(' + '|'.join(_MINUTE_WORDS) + r'))?\b'
+)
+# Something that reads like a time of day; if none of it parses, the time was not understood
+_CLOCK_HINT = re.compile(r"\bat\s+(?!any\b|all\b|the\b)[a-z0-9]|o'?clock|\bhalf\b|\bquarter\b|\d\s*[ap]\.?m\b|\d:\d")
+# Explicit requests for the first open slot
+_FIRST = re.compile(r'\bfirst\s+(?:available|open|slot|one)|\b(?:earliest|soonest|next available|as soon as possible|asap)\b')
+_PART = re.compile(r'\b(' + '|'.join(_PART_WORDS) + r')\b')
+
+
+def _parse_slot(slot: str) -> datetime:
+    return datetime.fromisoformat(slot.replace('Z', '+00:00')).astimezone(SLOT_TIMEZONE)
+
+
+def _part_of_day(moment: datetime) -> str:
+    for part, (start, end) in DAY_PARTS.items():
+        if start <= moment.hour < end:
+            return part
+    return 'evening'
+
+
+def describe_slot(slot: str) -> str:
+    """Slot as it is read out to callers, e.g. 'Thursday, October 22 at 10:00 AM'"""
+    moment = _parse_slot(slot)
+    return f"{moment.strftime('%A, %B %d')} at {moment.strftime('%I:%M %p')}"
+
+
+class TimeQuery(NamedTuple):
+    """What a caller asked for; every part is optional"""
+    day: Optional[date]
+    part: Optional[str]
+    clock: Optional[time]
+    exact: Optional[datetime]
+    # Nothing given, or an explicit "first available"
+    first: bool = False
+    # A time of day was mentioned but could not be read
+    unclear: bool = False
+
+    @property
+    def empty(self) -> bool:
+        return self.day is None and self.part is None and self.clock is None and self.exact is None
+
+
+def _spoken_clock(match: re.Match) -> str:
+    hour = _HOUR_WORDS.index(match.group(1)) + 1
+    minute = match.group(2)
+    return f'{hour}:{_MINUTE_WORDS[minute]:02d}' if minute else str(hour)
+
+
+def _day_of_month(today: date, month_day: int) -> Optional[date]:
+    """'the 22nd': this month, or next month once it has passed"""
+    year, month = today.year, today.month
+    for _ in range(2):
+        try:
+            day = date(year, month, month_day)
+        except ValueError:
+            day = None
+        if day is not None and day >= today:
+            return day
+        year, month = (year + 1, 1) if month == 12 else (year, month + 1)
+    return None
+
+
+def parse_preferred_time(text: str, now: Optional[datetime] = None) -> TimeQuery:
+    """Day, part of day and clock time in phrases like 'tomorrow at 10 AM' or 'Thursday afternoon'"""
+    now = (now or datetime.now(SLOT_TIMEZONE)).astimezone(SLOT_TIMEZONE)
+    text = (text or '').strip()
+    if not text:
+        return TimeQuery(None, None, None, None, first=True)
+    try:
+        # The LLM sometimes passes the slot timestamp itself
+        exact = datetime.fromisoformat(text.replace('Z', '+00:00'))
+        if exact.tzinfo is None:
+            exact = exact.replace(tzinfo=SLOT_TIMEZONE)
+        return TimeQuery(None, None, None, exact.astimezone(SLOT_TIMEZONE))
+    except ValueError:
+        pass
+
+    lower = _SPOKEN_CLOCK.sub(_spoken_clock, text.lower())
+    today = now.date()
+    day = None
+    match = _DAY.search(lower)
+    if match:
+        (after_tomorrow, same_day, tomorrow, next_week, weekday, month, month_day,
+         day_first, month_after, ordinal) = match.groups()
+        if after_tomorrow:
+            day = today + timedelta(days=2)
+        elif same_day:
+            day = today
+        elif tomorrow:
+            day = today + timedelta(days=1)
+        elif weekday:
+            ahead = (_WEEKDAYS.index(weekday) - today.weekday()) % 7
+            if next_week and ahead == 0:
+                ahead = 7
+            day = today + timedelta(days=ahead)
+        elif ordinal:
+            day = _day_of_month(today, int(ordinal))
+        else:
+            month, month_day = (month, month_day) if month else (month_after, day_first)
+            try:
+                day = date(today.year, _MONTHS.index(month) + 1, int(month_day))
+                if day < today:
+                    day = day.replace(year=today.year + 1)
+            except ValueError:
+                day = None
+
+    clock = None
+    for match in _CLOCK.finditer(lower):
+        at, hour, minute, oclock, meridiem, noon = match.groups()
+        if noon:
+            clock = time(12, 0)
+            break
+        if not (at or minute or oclock or meridiem):
+            continue
+        hour, minute = int(hour), int(minute or 0)
+        if meridiem:
+            hour = hour % 12 + (12 if meridiem.startswith('p') else 0)
+        elif 1 <= hour <= 6:
+            # "at 3": office hours, so small numbers are afternoon
+            hour += 12
+        if hour < 24 and minute < 60:
+            clock = time(hour, minute)
+            break
+
+    part = None
+    match = _PART.search(lower)
+    if match:
+        part = _PART_WORDS[match.group(1)]
+        if match.group(1) == 'tonight' and day is None:
+            day = today
+    return TimeQuery(day, part, clock, None,
+                     first=_FIRST.search(lower) is not None,
+                     unclear=clock is None and _CLOCK_HINT.search(lower) is not None)
+
+
+class SlotMatch(NamedTuple):
+    slot: Optional[str]
+    exact: bool
+    alternatives: List[str]
+
+
+class SlotIndex:
+    """Available slots sorted by start time and bucketed by day and part of day"""
+
+    def __init__(self, slots: List[str]):
+        parsed = []
+        for slot in slots:
+            try:
+                parsed.append((_parse_slot(slot), slot))
+            except (AttributeError, ValueError):
+                continue
+        parsed.sort()
+        self._times: List[datetime] = [moment for moment, _ in parsed]
+        self._slots: List[str] = [slot for _, slot in parsed]
+
+        # (first, last + 1) positions per day and per (day, part of day)
+        self._days: Dict[date, Tuple[int, int]] = {}
+        self._buckets: Dict[Tuple[date, str], Tuple[int, int]] = {}
+        for position, moment in enumerate(self._times):
+            for table, key in ((self._days, moment.date()), (self._buckets, (moment.date(), _part_of_day(moment)))):
+                first, _ = table.get(key, (position, position))
+                table[key] = (first, position + 1)
+        self._day_list = sorted(self._days)
+
+    def __len__(self) -> int:
+        return len(self._slots)
+
+    def _range(self, day: date, part: Optional[str] = None) -> Tuple[int, int]:
+        return (self._buckets.get((day, part)) if part else self._days.get(day)) or (0, 0)
+
+    def slots_on(self, day: date, part: Optional[str] = None) -> List[str]:
+        """Slots on a day, optionally only in one part of it"""
+        first, end = self._range(day, part)
+        return self._slots[first:end]
+
+    def resolve(self, preferred_time: str, now: Optional[datetime] = None) -> SlotMatch:
+        """The slot a caller asked for, or the closest ones when it is not open"""
+        now = (now or datetime.now(SLOT_TIMEZONE)).astimezone(SLOT_TIMEZONE)
+        query = parse_preferred_time(preferred_time, now)
+        start = bisect_left(self._times, now)
+        if start == len(self._times):
+            return SlotMatch(None, False, [])
+
+        if query.exact is not None:
+            return self._at(query.exact, start)
+        if query.empty and query.first:
+            # "first available", or no time given at all
+            return SlotMatch(self._slots[start], True, [])
+        if query.empty or query.unclear:
+            # Not understood: offer the next open slots rather than book one the caller did not ask for
+            return self._after(query.day, now, start)
+
+        days = [query.day] if query.day else self._day_list[bisect_left(self._day_list, now.date()):]
+        if query.clock is not None:
+            for day in days:
+                match = self._at(datetime.combine(day, query.clock, SLOT_TIMEZONE), start)
+                if match.exact:
+                    return match
+            # Not open: offer the closest times on the day asked about, or the next open day
+            return self._at(datetime.combine(days[0], query.clock, SLOT_TIMEZONE), start)
+
+        for day in days:
+            first, end = self._range(day, query.part)
+            first = max(first, start)
+            if first < end:
+                return SlotMatch(self._slots[first], True, [])
+        # Nothing open that day or part of day: offer the next slots after it
+        return self._after(query.day, now, start)
+
+    def _after(self, day: Optional[date], now: datetime, start: int) -> SlotMatch:
+        """No booking: the next two open slots from the day asked about, or from now"""
+        after = datetime.combine(day, time(0), SLOT_TIMEZONE) if day else now
+        position = max(bisect_left(self._times, after), start)
+        return SlotMatch(None, False, self._slots[position:position + 2] or self._slots[start:start + 2])
+
+    def _at(self, moment: datetime, start: int) -> SlotMatch:
+        """Exact slot at moment, else the two nearest on either side; slots before start have passed"""
+        position = max(bisect_left(self._times, moment), start)
+        if position < len(self._times) and self._times[position] == moment:
+            return SlotMatch(self._slots[position], True, [])
+        nearby = range(max(position - 2, start), min(position + 2, len(self._times)))
+        closest = sorted(nearby, key=lambda i: abs(self._times[i] - moment))[:2]
+        return SlotMatch(None, False, [self._slots[i] for i in sorted(closest)])
@@ -0,0 +1,322 @@
+import re
+from typing import Dict, List, Optional
+
+
+# One tokenizer pass: written addresses, words, digit runs, spoken symbols and clause breaks
+_TOKEN = re.compile(
+    r"(?P<email>[A-Za-z0-9._%+-]+@[A-Za-z0-9-]+(?:\.[A-Za-z0-9-]+)*\.[A-Za-z]{2,})"
+    r"|(?P<word>[A-Za-z]+(?:'[A-Za-z]+)?)"
+    r"|(?P<digits>\d+)"
+    r"|(?P<symbol>[@._+-])(?=\S)"
+    r"|(?P<stop>[.!?,;]+)"
+)
+
+_UNITS = {
+    'zero': 0, 'oh': 0, 'one': 1, 'two': 2, 'three': 3, 'four': 4, 'five': 5,
+    'six': 6, 'seven': 7, 'eight': 8, 'nine': 9,
+}
+_TEENS = {
+    'ten': 10, 'eleven': 11, 'twelve': 12, 'thirteen': 13, 'fourteen': 14, 'fifteen': 15,
+    'sixteen': 16, 'seventeen': 17, 'eighteen': 18, 'nineteen': 19,
+}
+_TENS = {
+    'twenty': 20, 'thirty': 30, 'forty': 40, 'fifty': 50,
+    'sixty': 60, 'seventy': 70, 'eighty': 80, 'ninety': 90,
+}
+_REPEAT = {'double': 2, 'triple': 3}
+
+_NATO = {
+    'alpha': 'a', 'alfa': 'a', 'bravo': 'b', 'charlie': 'c', 'delta': 'd', 'echo': 'e',
+    'foxtrot': 'f', 'golf': 'g', 'hotel': 'h', 'india': 'i', 'juliet': 'j', 'juliett': 'j',
+    'kilo': 'k', 'lima': 'l', 'mike': 'm', 'november': 'n', 'oscar': 'o', 'papa': 'p',
+    'quebec': 'q', 'romeo': 'r', 'sierra': 's', 'tango': 't', 'uniform': 'u', 'victor': 'v',
+    'whiskey': 'w', 'whisky': 'w', 'xray': 'x', 'yankee': 'y', 'zulu': 'z',
+}
+
+_SYMBOL_WORDS = {
+    'dot': '.', 'period': '.', 'point': '.',
+    'underscore': '_', 'dash': '-', 'hyphen': '-', 'minus': '-', 'plus': '+',
+}
+
+# Mail providers people name without a top-level domain ("at gmail")
+_PROVIDERS = {
+    'gmail': 'gmail.com', 'googlemail': 'googlemail.com', 'yahoo': 'yahoo.com',
+    'hotmail': 'hotmail.com', 'outlook': 'outlook.com', 'icloud': 'icloud.com',
+    'aol': 'aol.com', 'protonmail': 'protonmail.com', 'proton': 'proton.me', 'live': 'live.com',
+}
+
+# Conversational words that are never part of an address; they start a new attempt
+_FILLER = frozenset("""
+a an and actually again all also am are as be but by can could do email e-mail emails address
+for from got have hello hey hi how i i'm im is it it's its just let let's letter letters like
+lowercase me mean mine my name no not number numbers of ok okay on or please right say see
+should sorry spell spelled spelling that that's the then there this to uh um so wait was
+we well what where will with would yeah yes you your
+""".split())
+
+# Phrases that introduce a name
+_NAME_INTROS = {('name', 'is'), ('i', 'am'), ('this', 'is'), ('call', 'me'), ("i'm",), ('im',), ('called',)}
+# After an intro anything but chatter is a name, NATO words included ("my name is Mike")
+_NOT_NAMES_AFTER_INTRO = _FILLER | frozenset("""
+at here free available busy looking calling interested trying wondering going good fine great sure
+""".split())
+# Short replies and plain words that are not a name when a transcript holds nothing else
+_NOT_NAMES = _NOT_NAMES_AFTER_INTRO | frozenset(_PROVIDERS) | frozenset(_UNITS) | frozenset(_TEENS) \
+    | frozenset(_TENS) | frozenset(_SYMBOL_WORDS) | frozenset("""
+com net org thanks thank cool correct exactly alright perfect nope bye today tonight tomorrow
+monday tuesday wednesday thursday friday saturday sunday morning afternoon evening
+""".split())
+
+
+def _spelling_follows(next_word: str) -> bool:
+    """Whether the next token continues an address: a letter, a digit or "at" """
+    return (len(next_word) == 1 and next_word.isalpha() or next_word.isdigit() or next_word == 'at'
+            or next_word in _UNITS or next_word in _TEENS or next_word in _TENS)
+
+
+class SpokenEmailParser:
+    """Rebuild an email address and name from STT transcripts in one pass per transcript
+
+    feed() can be called with successive partial or final transcripts; the address
+    being spelled carries over between calls until a complete one is found.
+    """
+
+    def __init__(self):
+        self.email: Optional[str] = None
+        self.name: Optional[str] = None
+        # Pieces of the local part and domain heard so far
+        self._local: List[str] = []
+        self._local_spelled = False
+        self._domain: List[str] = []
+        self._in_domain = False
+        # The clause being parsed and the local part before it, for repeat detection
+        self._clause: List[str] = []
+        self._clause_letters = False
+        self._number: Optional[int] = None
+        self._repeat = 1
+        self._skip_next = False
+        self._prev: Optional[str] = None
+        self._name_next = False
+        # A transcript that was only a name ("Dana.", "Francis here"), used when no intro was heard
+        self._reply_name: Optional[str] = None
+
+    @property
+    def in_progress(self) -> bool:
+        """Part of an address has been heard but it is not complete yet"""
+        return self.email is None and bool(self._local or self._clause or self._number is not None)
+
+    def feed(self, text: str) -> Optional[str]:
+        """Consume one transcript; returns the email once it is complete"""
+        in_progress = self.in_progress
+        words: List[str] = []
+        tokens = list(_TOKEN.finditer(text))
+        for index, match in enumerate(tokens):
+            kind = match.lastgroup
+            value = match.group()
+            words.append(value if kind in ('word', 'stop') else '')
+            if kind == 'email':
+                self._finish_clause()
+                self.email = self.email or value.lower()
+            elif kind == 'word':
+                self._word(value, tokens[index + 1].group().lower() if index + 1 < len(tokens) else '')
+            elif kind == 'digits':
+                self._flush_number()
+                self._clause.append(value)
+            elif kind == 'symbol':
+                self._symbol(value)
+            else:
+                self._finish_clause()
+        # A transcript boundary ends a clause ("think out ninety eight" | "at gmail dot com")
+        self._finish_clause()
+        self._complete()
+        if self.name is None and not in_progress:
+            self._name_only(words)
+        return self.email
+
+    def _name_only(self, words: List[str]):
+        """A first name, or first and last, with nothing else around it but chatter"""
+        if '' in words:
+            return
+        names = [w for w in words if w[0].isalpha() and w.lower() not in _FILLER and w.lower() != 'here']
+        if (1 <= len(names) <= 2 and all(w[0].isupper() and w.isalpha() for w in names)
+                and not any(w.lower() in _NOT_NAMES for w in names)):
+            self._reply_name = names[0].capitalize()
+
+    def end_turn(self):
+        """The caller finished a turn: plain words with nothing spelled, no digits and no
+        "at" were conversation ("book a call"), not the start of an address"""
+        if not self._in_domain and not self._local_spelled and ''.join(self._local).isalpha():
+            self._local = []
+
+    def copy(self) -> 'SpokenEmailParser':
+        """Independent parser in the same state, for trying out a transcript that may still change"""
+        clone = SpokenEmailParser.__new__(SpokenEmailParser)
+        clone.__dict__.update(self.__dict__)
+        clone._local = list(self._local)
+        clone._domain = list(self._domain)
+        clone._clause = list(self._clause)
+        return clone
+
+    def result(self) -> Dict[str, Optional[str]]:
+        return {'email': self.email, 'name': self.name or self._reply_name}
+
+    def _word(self, original: str, next_word: str = ''):
+        word = original.lower()
+        prev, self._prev = self._prev, word
+
+        if self._name_next:
+            self._name_next = False
+            if word not in _NOT_NAMES_AFTER_INTRO and self.name is None:
+                self.name = original.capitalize()
+                return
+        if (prev, word) in _NAME_INTROS or (word,) in _NAME_INTROS:
+            self._name_next = True
+
+        if self._skip_next:
+            # "b as in bravo": the example word is not part of the address
+            self._skip_next = False
+            return
+        if word == 'as' and self._clause:
+            return
+        if word == 'in' and prev == 'as' and self._clause:
+            self._skip_next = True
+            return
+
+        if word == 'double' and next_word in ('u', 'you'):
+            # The letter W, not a repeated U
+            self._flush_number()
+            self._clause.append('w' * self._repeat)
+            self._repeat = 1
+            self._clause_letters = True
+            self._skip_next = True
+            return
+        if word in _REPEAT:
+            self._flush_number()
+            self._repeat = _REPEAT[word]
+            return
+        if len(word) == 1 and (word not in _FILLER or self._clause_letters or _spelling_follows(next_word)):
+            # "a" and "i" are letters once the caller is spelling, or when more spelling follows
+            self._flush_number()
+            self._clause.append(word * self._repeat)
+            self._repeat = 1
+            self._clause_letters = True
+            return
+        if word in _UNITS and not (word == 'oh' and self._number is None and not self._clause):
+            unit = _UNITS[word]
+            if self._number is not None and self._number % 10 == 0 and self._number >= 20:
+                # "ninety eight" -> 98
+                self._number += unit
+                self._flush_number()
+            else:
+                self._flush_number()
+                self._clause.append(str(unit) * self._repeat)
+            self._repeat = 1
+            return
+        if word in _TEENS:
+            self._flush_number()
+            self._clause.append(str(_TEENS[word]))
+            return
+        if word in _TENS:
+            self._flush_number()
+            self._number = _TENS[word]
+            return
+        self._flush_number()
+
+        if word == 'at':
+            self._at()
+            return
+        if word in _SYMBOL_WORDS:
+            self._symbol(_SYMBOL_WORDS[word])
+            return
+        if word in _FILLER and not (self._in_domain and self._clause and self._clause[-1] == '.'):
+            # Chatter between attempts: whatever was collected so far was not the address
+            self._clause = []
+            self._clause_letters = False
+            if self._in_domain:
+                # "I'm at home right now" was never an address
+                self._local, self._domain, self._in_domain = [], [], False
+                self._local_spelled = False
+            elif word in ('email', 'address', 'is', 'spell', 'spelled', 'spelling'):
+                self._local = []
+                self._local_spelled = False
+            return
+        self._repeat = 1
+        if self._in_domain and self._clause and self._clause[-1] not in '.-':
+            # "at gmail dot com tomorrow": a word not joined by a dot may end the domain
+            self._finish_clause()
+            self._complete()
+            if self.email:
+                return
+        # NATO words are decided at the end of the clause, once we know if it is spelled
+        self._clause.append(word)
+
+    def _symbol(self, symbol: str):
+        self._flush_number()
+        if symbol == '@':
+            self._at()
+            return
+        if self._clause or self._local or self._domain:
+            self._clause.append(symbol)
+
+    def _at(self):
+        if self._in_domain and self._clause:
+            # A second "at": what followed the first one was the start of a new address
+            self._local, self._domain, self._in_domain = [], [], False
+            self._local_spelled = False
+        if self._local or self._clause:
+            self._finish_clause()
+            self._in_domain = True
+
+    def _flush_number(self):
+        if self._number is not None:
+            self._clause.append(str(self._number))
+            self._number = None
+
+    def _finish_clause(self):
+        self._flush_number()
+        self._prev = None
+        if not self._clause:
+            return
+        words = [p for p in self._clause if p.isalpha()]
+        spelled = (self._clause_letters or any(len(p) == 1 for p in words)
+                   or (len(words) > 1 and all(p in _NATO for p in words)))
+        text = ''.join(_NATO.get(p, p) if spelled else p for p in self._clause)
+        self._clause = []
+        self._clause_letters = False
+
+        if self._in_domain:
+            self._domain.append(text)
+            return
+        current = ''.join(self._local)
+        if current and current.endswith(text):
+            # "think out ninety eight. Nine eight." - the caller is repeating themselves
+            return
+        if (spelled or text[0].isalpha()) and current and not self._local_spelled and current[-1] not in '._-+':
+            # Spelling after plain words replaces them ("think" then "t h i n k"), and so does
+            # a new clause of plain words ("Jane Doe, jane at gmail dot com")
+            self._local = []
+        self._local.append(text)
+        self._local_spelled = self._local_spelled or spelled
+
+    def _complete(self):
+        if self.email or not self._in_domain or not self._local:
+            return
+        local = ''.join(self._local).strip('.-_')
+        domain = ''.join(self._domain)
+        if domain.endswith('.'):
+            # "at gmail dot" - the rest of the domain is still coming
+            return
+        domain = domain.strip('.-')
+        if domain in _PROVIDERS:
+            domain = _PROVIDERS[domain]
+        elif '.' not in domain:
+            return
+        if local and re.fullmatch(r'[a-z0-9._%+-]+@[a-z0-9-]+(?:\.[a-z0-9-]+)*\.[a-z]{2,}', f'{local}@{domain}'):
+            self.email = f'{local}@{domain}'
+
+
+def parse_contact(text: str) -> Dict[str, Optional[str]]:
+    """Email and name from a single transcript"""
+    parser = SpokenEmailParser()
+    parser.feed(text)
+    return parser.result()
@@ -0,0 +1,332 @@
+import asyncio
+import concurrent.futures
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+from typing import Dict, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Shared by every worker process on the machine through the /data volume
+STATE_DB_PATH = os.getenv(
+    'STATE_DB_PATH',
+    '/data/booking-state.sqlite3' if os.path.isdir('/data')
+    else os.path.join(os.path.dirname(os.path.abspath(__file__)), 'booking-state.sqlite3'),
+)
+
+
+class VersionConflict(Exception):
+    """Another process saved the session since this copy was loaded"""
+
+    def __init__(self, session_id: str, expected: int, actual: int):
+        super().__init__(f"Session {session_id} is at version {actual}, expected {expected}")
+        self.session_id = session_id
+        self.expected = expected
+        self.actual = actual
+
+
+class StateBackend:
+    """Where booking conversation state lives between turns
+
+    Every record carries a version that increases by one on each save. A save
+    names the version it was based on and fails with VersionConflict when the
+    stored record has moved on, so two processes never silently overwrite
+    each other.
+    """
+
+    def load(self, session_id: str) -> Optional[Tuple[Dict, int]]:
+        """Return (data, version) or None when the session is unknown"""
+        raise NotImplementedError
+
+    def save(self, session_id: str, data: Dict, expected_version: int) -> int:
+        """Store data based on expected_version and return the new version"""
+        raise NotImplementedError
+
+    def delete(self, session_id: str):
+        raise NotImplementedError
+
+    # Used from the event loop; backends that block override these to run elsewhere
+    async def aload(self, session_id: str) -> Optional[Tuple[Dict, int]]:
+        return self.load(session_id)
+
+    async def asave(self, session_id: str, data: Dict, expected_version: int) -> int:
+        return self.save(session_id, data, expected_version)
+
+    async def adelete(self, session_id: str):
+        self.delete(session_id)
+
+    def flush(self) -> List[str]:
+        """Write anything buffered; returns session ids whose writes lost a version race"""
+        return []
+
+    async def aflush(self) -> List[str]:
+        return self.flush()
+
+    def close(self):
+        self.flush()
+
+    def stats(self) -> Dict:
+        return {}
+
+
+class MemoryStateBackend(StateBackend):
+    """Process-local backend for tests and single-process setups"""
+
+    def __init__(self):
+        self._records: Dict[str, Tuple[Dict, int]] = {}
+        self.conflicts = 0
+
+    def load(self, session_id: str) -> Optional[Tuple[Dict, int]]:
+        record = self._records.get(session_id)
+        return (dict(record[0]), record[1]) if record is not None else None
+
+    def save(self, session_id: str, data: Dict, expected_version: int) -> int:
+        current = self._records.get(session_id)
+        actual = current[1] if current is not None else 0
+        if actual != expected_version:
+            self.conflicts += 1
+            raise VersionConflict(session_id, expected_version, actual)
+        self._records[session_id] = (dict(data), actual + 1)
+        return actual + 1
+
+    def delete(self, session_id: str):
+        self._records.pop(session_id, None)
+
+    def stats(self) -> Dict:
+        return {'backend': 'memory', 'records': len(self._records), 'conflicts': self.conflicts}
+
+
+class SQLiteStateBackend(StateBackend):
+    """SQLite file backend with write-behind batching and optimistic versioning
+
+    Saves are checked against the committed version straight away, then buffered
+    and written together in one transaction once batch_size saves are pending or
+    flush_interval seconds have passed. Repeated saves of one session inside a
+    batch collapse into a single row write.
+
+    The async methods and timed flushes run on one database thread, so a busy
+    timeout while another process holds the write lock never stalls the event
+    loop. The sync methods are for scripts and tests.
+    """
+
+    def __init__(self, path: Optional[str] = None, batch_size: Optional[int] = None,
+                 flush_interval: Optional[float] = None, max_age: Optional[float] = None):
+        self.path = path or STATE_DB_PATH
+        self.batch_size = batch_size if batch_size is not None else int(os.getenv('STATE_BATCH_SIZE', '32'))
+        self.flush_interval = (flush_interval if flush_interval is not None
+                               else float(os.getenv('STATE_FLUSH_INTERVAL', '0.5')))
+        # Rows untouched for this long are purged; matches the in-memory idle TTL
+        self.max_age = max_age if max_age is not None else float(os.getenv('SESSION_STORE_TTL', '1800'))
+
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._db = sqlite3.connect(self.path, timeout=5, isolation_level=None, check_same_thread=False)
+        self._lock = threading.RLock()
+        self._executor = concurrent.futures.ThreadPoolExecutor(1, thread_name_prefix='state-backend')
+        self._db.execute('PRAGMA journal_mode=WAL')
+        self._db.execute('PRAGMA synchronous=NORMAL')
+        self._db.execute(
+            'CREATE TABLE IF NOT EXISTS booking_state ('
+            'session_id TEXT PRIMARY KEY, data TEXT NOT NULL, '
+            'version INTEGER NOT NULL, updated_at REAL NOT NULL)'
+        )
+        self._db.execute('CREATE INDEX IF NOT EXISTS booking_state_updated ON booking_state (updated_at)')
+
+        # session_id -> (data, base version in the database, new version)
+        self._pending: Dict[str, Tuple[Dict, int, int]] = {}
+        self._flush_handle: Optional[asyncio.TimerHandle] = None
+        self._flush_loop: Optional[asyncio.AbstractEventLoop] = None
+        # Sessions whose last batched write lost a race; their next save must reload first
+        self._lost: set = set()
+
+        self.writes = 0
+        self.flushes = 0
+        self.conflicts = 0
+        # Row count as of the last flush, so stats() never queries from the event loop
+        self.records = self._count()
+
+    def _count(self) -> int:
+        return self._db.execute('SELECT COUNT(*) FROM booking_state').fetchone()[0]
+
+    async def _run(self, fn, *args):
+        return await asyncio.get_running_loop().run_in_executor(self._executor, fn, *args)
+
+    def _committed_version(self, session_id: str) -> int:
+        row = self._db.execute('SELECT version FROM booking_state WHERE session_id = ?',
+                               (session_id,)).fetchone()
+        return row[0] if row else 0
+
+    def load(self, session_id: str) -> Optional[Tuple[Dict, int]]:
+        with self._lock:
+            pending = self._pending.get(session_id)
+            if pending is not None:
+                data, _, version = pending
+                return dict(data), version
+            row = self._db.execute('SELECT data, version FROM booking_state WHERE session_id = ?',
+                                   (session_id,)).fetchone()
+        return (json.loads(row[0]), row[1]) if row else None
+
+    def save(self, session_id: str, data: Dict, expected_version: int) -> int:
+        version = self._check_and_buffer(session_id, data, expected_version)
+        if len(self._pending) >= self.batch_size:
+            self.flush()
+        else:
+            self._schedule_flush()
+        return version
+
+    def delete(self, session_id: str):
+        with self._lock:
+            self._pending.pop(session_id, None)
+            self._lost.discard(session_id)
+            self._db.execute('DELETE FROM booking_state WHERE session_id = ?', (session_id,))
+            self.records = self._count()
+
+    async def aload(self, session_id: str) -> Optional[Tuple[Dict, int]]:
+        return await self._run(self.load, session_id)
+
+    async def asave(self, session_id: str, data: Dict, expected_version: int) -> int:
+        version = await self._run(self._check_and_buffer, session_id, data, expected_version)
+        if len(self._pending) >= self.batch_size:
+            self._cancel_timer()
+            await self._run(self._write_batch)
+        else:
+            self._schedule_flush()
+        return version
+
+    async def adelete(self, session_id: str):
+        await self._run(self.delete, session_id)
+
+    async def aflush(self) -> List[str]:
+        self._cancel_timer()
+        return await self._run(self._write_batch)
+
+    def _check_and_buffer(self, session_id: str, data: Dict, expected_version: int) -> int:
+        with self._lock:
+            pending = self._pending.get(session_id)
+            if pending is not None:
+                base, actual = pending[1], pending[2]
+            else:
+                base = actual = self._committed_version(session_id)
+            if session_id in self._lost:
+                self._lost.discard(session_id)
+                self.conflicts += 1
+                raise VersionConflict(session_id, expected_version, actual)
+            if actual != expected_version:
+                self.conflicts += 1
+                raise VersionConflict(session_id, expected_version, actual)
+
+            self._pending[session_id] = (dict(data), base, actual + 1)
+            self.writes += 1
+            return actual + 1
+
+    def _schedule_flush(self):
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            # No event loop (scripts, tests): write through
+            self.flush()
+            return
+        if self._flush_handle is not None:
+            if self._flush_loop is loop:
+                return
+            # The loop that owned the timer is gone; write its batch now
+            self.flush()
+            return
+        self._flush_loop = loop
+        self._flush_handle = loop.call_later(self.flush_interval, self._flush_in_background, loop)
+
+    def _flush_in_background(self, loop: asyncio.AbstractEventLoop):
+        self._flush_handle = None
+        future = loop.run_in_executor(self._executor, self._write_batch)
+        future.add_done_callback(self._log_flush_error)
+
+    @staticmethod
+    def _log_flush_error(future: asyncio.Future):
+        if not future.cancelled() and future.exception() is not None:
+            logger.error("Booking state flush failed: %s", future.exception())
+
+    def flush(self) -> List[str]:
+        self._cancel_timer()
+        return self._write_batch()
+
+    def _cancel_timer(self):
+        # Loop thread only; flushes on the database thread clear the timer before they are queued
+        if self._flush_handle is not None:
+            self._flush_handle.cancel()
+            self._flush_handle = None
+
+    def _write_batch(self) -> List[str]:
+        with self._lock:
+            return self._write_pending()
+
+    def _write_pending(self) -> List[str]:
+        if not self._pending:
+            return []
+
+        pending, self._pending = self._pending, {}
+        now = time.time()
+        lost = []
+        self._db.execute('BEGIN IMMEDIATE')
+        try:
+            for session_id, (data, base, version) in pending.items():
+                payload = json.dumps(data, separators=(',', ':'))
+                if base == 0:
+                    cursor = self._db.execute(
+                        'INSERT OR IGNORE INTO booking_state (session_id, data, version, updated_at) '
+                        'VALUES (?, ?, ?, ?)', (session_id, payload, version, now))
+                else:
+                    cursor = self._db.execute(
+                        'UPDATE booking_state SET data = ?, version = ?, updated_at = ? '
+                        'WHERE session_id = ? AND version = ?', (payload, version, now, session_id, base))
+                if cursor.rowcount == 0:
+                    # Another process committed first; its copy wins
+                    lost.append(session_id)
+            self._db.execute('DELETE FROM booking_state WHERE updated_at < ?', (now - self.max_age,))
+            self._db.execute('COMMIT')
+        except Exception:
+            self._db.execute('ROLLBACK')
+            # Keep the batch for the next flush rather than lose it
+            for session_id, entry in pending.items():
+                self._pending.setdefault(session_id, entry)
+            raise
+        self.records = self._count()
+        self.flushes += 1
+        self.conflicts += len(lost)
+        self._lost.update(lost)
+        return lost
+
+    def close(self):
+        self._executor.shutdown()
+        self.flush()
+        self._db.close()
+
+    def stats(self) -> Dict:
+        return {
+            'backend': 'sqlite',
+            'records': self.records,
+            'pending': len(self._pending),
+            'writes': self.writes,
+            'flushes': self.flushes,
+            'conflicts': self.conflicts,
+        }
+
+
+def create_state_backend(kind: Optional[str] = None) -> Optional[StateBackend]:
+    """Backend named by SESSION_STATE_BACKEND (sqlite, memory or none)
+
+    Defaults to SQLite when the /data volume exists. Without one, state stays in
+    the SessionStore itself, which already bounds it.
+    """
+    kind = (kind or os.getenv('SESSION_STATE_BACKEND')
+            or ('sqlite' if os.path.isdir('/data') else 'none')).lower()
+    if kind == 'sqlite':
+        return SQLiteStateBackend()
+    if kind == 'memory':
+        return MemoryStateBackend()
+    if kind == 'none':
+        return None
+    raise ValueError(f"Unknown SESSION_STATE_BACKEND: {kind}")
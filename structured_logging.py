@@ -0,0 +1,207 @@
+import atexit
+import contextvars
+import copy
+import json
+import logging
+import logging.handlers
+import multiprocessing.util
+import os
+import queue
+import random
+import sys
+import threading
+import time
+from datetime import datetime, timezone
+from typing import Dict, Optional
+
+
+LOG_LEVEL = os.getenv('LOG_LEVEL', 'INFO').upper()
+# Per-module overrides, e.g. "cal_integration=DEBUG,livekit=WARNING"
+LOG_LEVELS = os.getenv('LOG_LEVELS', '')
+LOG_QUEUE_SIZE = int(os.getenv('LOG_QUEUE_SIZE', '10000'))
+# DEBUG records let through per second from each call site (0 = unlimited), after sampling
+LOG_DEBUG_RATE = float(os.getenv('LOG_DEBUG_RATE', '5'))
+LOG_DEBUG_SAMPLE = float(os.getenv('LOG_DEBUG_SAMPLE', '1.0'))
+
+_room: contextvars.ContextVar = contextvars.ContextVar('log_room', default=None)
+_job: contextvars.ContextVar = contextvars.ContextVar('log_job', default=None)
+
+# Attributes every LogRecord has; anything else was passed through extra= and is logged as a field
+_RECORD_ATTRS = set(vars(logging.LogRecord('', 0, '', 0, '', (), None))) | {'message', 'asctime'}
+
+
+def set_log_context(room: Optional[str] = None, job: Optional[str] = None):
+    """Tag records logged from the current task, and tasks it starts, with room and job ids"""
+    if room is not None:
+        _room.set(room)
+    if job is not None:
+        _job.set(job)
+
+
+def parse_levels(spec: str) -> Dict[str, str]:
+    """'a=DEBUG,b.c=warning' -> {'a': 'DEBUG', 'b.c': 'WARNING'}"""
+    levels = {}
+    for item in spec.split(','):
+        name, _, level = item.partition('=')
+        if name.strip() and level.strip():
+            levels[name.strip()] = level.strip().upper()
+    return levels
+
+
+class JsonFormatter(logging.Formatter):
+    """One JSON object per line: ts, level, logger, msg, then room/job and any extra fields"""
+
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            'ts': datetime.fromtimestamp(record.created, timezone.utc).isoformat(timespec='milliseconds'),
+            'level': record.levelname,
+            'logger': record.name,
+            'msg': record.getMessage(),
+        }
+        for key, value in record.__dict__.items():
+            if key not in _RECORD_ATTRS and value is not None:
+                entry[key] = value
+        if record.exc_info:
+            entry['exc'] = self.formatException(record.exc_info)
+        elif record.exc_text:
+            entry['exc'] = record.exc_text
+        return json.dumps(entry, default=str, ensure_ascii=False)
+
+
+class ContextFilter(logging.Filter):
+    """Copy the room/job correlation ids onto the record in the logging task"""
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        room, job = _room.get(), _job.get()
+        if room is not None and not hasattr(record, 'room'):
+            record.room = room
+        if job is not None and not hasattr(record, 'job'):
+            record.job = job
+        return True
+
+
+class DebugRateLimit(logging.Filter):
+    """Sample DEBUG records, then let at most `rate` per second through from each call site
+
+    The next record let through from a throttled site carries the number suppressed.
+    Records above DEBUG are never limited.
+    """
+
+    def __init__(self, rate: Optional[float] = None, sample: Optional[float] = None):
+        super().__init__()
+        self.rate = rate if rate is not None else LOG_DEBUG_RATE
+        self.sample = sample if sample is not None else LOG_DEBUG_SAMPLE
+        # (pathname, lineno) -> [tokens, last refill, suppressed]
+        self._sites: Dict[tuple, list] = {}
+        self._lock = threading.Lock()
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        if record.levelno > logging.DEBUG:
+            return True
+        if self.sample < 1 and random.random() >= self.sample:
+            return False
+        if self.rate <= 0:
+            return True
+        now = time.monotonic()
+        with self._lock:
+            site = self._sites.setdefault((record.pathname, record.lineno), [self.rate, now, 0])
+            tokens = min(max(self.rate, 1), site[0] + (now - site[1]) * self.rate)
+            site[1] = now
+            if tokens < 1:
+                site[0] = tokens
+                site[2] += 1
+                return False
+            site[0] = tokens - 1
+            if site[2]:
+                record.suppressed = site[2]
+                site[2] = 0
+        return True
+
+
+class NonBlockingQueueHandler(logging.handlers.QueueHandler):
+    """QueueHandler that drops records rather than wait when the queue is full
+
+    The next record that fits carries the number dropped.
+    """
+
+    def __init__(self, log_queue: queue.Queue):
+        super().__init__(log_queue)
+        self.dropped = 0
+        self._unreported = 0
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        # Render the message now, while the args are still what the caller passed
+        record = copy.copy(record)
+        record.msg = record.getMessage()
+        record.args = None
+        if record.exc_info:
+            record.exc_text = logging.Formatter().formatException(record.exc_info)
+            record.exc_info = None
+        return record
+
+    def enqueue(self, record: logging.LogRecord):
+        if self._unreported:
+            record.dropped_records = self._unreported
+        try:
+            self.queue.put_nowait(record)
+            self._unreported = 0
+        except queue.Full:
+            self.dropped += 1
+            self._unreported += 1
+
+
+_listener: Optional[logging.handlers.QueueListener] = None
+_queue_handler: Optional[NonBlockingQueueHandler] = None
+_listener_pid: Optional[int] = None
+
+
+def setup_logging(level: Optional[str] = None):
+    """Route this process's logging through a queue drained by a background thread
+
+    Logging calls only enqueue, so they never block the event loop on stdout.
+    Handlers already on the root logger (e.g. the LiveKit CLI's) are moved behind
+    the queue; otherwise records are written to stdout as JSON lines. Safe to call
+    more than once, and again in a forked child, which needs its own thread.
+    """
+    global _listener, _queue_handler, _listener_pid
+    if _listener is not None and _listener_pid == os.getpid():
+        return
+
+    root = logging.getLogger()
+    if _listener is not None:
+        # Forked child: the parent's listener thread did not come along, and
+        # multiprocessing children exit without running atexit hooks
+        handlers = _listener.handlers
+        root.removeHandler(_queue_handler)
+        multiprocessing.util.Finalize(None, _flush_on_exit, exitpriority=0)
+    else:
+        handlers = tuple(root.handlers)
+        for handler in handlers:
+            root.removeHandler(handler)
+        if not handlers:
+            stream = logging.StreamHandler(sys.stdout)
+            stream.setFormatter(JsonFormatter())
+            handlers = (stream,)
+            root.setLevel(level or LOG_LEVEL)
+    if level:
+        root.setLevel(level)
+    for name, module_level in parse_levels(LOG_LEVELS).items():
+        logging.getLogger(name).setLevel(module_level)
+
+    log_queue = queue.Queue(LOG_QUEUE_SIZE)
+    _queue_handler = NonBlockingQueueHandler(log_queue)
+    _queue_handler.addFilter(ContextFilter())
+    _queue_handler.addFilter(DebugRateLimit())
+    root.addHandler(_queue_handler)
+
+    if _listener is None:
+        # Flush what is queued on a normal exit
+        atexit.register(_flush_on_exit)
+    _listener = logging.handlers.QueueListener(log_queue, *handlers, respect_handler_level=True)
+    _listener.start()
+    _listener_pid = os.getpid()
+
+
+def _flush_on_exit():
+    if _listener is not None and _listener._thread is not None:
+        _listener.stop()
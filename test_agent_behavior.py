@@ -147,6 +147,28 @@ def test_agent_function_tools():
         print(f"❌ Function tools test failed: {e}")
         return False
 
+def test_prewarm_shares_vad():
+    """Test that prewarm loads one VAD model for the whole process"""
+    print("\n🔍 Testing VAD Prewarm...")
+    
+    try:
+        import agent
+        from types import SimpleNamespace
+        
+        proc = SimpleNamespace(userdata={})
+        agent.prewarm(proc)
+        
+        if proc.userdata.get("vad") is not None:
+            print("✅ Silero VAD preloaded into process userdata")
+            return True
+        else:
+            print("❌ Prewarm did not store a VAD model")
+            return False
+        
+    except Exception as e:
+        print(f"❌ VAD prewarm test failed: {e}")
+        return False
+
 async def test_async_booking_functions():
     """Test async booking functions"""
     print("\n🔍 Testing Async Booking Functions...")
@@ -179,6 +201,7 @@ def main():
         ("Webhook Endpoint", test_webhook_endpoint),
         ("Local Agent Startup", test_local_agent_startup),
         ("Agent Function Tools", test_agent_function_tools),
+        ("VAD Prewarm", test_prewarm_shares_vad),
     ]
     
     async_tests = [
@@ -0,0 +1,88 @@
+#!/usr/bin/env python3
+"""
+Test script to verify the agent supervisor restarts, drains and sizes its workers
+"""
+
+import io
+import sys
+import time
+
+from agent_supervisor import AgentSupervisor, size_workers
+
+CRASHING = "import os; print('worker on port', os.environ['AGENT_HTTP_PORT'], flush=True); raise SystemExit(3)"
+DRAINING = """
+import signal, sys, time
+def drain(*_):
+    print('draining', flush=True)
+    time.sleep(0.2)
+    sys.exit(0)
+signal.signal(signal.SIGTERM, drain)
+print('ready', flush=True)
+while True:
+    time.sleep(0.05)
+"""
+STUBBORN = """
+import signal, time
+signal.signal(signal.SIGTERM, signal.SIG_IGN)
+print('ready', flush=True)
+while True:
+    time.sleep(0.05)
+"""
+
+
+def _wait_for(condition, timeout=5.0):
+    deadline = time.monotonic() + timeout
+    while not condition():
+        assert time.monotonic() < deadline, "timed out"
+        time.sleep(0.02)
+
+
+def test_sizing():
+    """One worker per core, capped by memory, never zero"""
+    print("🔍 Testing worker sizing...")
+    assert size_workers(2, 3700, 1536) == 2  # 2-CPU / 4 GB Fly machine
+    assert size_workers(8, 3700, 1536) == 2
+    assert size_workers(1, 3700, 1536) == 1
+    assert size_workers(4, 500, 1536) == 1
+    print("✅ Sized to cores and memory")
+
+
+def test_crashed_workers_restart_with_backoff():
+    """Each worker gets its own port and is restarted after it exits, with growing delays"""
+    print("\n🔍 Testing restart with backoff...")
+    output = io.StringIO()
+    supervisor = AgentSupervisor([sys.executable, '-c', CRASHING], workers=2, backoff=0.05,
+                                 max_backoff=0.2, drain_timeout=1, output=output)
+    supervisor.start()
+    try:
+        _wait_for(lambda: min(supervisor.restarts.get(0, 0), supervisor.restarts.get(1, 0)) >= 3)
+    finally:
+        supervisor.shutdown()
+    lines = output.getvalue().splitlines()
+    assert 'worker on port 8081' in lines and 'worker on port 8082' in lines
+    assert set(supervisor.exit_codes[0]) == {3}
+    assert not supervisor._thread.is_alive()
+    print(f"✅ Restarted: {supervisor.stats()}")
+
+
+def test_shutdown_drains_then_kills():
+    """SIGTERM lets a worker finish; one that ignores it is killed after the drain timeout"""
+    print("\n🔍 Testing graceful drain...")
+    for script, expected_code, drained in [(DRAINING, 0, True), (STUBBORN, -9, False)]:
+        output = io.StringIO()
+        supervisor = AgentSupervisor([sys.executable, '-c', script], workers=1, drain_timeout=0.5, output=output)
+        supervisor.start()
+        _wait_for(lambda: 'ready' in output.getvalue())
+        started = time.monotonic()
+        supervisor.shutdown()
+        elapsed = time.monotonic() - started
+        assert supervisor.exit_codes[0] == [expected_code]
+        assert ('draining' in output.getvalue()) == drained
+        assert supervisor.restarts[0] == 0 and elapsed < 3
+    print("✅ Drained on SIGTERM, stragglers killed")
+
+
+if __name__ == "__main__":
+    test_sizing()
+    test_crashed_workers_restart_with_backoff()
+    test_shutdown_drains_then_kills()
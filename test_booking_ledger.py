@@ -0,0 +1,97 @@
+#!/usr/bin/env python3
+"""
+Test script to verify duplicate booking calls never POST to Cal.com twice
+"""
+
+import asyncio
+
+from booking_ledger import BookingLedger
+from cal_integration import CalComBooking
+
+SLOT = '2025-07-08T14:00:00.000Z'
+
+
+class CountingPost:
+    """Stands in for CalComBooking._post_booking, failing the first `failures` calls"""
+
+    def __init__(self, failures=0, retryable=True, delay=0.01):
+        self.calls = 0
+        self.failures = failures
+        self.retryable = retryable
+        self.delay = delay
+
+    async def __call__(self, *args):
+        self.calls += 1
+        await asyncio.sleep(self.delay)
+        if self.calls <= self.failures:
+            return {'success': False, 'error': 'API returned status 503', 'retryable': self.retryable}
+        return {'success': True, 'booking_id': 42}
+
+
+def test_concurrent_duplicates_share_one_post():
+    """Two tool calls for the same email and slot share one request"""
+    print("🔍 Testing concurrent duplicate bookings...")
+
+    async def scenario():
+        booking = CalComBooking()
+        booking.booking_ledger = BookingLedger(replay_window=60)
+        booking._post_booking = post = CountingPost()
+        results = await asyncio.gather(
+            booking.create_booking('Francis', 'francis@gmail.com', SLOT),
+            booking.create_booking('Francis', 'Francis@Gmail.com ', '2025-07-08T14:00:00+00:00'),
+        )
+        return booking.booking_ledger, post, results
+
+    ledger, post, results = asyncio.run(scenario())
+    assert post.calls == 1
+    assert all(r['success'] and r['booking_id'] == 42 for r in results)
+    assert ledger.stats()['deduplicated'] == 1
+    print(f"✅ One POST for two calls, stats {ledger.stats()}")
+
+
+def test_replay_within_window():
+    """A retry after the booking completed replays the result"""
+    print("\n🔍 Testing replay window...")
+
+    async def scenario():
+        ledger = BookingLedger(replay_window=60)
+        post = CountingPost()
+        first = await ledger.submit(('a@b.com', SLOT, '1'), post)
+        first['mutated'] = True
+        second = await ledger.submit(('a@b.com', SLOT, '1'), post)
+        other = await ledger.submit(('a@b.com', '2025-07-08T15:00:00.000Z', '1'), post)
+        return ledger, post, second, other
+
+    ledger, post, second, other = asyncio.run(scenario())
+    assert post.calls == 2
+    assert second['replayed'] and 'mutated' not in second
+    assert other['success'] and ledger.replayed == 1
+    print("✅ Replayed without a second POST")
+
+
+def test_transient_errors_are_retried():
+    """5xx and timeouts back off and retry; other failures do not"""
+    print("\n🔍 Testing backoff retries...")
+
+    async def scenario():
+        ledger = BookingLedger(replay_window=60, max_retries=2, backoff=0.001)
+        flaky = CountingPost(failures=2)
+        recovered = await ledger.submit(('a@b.com', SLOT, '1'), flaky)
+        rejected = CountingPost(failures=5, retryable=False)
+        failed = await ledger.submit(('c@d.com', SLOT, '1'), rejected)
+        down = CountingPost(failures=5)
+        exhausted = await ledger.submit(('e@f.com', SLOT, '1'), down)
+        return ledger, flaky, recovered, rejected, failed, down, exhausted
+
+    ledger, flaky, recovered, rejected, failed, down, exhausted = asyncio.run(scenario())
+    assert recovered['success'] and flaky.calls == 3
+    assert not failed['success'] and rejected.calls == 1
+    assert not exhausted['success'] and down.calls == 3
+    assert ledger.retries == 4 and ledger.failures == 2
+    print("✅ Retries bounded")
+
+
+if __name__ == "__main__":
+    test_concurrent_duplicates_share_one_post()
+    test_replay_within_window()
+    test_transient_errors_are_retried()
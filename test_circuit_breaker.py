@@ -0,0 +1,171 @@
+#!/usr/bin/env python3
+"""
+Test script to verify Cal.com calls stay within the voice-turn budget when the API degrades
+"""
+
+import asyncio
+import time
+
+from aiohttp import web
+
+from booking_ledger import BookingLedger
+from cal_integration import CALENDAR_UNAVAILABLE, CalComBooking
+from circuit_breaker import CircuitBreaker
+from http_pool import SharedHTTPPool
+from slot_cache import SlotCache
+
+
+def test_breaker_transitions():
+    """Opens after consecutive failures, probes once when half-open, closes on success"""
+    print("🔍 Testing circuit breaker transitions...")
+
+    breaker = CircuitBreaker('test', failure_threshold=2, reset_timeout=0.05)
+    breaker.record_failure()
+    assert breaker.allow() and breaker.state == 'closed'
+    breaker.record_failure()
+    assert breaker.state == 'open' and not breaker.allow()
+
+    time.sleep(0.06)
+    assert breaker.allow() and breaker.state == 'half_open'
+    assert not breaker.allow(), "only one probe at a time"
+    breaker.record_failure()
+    assert breaker.state == 'open'
+
+    time.sleep(0.06)
+    assert breaker.allow()
+    breaker.record_success()
+    assert breaker.state == 'closed'
+    stats = breaker.stats()
+    assert (stats['opened'], stats['half_opened'], stats['closed'], stats['rejected']) == (2, 2, 1, 2)
+    print(f"✅ Transitions recorded: {stats}")
+
+
+async def _slow_calcom(delay):
+    async def slots(request):
+        await asyncio.sleep(delay)
+        return web.json_response({'slots': {'2025-07-08': [{'time': '2025-07-08T14:00:00.000Z'}]}})
+
+    async def bookings(request):
+        await asyncio.sleep(delay)
+        return web.json_response({'id': 1}, status=201)
+
+    app = web.Application()
+    app.router.add_get('/slots', slots)
+    app.router.add_post('/bookings', bookings)
+    runner = web.AppRunner(app)
+    await runner.setup()
+    site = web.TCPSite(runner, '127.0.0.1', 0)
+    await site.start()
+    return runner, site._server.sockets[0].getsockname()[1]
+
+
+def _booking(port, breaker):
+    booking = CalComBooking()
+    booking.base_url = f'http://127.0.0.1:{port}'
+    booking.api_key = 'test'
+    booking.event_type_id = '1'
+    booking.http_pool = SharedHTTPPool()
+    booking.slot_cache = SlotCache(ttl=30, stale_ttl=0)
+    booking.booking_ledger = BookingLedger(max_retries=3, backoff=0.01)
+    booking.breaker = breaker
+    booking.slots_deadline = 0.1
+    booking.booking_deadline = 0.3
+    return booking
+
+
+def test_slow_calcom_bounded_and_breaker_opens():
+    """A hanging API costs one deadline per call, then the breaker answers at once"""
+    print("\n🔍 Testing deadlines and fail-fast...")
+
+    async def scenario():
+        runner, port = await _slow_calcom(delay=1)
+        booking = _booking(port, CircuitBreaker('cal.com', failure_threshold=2, reset_timeout=60))
+        booking.http_pool.acquire()
+        try:
+            timings = []
+            for _ in range(3):
+                started = time.perf_counter()
+                message = await booking.get_formatted_available_times()
+                timings.append(time.perf_counter() - started)
+            started = time.perf_counter()
+            result = await booking.create_booking('Francis', 'francis@gmail.com', '2025-07-08T14:00:00.000Z')
+            timings.append(time.perf_counter() - started)
+            return booking.breaker, timings, message, result
+        finally:
+            await booking.http_pool.release()
+            await runner.cleanup()
+
+    breaker, timings, message, result = asyncio.run(scenario())
+    assert timings[0] < 0.5 and timings[1] < 0.5, timings
+    assert timings[2] < 0.05 and timings[3] < 0.05, "open breaker should answer immediately"
+    assert breaker.state == 'open' and breaker.rejected >= 2
+    assert message == CALENDAR_UNAVAILABLE
+    assert not result['success'] and result['message'] == CALENDAR_UNAVAILABLE
+    print(f"✅ Calls took {[f'{t * 1000:.0f} ms' for t in timings]}, breaker {breaker.stats()}")
+
+
+def test_booking_retries_stop_at_deadline():
+    """Retries never run past the booking deadline"""
+    print("\n🔍 Testing deadline-bounded booking retries...")
+
+    async def scenario():
+        runner, port = await _slow_calcom(delay=1)
+        booking = _booking(port, CircuitBreaker('cal.com', failure_threshold=10, reset_timeout=60))
+        booking.http_pool.acquire()
+        try:
+            started = time.perf_counter()
+            result = await booking.create_booking('Francis', 'francis@gmail.com', '2025-07-08T14:00:00.000Z')
+            return result, time.perf_counter() - started
+        finally:
+            await booking.http_pool.release()
+            await runner.cleanup()
+
+    result, elapsed = asyncio.run(scenario())
+    assert not result['success'] and elapsed < 0.5, elapsed
+    print(f"✅ Gave up after {elapsed * 1000:.0f} ms")
+
+
+def test_single_timeout_is_not_an_empty_calendar():
+    """A timed-out fetch with the breaker still closed is reported as unreachable, not fully booked"""
+    print("\n🔍 Testing availability after one timeout...")
+
+    async def scenario():
+        runner, port = await _slow_calcom(delay=1)
+        booking = _booking(port, CircuitBreaker('cal.com', failure_threshold=10, reset_timeout=60))
+        booking.http_pool.acquire()
+        try:
+            return await booking.get_formatted_available_times(), booking.breaker.state
+        finally:
+            await booking.http_pool.release()
+            await runner.cleanup()
+
+    message, state = asyncio.run(scenario())
+    assert state == 'closed'
+    assert message == CALENDAR_UNAVAILABLE, message
+    print("✅ Timeout reported as calendar unavailable")
+
+
+def test_half_open_probe_released_on_local_error():
+    """A booking that fails before its request goes out still ends the half-open probe"""
+    print("\n🔍 Testing half-open probe on a local error...")
+
+    async def scenario():
+        breaker = CircuitBreaker('cal.com', failure_threshold=1, reset_timeout=0)
+        breaker.record_failure()
+        booking = _booking(1, breaker)
+        booking.event_type_id = 'not-a-number'
+        result = await booking.create_booking('Francis', 'francis@gmail.com', '2025-07-08T14:00:00.000Z')
+        return result, breaker
+
+    result, breaker = asyncio.run(scenario())
+    assert not result['success']
+    assert breaker.allow(), "breaker must not stay stuck in half-open"
+    print(f"✅ Probe released, breaker {breaker.stats()}")
+
+
+if __name__ == "__main__":
+    test_breaker_transitions()
+    test_slow_calcom_bounded_and_breaker_opens()
+    test_booking_retries_stop_at_deadline()
+    test_single_timeout_is_not_an_empty_calendar()
+    test_half_open_probe_released_on_local_error()
@@ -0,0 +1,115 @@
+#!/usr/bin/env python3
+"""
+Test script to verify booking details are parsed from transcripts while the caller speaks
+"""
+
+import asyncio
+
+from contact_extractor import ContactExtractor
+
+
+class _Handler:
+    """Stands in for MeetingBookingHandler.book_meeting without calling Cal.com"""
+
+    def __init__(self):
+        self.calls = []
+
+    async def book_meeting(self, name, email, preferred_time=""):
+        self.calls.append((name, email, preferred_time))
+        await asyncio.sleep(0)
+        return {'success': True, 'booking_id': len(self.calls)}
+
+
+def test_interim_transcripts():
+    """Details are ready on an interim transcript, before the turn is final"""
+    print("🔍 Testing interim transcript extraction...")
+
+    extractor = ContactExtractor(_Handler(), speculative=False)
+    extractor.on_transcript("my name is", False)
+    extractor.on_transcript("my name is Francis", True)
+    draft = extractor.on_transcript("and my email is think out ninety eight at gmail dot", False)
+    assert draft.name == 'Francis' and draft.email is None and not draft.ready
+    draft = extractor.on_transcript("and my email is think out ninety eight at gmail dot com", False)
+    assert draft.ready and draft.email == 'thinkout98@gmail.com'
+
+    # The final transcript revises the interim one
+    draft = extractor.on_transcript("and my email is think out ninety eight at gmail dot com tomorrow at 10 AM", True)
+    assert draft == ('Francis', 'thinkout98@gmail.com', 'tomorrow at 10am')
+    assert extractor.stats()['ready_on_interim'] == 1
+    print("✅ Name, email and time ready before the final transcript")
+
+
+def test_interim_does_not_commit():
+    """A retracted interim transcript leaves no trace"""
+    print("\n🔍 Testing interim revisions...")
+
+    extractor = ContactExtractor(_Handler(), speculative=False)
+    extractor.on_transcript("bob at gmail", False)
+    draft = extractor.on_transcript("my name is Jane", True)
+    assert draft.email is None and draft.name == 'Jane'
+    assert extractor.validated_email("jane at gmail") == "jane at gmail"
+    extractor.on_transcript("jane at outlook dot com", True)
+    assert extractor.validated_email("jane at outlook") == 'jane@outlook.com'
+    assert extractor.validated_email("j.doe@outlook.com") == 'j.doe@outlook.com'
+    print("✅ Only final transcripts committed")
+
+
+def test_speculative_booking():
+    """With speculation on, the booking starts at the end of the turn and the tool reuses it"""
+    print("\n🔍 Testing speculative booking...")
+
+    async def scenario():
+        handler = _Handler()
+        extractor = ContactExtractor(handler, speculative=True)
+        extractor.on_transcript("I'd like to book a call", True)
+        extractor.on_transcript("I'm Francis, francis at gmail dot com", True)
+        task = extractor.take_booking('francis', 'Francis@Gmail.com')
+        other = extractor.take_booking('Francis', 'someone@else.com')
+        return handler, await task, other
+
+    handler, result, other = asyncio.run(scenario())
+    assert handler.calls == [('Francis', 'francis@gmail.com', '')]
+    assert result['success'] and other is None
+    print("✅ One booking issued before the tool call")
+
+
+def test_no_speculation_without_intent():
+    """Contact details alone do not book when nobody asked for a meeting"""
+    print("\n🔍 Testing speculation guard...")
+
+    async def scenario():
+        handler = _Handler()
+        extractor = ContactExtractor(handler, speculative=True)
+        extractor.on_transcript("I'm Francis, francis at gmail dot com", True)
+        await asyncio.sleep(0)
+        return handler
+
+    assert asyncio.run(scenario()).calls == []
+    print("✅ No booking without a booking request")
+
+
+def test_no_speculation_on_guessed_name():
+    """A name the caller did not introduce is not booked under"""
+    print("\n🔍 Testing speculation on guessed names...")
+
+    async def scenario():
+        handler = _Handler()
+        extractor = ContactExtractor(handler, speculative=True)
+        extractor.on_transcript("I'd like to book a call", True)
+        extractor.on_transcript("Dana.", True)
+        draft = extractor.on_transcript("dana at gmail dot com", True)
+        await asyncio.sleep(0)
+        return handler, draft
+
+    handler, draft = asyncio.run(scenario())
+    assert draft.ready and draft.name == 'Dana'
+    assert handler.calls == []
+    print("✅ No booking without a name intro")
+
+
+if __name__ == "__main__":
+    test_interim_transcripts()
+    test_interim_does_not_commit()
+    test_speculative_booking()
+    test_no_speculation_without_intent()
+    test_no_speculation_on_guessed_name()
@@ -0,0 +1,86 @@
+#!/usr/bin/env python3
+"""
+Test script to verify the shared HTTP pool reuses keep-alive connections
+"""
+
+import asyncio
+from aiohttp import web
+
+from http_pool import SharedHTTPPool
+
+
+async def _run_requests(pool, count):
+    app = web.Application()
+    app.router.add_get('/', lambda request: web.Response(text='ok'))
+    runner = web.AppRunner(app)
+    await runner.setup()
+    site = web.TCPSite(runner, '127.0.0.1', 0)
+    await site.start()
+    port = site._server.sockets[0].getsockname()[1]
+
+    try:
+        pool.acquire()
+        for _ in range(count):
+            session = await pool.get_session()
+            async with session.get(f'http://127.0.0.1:{port}/') as response:
+                await response.text()
+        stats = pool.stats()
+        await pool.release()
+        return stats
+    finally:
+        await runner.cleanup()
+
+
+def test_connection_reuse():
+    """Sequential requests should share one pooled connection"""
+    print("🔍 Testing HTTP pool connection reuse...")
+
+    pool = SharedHTTPPool(limit=10, limit_per_host=2)
+    stats = asyncio.run(_run_requests(pool, 5))
+    print(f"Pool stats: {stats}")
+
+    assert stats['requests'] == 5
+    assert stats['connections_created'] == 1
+    assert stats['connections_reused'] == 4
+    assert not pool.stats()['open'], "pool should close after the last release"
+    print("✅ Connections reused and pool closed on release")
+
+
+def test_release_waits_for_last_user():
+    """Pool stays open while another job still holds it"""
+    print("\n🔍 Testing HTTP pool reference counting...")
+
+    async def scenario():
+        pool = SharedHTTPPool()
+        pool.acquire()
+        pool.acquire()
+        await pool.get_session()
+        await pool.release()
+        still_open = pool.stats()['open']
+        await pool.release()
+        return still_open, pool.stats()['open']
+
+    still_open, open_after = asyncio.run(scenario())
+    assert still_open and not open_after
+    print("✅ Pool closed only after the last job released it")
+
+
+def test_session_from_old_loop_closed():
+    """A session left open on a finished event loop is closed when a new loop takes over"""
+    print("\n🔍 Testing HTTP pool across event loops...")
+
+    async def open_session(pool):
+        return await pool.get_session()
+
+    pool = SharedHTTPPool()
+    old = asyncio.run(open_session(pool))
+    new = asyncio.run(open_session(pool))
+    assert old.closed and new is not old
+    asyncio.run(new.close())
+    print("✅ Old loop's session closed before it was replaced")
+
+
+if __name__ == "__main__":
+    test_connection_reuse()
+    test_release_waits_for_last_user()
+    test_session_from_old_loop_closed()
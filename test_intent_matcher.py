@@ -0,0 +1,63 @@
+#!/usr/bin/env python3
+"""
+Test script to verify booking intents are matched on whole words in one pass
+"""
+
+from cal_integration import MeetingBookingHandler
+from intent_matcher import IntentMatcher, intent_matcher
+
+
+def test_whole_word_matches():
+    """Keywords inside longer words no longer count"""
+    print("🔍 Testing intent false positives...")
+
+    assert intent_matcher.intents("I recall you built something with React") == set()
+    assert intent_matcher.intents("Sometimes I wonder how long that took") == set()
+    assert intent_matcher.intents("I am not sure yet") == set()
+    assert intent_matcher.intents("Add it to your bookmarks") == set()
+    print("✅ recall, sometimes, I am and bookmarks ignored")
+
+
+def test_inflections_and_phrases():
+    """Inflected keywords, phrases and clock times are recognised"""
+    print("\n🔍 Testing intent inflections...")
+
+    assert intent_matcher.intents("I'd like to get a call scheduled") == {'booking', 'confirm'}
+    assert 'booking' in intent_matcher.intents("Could we  work together on this?")
+    assert 'booking' in intent_matcher.intents("I'm interested in collaborating")
+    assert intent_matcher.intents("What times are available?") == {'availability'}
+    assert intent_matcher.intents("3:30 p.m. works for me") == {'confirm'}
+    assert intent_matcher.intents("How about 10am") == {'confirm'}
+    print("✅ Inflections, phrases and times matched")
+
+
+def test_spans_in_one_pass():
+    """Every intent and span is returned, shared keywords once per intent"""
+    print("\n🔍 Testing intent spans...")
+
+    text = "Yes, BOOK the call"
+    matches = intent_matcher.matches(text)
+    assert [(m.intent, text[m.start:m.end]) for m in matches] == [
+        ('confirm', 'Yes'), ('booking', 'BOOK'), ('confirm', 'BOOK'), ('booking', 'call'),
+    ]
+
+    custom = IntentMatcher({'greeting': ['hello', 'good morning']})
+    assert custom.intents("Good   morning!") == {'greeting'}
+    print("✅ Spans reported for every intent")
+
+
+def test_handler_uses_matcher():
+    """MeetingBookingHandler.is_booking_request goes through the shared matcher"""
+    print("\n🔍 Testing booking request detection...")
+
+    handler = MeetingBookingHandler()
+    assert handler.is_booking_request("Can I book a consultation?")
+    assert not handler.is_booking_request("Do you recall the name of that library?")
+    print("✅ Handler intent detection")
+
+
+if __name__ == "__main__":
+    test_whole_word_matches()
+    test_inflections_and_phrases()
+    test_spans_in_one_pass()
+    test_handler_uses_matcher()
@@ -0,0 +1,86 @@
+#!/usr/bin/env python3
+"""
+Test script to verify the portfolio retrieval index
+"""
+
+import os
+import tempfile
+
+from portfolio_index import (PortfolioIndex, build_portfolio_index, compile_artifact,
+                             load_artifact, load_passages, load_portfolio_index, tokenize)
+
+
+def test_passages_loaded():
+    """Projects from portfolio-data.json are chunked into passages"""
+    print("🔍 Testing portfolio passage chunking...")
+    passages = load_passages()
+    titles = [title for title, _ in passages]
+    assert 'PurpSend' in titles and 'Clinical Assistant' in titles
+    assert len(titles) == len(set(titles)), "project entries should be merged by title"
+    assert all('**' not in text and '@' not in text for _, text in passages)
+    print(f"✅ {len(passages)} passages loaded")
+
+
+def test_search_ranks_relevant_project():
+    """Queries land on the matching project"""
+    print("\n🔍 Testing BM25 ranking...")
+    index = build_portfolio_index()
+    expectations = {
+        "tell me about PurpSend": "PurpSend",
+        "the healthcare documentation app": "Clinical Assistant",
+        "fuel delivery": "Gasaroo Delivery",
+        "spaced repetition learning": "MemorEase",
+    }
+    for query, title in expectations.items():
+        top = index.search(query, limit=1)
+        assert top and top[0][1] == title, (query, top)
+        print(f"  {query!r} -> {top[0][1]}")
+    print("✅ Relevant passages ranked first")
+
+
+def test_lookup_is_smaller_than_full_context():
+    """A lookup returns only a few passages"""
+    print("\n🔍 Testing lookup size...")
+    index = build_portfolio_index()
+    full = sum(len(text) for _, text in index.passages)
+    result = index.lookup("react native mobile apps")
+    assert result and len(result) < full / 3
+    assert index.lookup("zzzz qqqq") is None
+    print(f"✅ Lookup returned {len(result)} of {full} chars")
+
+
+def test_tokenize():
+    """Tokenizer folds case, plurals and stopwords"""
+    assert tokenize("Which projects use React?") == ['react']
+    assert PortfolioIndex([]).search("anything") == []
+
+
+def test_compiled_artifact_matches_source():
+    """The memory-mapped artifact answers exactly like an index built from source"""
+    print("\n🔍 Testing compiled knowledge artifact...")
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, 'portfolio-knowledge.bin')
+        summary = compile_artifact(path)
+        mapped = load_artifact(path)
+        built = build_portfolio_index()
+
+        assert mapped.source == 'artifact'
+        # Term statistics are read from the mapped pages, not parsed into each process
+        assert not isinstance(mapped.postings, dict) and summary['header_bytes'] < summary['bytes'] / 4
+        assert dict(mapped.idf) == built.idf
+        assert all(mapped.postings[term] == docs for term, docs in built.postings.items())
+        assert len(mapped.passages) == summary['passages'] == len(built.passages)
+        assert mapped.overview() == built.overview()
+        for query in ("PurpSend", "react native", "healthcare AI", "three js"):
+            assert mapped.search(query) == built.search(query), query
+        assert load_portfolio_index(path).source == 'artifact'
+        assert load_portfolio_index(os.path.join(tmp, 'missing.bin')).source == 'source'
+    print(f"✅ Artifact with {summary['passages']} passages matches the source index")
+
+
+if __name__ == "__main__":
+    test_passages_loaded()
+    test_search_ranks_relevant_project()
+    test_lookup_is_smaller_than_full_context()
+    test_tokenize()
+    test_compiled_artifact_matches_source()
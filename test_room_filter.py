@@ -0,0 +1,66 @@
+#!/usr/bin/env python3
+"""
+Test script to verify rooms are accepted or rejected before a job process starts
+"""
+
+import asyncio
+from types import SimpleNamespace
+
+import room_filter
+from room_filter import RoomFilter, RoomMatcher, request_room
+
+
+class FakeRequest:
+    """Stands in for livekit.agents.JobRequest"""
+
+    def __init__(self, room_name):
+        self.room = SimpleNamespace(name=room_name)
+        self.answer = None
+
+    async def accept(self):
+        self.answer = 'accepted'
+
+    async def reject(self):
+        self.answer = 'rejected'
+
+
+def test_matcher_patterns():
+    """Prefixes, globs and regexes, alone or mixed"""
+    print("🔍 Testing room name patterns...")
+    default = RoomMatcher('portfolio-voice-')
+    assert default.matches('portfolio-voice-1720000000') and not default.matches('support-42')
+    assert not default.matches('xportfolio-voice-1')
+
+    mixed = RoomMatcher('portfolio-voice-, demo-*-room ,re:consult-\\d+')
+    assert mixed.matches('portfolio-voice-x')
+    assert mixed.matches('demo-7-room') and not mixed.matches('demo-7-room-2')
+    assert mixed.matches('consult-12') and not mixed.matches('consult-12a')
+
+    assert RoomMatcher('').matches('anything') and RoomMatcher('*').matches('anything')
+    print("✅ Patterns matched")
+
+
+def test_request_hook_rejects_before_job():
+    """Non-matching rooms are rejected in the request hook and counted"""
+    print("\n🔍 Testing request_fnc...")
+    saved = room_filter.room_filter
+    room_filter.room_filter = RoomFilter('portfolio-voice-')
+    try:
+        requests = [FakeRequest(name) for name in ('portfolio-voice-1', 'support-42', 'portfolio-voice-2', 'x')]
+
+        async def scenario():
+            for request in requests:
+                await request_room(request)
+
+        asyncio.run(scenario())
+        stats = room_filter.room_filter.stats()
+    finally:
+        room_filter.room_filter = saved
+    assert [r.answer for r in requests] == ['accepted', 'rejected', 'accepted', 'rejected']
+    assert stats['accepted'] == 2 and stats['rejected'] == 2
+    print(f"✅ Rejected before job start, stats {stats}")
+
+
+if __name__ == "__main__":
+    test_matcher_patterns()
+    test_request_hook_rejects_before_job()
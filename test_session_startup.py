@@ -0,0 +1,139 @@
+#!/usr/bin/env python3
+"""
+Test script to verify hedged startup picks the first healthy TTS within one deadline
+"""
+
+import asyncio
+import time
+
+from livekit.agents import tts
+
+from session_startup import StartupStats, TTSCandidate, pick_tts
+import session_startup
+
+
+class _ProbeTTS(tts.TTS):
+    """Local TTS that answers after a delay, or fails"""
+
+    def __init__(self, delay: float, fail: bool = False):
+        super().__init__(capabilities=tts.TTSCapabilities(streaming=False), sample_rate=24000, num_channels=1)
+        self.delay = delay
+        self.fail = fail
+        self.probes = 0
+
+    def synthesize(self, text, *, conn_options=tts.tts.DEFAULT_API_CONNECT_OPTIONS):
+        self.probes += 1
+        return _ProbeStream(tts=self, input_text=text, conn_options=conn_options)
+
+
+class _ProbeStream(tts.ChunkedStream):
+    async def _run(self, output_emitter):
+        await asyncio.sleep(self._tts.delay)
+        if self._tts.fail:
+            raise RuntimeError("provider down")
+        output_emitter.initialize(request_id="probe", sample_rate=24000, num_channels=1, mime_type="audio/pcm")
+        output_emitter.push(b'\x00\x00' * 480)
+
+
+class _SlowSTT:
+    """Stands in for deepgram.STT; recognize() takes longer than any TTS probe"""
+
+    def __init__(self, delay: float):
+        self.delay = delay
+        self.calls = 0
+
+    async def recognize(self, frame, conn_options=None):
+        self.calls += 1
+        await asyncio.sleep(self.delay)
+
+
+def _pick(candidates, deadline, **kwargs):
+    session_startup.startup_stats = StartupStats()
+    started = time.perf_counter()
+    chosen, probe = asyncio.run(pick_tts(candidates, deadline=deadline, **kwargs))
+    return chosen.name, probe, time.perf_counter() - started
+
+
+def test_prefers_primary_when_healthy():
+    """A healthy primary wins even when a fallback answers first"""
+    print("🔍 Testing hedged startup with a healthy primary...")
+    name, probe, elapsed = _pick([
+        TTSCandidate("primary", _ProbeTTS(0.2)),
+        TTSCandidate("fallback", _ProbeTTS(0.01)),
+    ], deadline=2)
+    print(f"Picked {name} in {elapsed * 1000:.0f} ms: {probe}")
+    assert name == "primary"
+    assert elapsed < 1
+    print("✅ Primary picked")
+
+
+def test_failed_primary_costs_no_timeout():
+    """A primary that errors hands over to the next candidate straight away"""
+    print("\n🔍 Testing hedged startup with a failing primary...")
+    name, probe, elapsed = _pick([
+        TTSCandidate("primary", _ProbeTTS(0.05, fail=True)),
+        TTSCandidate("fallback", _ProbeTTS(0.05)),
+        TTSCandidate("last", _ProbeTTS(5)),
+    ], deadline=2)
+    print(f"Picked {name} in {elapsed * 1000:.0f} ms: {probe}")
+    assert name == "fallback"
+    assert elapsed < 1, "should not wait for lower-ranked probes"
+    assert "primary" in probe['errors']
+    stats = session_startup.startup_stats.stats()
+    assert stats['primary']['failed'] == 1 and stats['fallback']['ok'] == 1
+    print("✅ Fallback picked without waiting for a timeout")
+
+
+def test_join_bounded_by_one_deadline():
+    """Hanging providers cost one deadline in total and the last resort is used"""
+    print("\n🔍 Testing hedged startup when every provider hangs...")
+    name, probe, elapsed = _pick([
+        TTSCandidate("primary", _ProbeTTS(5)),
+        TTSCandidate("fallback", _ProbeTTS(5)),
+        TTSCandidate("last", _ProbeTTS(5)),
+    ], deadline=0.3)
+    print(f"Picked {name} in {elapsed * 1000:.0f} ms: {probe}")
+    assert name == "last"
+    assert elapsed < 1
+    assert probe['errors'] == {'primary': 'deadline', 'fallback': 'deadline', 'last': 'deadline'}
+    print("✅ Join time bounded by a single deadline")
+
+
+def test_healthy_primary_probes_nothing_else():
+    """Fallbacks are not billed for a probe, and the STT probe does not hold up the join"""
+    print("\n🔍 Testing hedged startup probe cost...")
+    fallback, last, stt = _ProbeTTS(0.01), _ProbeTTS(0.01), _SlowSTT(1.0)
+    name, probe, elapsed = _pick([
+        TTSCandidate("primary", _ProbeTTS(0.1)),
+        TTSCandidate("fallback", fallback),
+        TTSCandidate("last", last),
+    ], deadline=2, hedge_delay=0.5, stt=stt)
+    print(f"Picked {name} in {elapsed * 1000:.0f} ms: {probe}")
+    assert name == "primary" and probe['probed'] == ['primary']
+    assert fallback.probes == 0 and last.probes == 0
+    assert stt.calls == 1 and elapsed < 0.5, "should not wait for the STT probe"
+    print("✅ One TTS probe, STT probed in the background")
+
+
+def test_slow_primary_is_hedged():
+    """A primary slower than the hedge delay starts the next probe without cancelling its own"""
+    print("\n🔍 Testing hedged startup with a slow primary...")
+    last = _ProbeTTS(0.01)
+    name, probe, elapsed = _pick([
+        TTSCandidate("primary", _ProbeTTS(0.5)),
+        TTSCandidate("fallback", _ProbeTTS(0.05)),
+        TTSCandidate("last", last),
+    ], deadline=2, hedge_delay=0.2)
+    print(f"Picked {name} in {elapsed * 1000:.0f} ms: {probe}")
+    # The primary still answers healthy before the deadline, so it is preferred
+    assert name == "primary" and probe['probed'] == ['fallback', 'primary']
+    assert last.probes == 0
+    print("✅ Fallback probed only after the hedge delay")
+
+
+if __name__ == "__main__":
+    test_prefers_primary_when_healthy()
+    test_failed_primary_costs_no_timeout()
+    test_join_bounded_by_one_deadline()
+    test_healthy_primary_probes_nothing_else()
+    test_slow_primary_is_hedged()
@@ -0,0 +1,77 @@
+#!/usr/bin/env python3
+"""
+Test script to verify booking session state is bounded, expires and is removed on cleanup
+"""
+
+import asyncio
+
+from cal_integration import MeetingBookingHandler
+from session_store import BookingState, SessionStore
+
+
+def test_lru_cap():
+    """The least recently used session is evicted once the cap is reached"""
+    print("🔍 Testing session store size cap...")
+
+    store = SessionStore(max_sessions=2, idle_ttl=60)
+    store.get_or_create('room-a')
+    store.get_or_create('room-b')
+    store.get('room-a')  # room-b is now the least recently used
+    store.get_or_create('room-c')
+
+    assert 'room-a' in store and 'room-c' in store
+    assert 'room-b' not in store
+    assert store.stats()['evicted'] == 1
+    print("✅ Oldest session evicted")
+
+
+def test_idle_ttl():
+    """Sessions idle for longer than the TTL disappear"""
+    print("\n🔍 Testing session store idle TTL...")
+
+    store = SessionStore(max_sessions=10, idle_ttl=60)
+    stale = store.get_or_create('room-stale')
+    store.get_or_create('room-live')
+    stale.last_seen -= 120
+    # Keep insertion order consistent with activity, as get() would
+    store._states.move_to_end('room-live')
+
+    stats = store.stats()
+    assert stats['sessions'] == 1 and stats['expired'] == 1
+    assert store.get('room-stale') is None
+    print("✅ Idle session expired")
+
+
+def test_slots_state():
+    """State records have no per-instance __dict__"""
+    print("\n🔍 Testing BookingState slots...")
+
+    state = BookingState('room-a')
+    assert not hasattr(state, '__dict__')
+    assert state.size_bytes() > 0
+    print("✅ BookingState uses __slots__")
+
+
+def test_booking_flow_state_removed_on_end():
+    """handle_booking_flow keeps its stage in the store and end_session drops it"""
+    print("\n🔍 Testing booking flow with the session store...")
+
+    handler = MeetingBookingHandler()
+    handler.booking_context.get_or_create('room-a').stage = 'collect_info'
+
+    reply = asyncio.run(handler.handle_booking_flow("My name is Francis", 'room-a'))
+    state = handler.booking_context.get('room-a')
+    assert "Francis" in reply
+    assert state.name == "Francis" and state.email_parts == []
+
+    assert asyncio.run(handler.end_session('room-a'))
+    assert not asyncio.run(handler.end_session('room-a'))
+    assert handler.booking_context.stats()['sessions'] == 0
+    print("✅ Booking state stored and removed")
+
+
+if __name__ == "__main__":
+    test_lru_cap()
+    test_idle_ttl()
+    test_slots_state()
+    test_booking_flow_state_removed_on_end()
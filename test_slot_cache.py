@@ -0,0 +1,175 @@
+#!/usr/bin/env python3
+"""
+Test script to verify the Cal.com availability cache
+"""
+
+import asyncio
+import os
+import tempfile
+
+from slot_cache import SharedSlotStore, SlotCache
+
+KEY = ('123', '2025-07-07', '2025-07-14')
+SLOTS = ['2025-07-08T14:00:00.000Z', '2025-07-08T15:00:00.000Z']
+
+
+class CountingLoader:
+    def __init__(self, result=SLOTS, delay=0.01):
+        self.calls = 0
+        self.result = result
+        self.delay = delay
+
+    async def __call__(self):
+        self.calls += 1
+        await asyncio.sleep(self.delay)
+        return list(self.result) if self.result is not None else None
+
+
+def test_single_flight():
+    """Concurrent misses for the same window share one fetch"""
+    print("🔍 Testing single-flight de-duplication...")
+
+    async def scenario():
+        cache = SlotCache(ttl=30, stale_ttl=60)
+        loader = CountingLoader()
+        results = await asyncio.gather(*[cache.get(KEY, loader) for _ in range(10)])
+        return cache, loader, results
+
+    cache, loader, results = asyncio.run(scenario())
+    assert loader.calls == 1
+    assert all(r == SLOTS for r in results)
+    print(f"✅ 10 concurrent lookups, {loader.calls} fetch, stats {cache.stats()}")
+
+
+def test_stale_while_revalidate():
+    """Stale entries are served immediately while a refresh runs in the background"""
+    print("\n🔍 Testing stale-while-revalidate...")
+
+    async def scenario():
+        cache = SlotCache(ttl=0.05, stale_ttl=60)
+        loader = CountingLoader()
+        await cache.get(KEY, loader)
+        await asyncio.sleep(0.06)
+
+        loader.result = SLOTS[:1]
+        stale = await cache.get(KEY, loader)
+        await asyncio.sleep(0.05)
+        fresh = await cache.get(KEY, loader)
+        return cache, loader, stale, fresh
+
+    cache, loader, stale, fresh = asyncio.run(scenario())
+    assert stale == SLOTS, "stale value should be returned without waiting"
+    assert fresh == SLOTS[:1], "background refresh should replace the entry"
+    assert loader.calls == 2 and cache.stale_hits == 1
+    print("✅ Stale entry served and refreshed in the background")
+
+
+def test_failures_not_cached_and_invalidation():
+    """Failed fetches are retried and booked slots are dropped"""
+    print("\n🔍 Testing failure handling and slot invalidation...")
+
+    async def scenario():
+        cache = SlotCache(ttl=30, stale_ttl=60)
+        failing = CountingLoader(result=None)
+        first = await cache.get(KEY, failing)
+        second = await cache.get(KEY, failing)
+
+        loader = CountingLoader()
+        await cache.get(KEY, loader)
+        cache.invalidate_slot('2025-07-08T14:00:00+00:00')
+        return failing, first, second, cache.peek(KEY)
+
+    failing, first, second, remaining = asyncio.run(scenario())
+    assert first == [] and second == [] and failing.calls == 2
+    assert remaining == SLOTS[1:]
+    print("✅ Errors are not cached and booked slots are invalidated")
+
+
+def test_booking_during_fetch_not_cached():
+    """A fetch that started before a booking does not put the booked slot back"""
+    print("\n🔍 Testing invalidation during an in-flight fetch...")
+
+    async def scenario():
+        cache = SlotCache(ttl=30, stale_ttl=60)
+        loader = CountingLoader(delay=0.05)
+        fetch = asyncio.ensure_future(cache.get(KEY, loader))
+        await asyncio.sleep(0.01)
+        cache.invalidate_slot('2025-07-08T14:00:00+00:00')
+        return await fetch, cache.peek(KEY)
+
+    slots, cached = asyncio.run(scenario())
+    assert slots == SLOTS[1:]
+    assert cached is None, "a result that predates the booking must not be cached"
+    print("✅ Booked slot dropped from the in-flight result and not cached")
+
+
+def test_prefetch_serves_formatted_times():
+    """Prefetching at room join means the tool call never waits on Cal.com"""
+    print("\n🔍 Testing availability prefetch...")
+    from cal_integration import CalComBooking
+
+    async def scenario():
+        booking = CalComBooking()
+        booking.slot_cache = SlotCache(ttl=30, stale_ttl=60)
+        loader = CountingLoader(delay=0.05)
+        booking._fetch_available_slots = lambda date_from, date_to: loader()
+
+        prefetch = booking.prefetch_available_slots()
+        # A tool call racing the prefetch joins the in-flight request
+        formatted = await booking.get_formatted_available_times()
+        await prefetch
+        again = await booking.get_formatted_available_times()
+        return loader, formatted, again
+
+    loader, formatted, again = asyncio.run(scenario())
+    assert loader.calls == 1
+    assert formatted == again and "Tuesday, July 08" in formatted
+    print(f"✅ Formatted times served from prefetched slots: {formatted[:60]}...")
+
+
+def test_shared_between_job_processes():
+    """A window fetched in one job process is served to the next room's process without a fetch"""
+    print("\n🔍 Testing the shared slot cache tier...")
+
+    async def room(path, loader, book=None):
+        # A fresh cache per room, as LiveKit runs each room in its own job process
+        cache = SlotCache(ttl=30, stale_ttl=60, shared=SharedSlotStore(path))
+        slots = await cache.get(KEY, loader)
+        if book:
+            cache.invalidate_slot(book)
+            await asyncio.gather(*cache._writes)
+        return cache, slots
+
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, 'slot-cache.sqlite3')
+        loader = CountingLoader()
+        first, slots = asyncio.run(room(path, loader, book='2025-07-08T14:00:00+00:00'))
+        assert slots == SLOTS and first.fetches == 1
+        rooms = [asyncio.run(room(path, loader)) for _ in range(9)]
+        assert loader.calls == 1
+        # The slot booked in the first room is not offered to the others
+        assert all(slots == SLOTS[1:] for _, slots in rooms)
+        assert all(cache.stats()['shared_hits'] == 1 for cache, _ in rooms)
+
+        # Past the fresh TTL the shared copy is served stale and refreshed once
+        store = SharedSlotStore(path)
+        store.put(KEY, SLOTS, store.get(KEY)[1] - 45)
+        stale = SlotCache(ttl=30, stale_ttl=60, shared=store)
+
+        async def refresh():
+            slots = await stale.get(KEY, loader)
+            await asyncio.gather(*stale._inflight.values(), *stale._writes)
+            return slots
+
+        assert asyncio.run(refresh()) == SLOTS and loader.calls == 2
+        assert asyncio.run(room(path, loader))[1] == SLOTS and loader.calls == 2
+    print("✅ Ten rooms, one Cal.com fetch")
+
+
+if __name__ == "__main__":
+    test_single_flight()
+    test_stale_while_revalidate()
+    test_failures_not_cached_and_invalidation()
+    test_booking_during_fetch_not_cached()
+    test_prefetch_serves_formatted_times()
+    test_shared_between_job_processes()
@@ -0,0 +1,148 @@
+#!/usr/bin/env python3
+"""
+Test script to verify preferred times are resolved against the indexed Cal.com slots
+"""
+
+import asyncio
+from datetime import datetime, timezone
+
+from slot_cache import SlotCache
+from slot_index import SlotIndex, describe_slot, parse_preferred_time
+
+# Sunday evening; the slots run Monday to Friday
+NOW = datetime(2025, 7, 6, 20, 0, tzinfo=timezone.utc)
+SLOTS = [
+    '2025-07-10T15:00:00Z',
+    '2025-07-07T10:00:00.000Z',
+    '2025-07-07T10:30:00.000Z',
+    '2025-07-07T14:00:00.000Z',
+    '2025-07-10T09:00:00Z',
+    '2025-07-11T18:00:00Z',
+]
+
+
+def test_parse_preferred_time():
+    """Days, clock times and parts of the day are read from natural phrases"""
+    print("🔍 Testing preferred time parsing...")
+
+    query = parse_preferred_time("tomorrow at 10:30 AM", NOW)
+    assert (str(query.day), str(query.clock)) == ('2025-07-07', '10:30:00')
+    query = parse_preferred_time("Thursday afternoon", NOW)
+    assert (str(query.day), query.part, query.clock) == ('2025-07-10', 'afternoon', None)
+    assert str(parse_preferred_time("at 3", NOW).clock) == '15:00:00'
+    assert parse_preferred_time("July 10th", NOW).clock is None
+    assert parse_preferred_time("whenever suits you", NOW).empty
+    print("✅ Phrases parsed")
+
+
+def test_resolve_slots():
+    """The slot the caller named is booked, not the first one"""
+    print("\n🔍 Testing slot resolution...")
+
+    index = SlotIndex(SLOTS)
+    cases = {
+        "tomorrow at 10 AM": '2025-07-07T10:00:00.000Z',
+        "tomorrow at 10:30am": '2025-07-07T10:30:00.000Z',
+        "Thursday afternoon": '2025-07-10T15:00:00Z',
+        "Thursday": '2025-07-10T09:00:00Z',
+        "Friday evening": '2025-07-11T18:00:00Z',
+        "3 pm on Thursday": '2025-07-10T15:00:00Z',
+        "2025-07-10T15:00:00.000Z": '2025-07-10T15:00:00Z',
+        "first available": '2025-07-07T10:00:00.000Z',
+        "": '2025-07-07T10:00:00.000Z',
+    }
+    for text, slot in cases.items():
+        match = index.resolve(text, NOW)
+        assert match.exact and match.slot == slot, (text, match)
+    print(f"✅ {len(cases)} preferred times resolved")
+
+
+def test_unavailable_times_offer_alternatives():
+    """A taken time is not booked; the nearest open slots are offered instead"""
+    print("\n🔍 Testing alternatives...")
+
+    index = SlotIndex(SLOTS)
+    match = index.resolve("tomorrow at 11 AM", NOW)
+    assert not match.exact and match.slot is None
+    assert match.alternatives == ['2025-07-07T10:00:00.000Z', '2025-07-07T10:30:00.000Z']
+    match = index.resolve("Saturday morning", NOW)
+    assert not match.exact and match.alternatives == ['2025-07-07T10:00:00.000Z', '2025-07-07T10:30:00.000Z']
+    # Slots that have already started are never offered or booked
+    monday_noon = datetime(2025, 7, 7, 12, 0, tzinfo=timezone.utc)
+    match = index.resolve("today at 11 AM", monday_noon)
+    assert match.alternatives == ['2025-07-07T14:00:00.000Z', '2025-07-10T09:00:00Z']
+    match = index.resolve("2025-07-07T10:30:00Z", monday_noon)
+    assert not match.exact and match.alternatives == ['2025-07-07T14:00:00.000Z', '2025-07-10T09:00:00Z']
+    assert describe_slot('2025-07-10T15:00:00Z') == 'Thursday, July 10 at 03:00 PM'
+    print("✅ Alternatives offered")
+
+
+def test_unparsed_times_are_not_booked():
+    """Only an empty time or "first available" books the first slot; anything else must be understood"""
+    print("\n🔍 Testing times the parser does not understand...")
+
+    # Sunday; slots on Tuesday 20 and Thursday 22 October
+    now = datetime(2026, 10, 18, 12, 0, tzinfo=timezone.utc)
+    index = SlotIndex(['2026-10-20T10:00:00Z', '2026-10-20T14:00:00Z',
+                       '2026-10-22T10:00:00Z', '2026-10-22T10:30:00Z'])
+    booked = {
+        "the 22nd": '2026-10-22T10:00:00Z',
+        "on the 22nd at 10:30": '2026-10-22T10:30:00Z',
+        "22nd of October": '2026-10-22T10:00:00Z',
+        "Thursday 10:30": '2026-10-22T10:30:00Z',
+        "Thursday at ten thirty": '2026-10-22T10:30:00Z',
+        "ten thirty on Thursday": '2026-10-22T10:30:00Z',
+        "Tuesday at two pm": '2026-10-20T14:00:00Z',
+        "Thursday ten am": '2026-10-22T10:00:00Z',
+        "Tuesday at two o'clock": '2026-10-20T14:00:00Z',
+        "the earliest you have": '2026-10-20T10:00:00Z',
+        "first available": '2026-10-20T10:00:00Z',
+        "": '2026-10-20T10:00:00Z',
+    }
+    for text, slot in booked.items():
+        match = index.resolve(text, now)
+        assert match.exact and match.slot == slot, (text, match)
+
+    for text in ("I am free whenever", "whenever suits you", "sometime soon"):
+        match = index.resolve(text, now)
+        assert match == (None, False, ['2026-10-20T10:00:00Z', '2026-10-20T14:00:00Z']), (text, match)
+    # A day with a time that cannot be read is not booked at the first slot that day
+    match = index.resolve("Thursday at quarter past ten", now)
+    assert match == (None, False, ['2026-10-22T10:00:00Z', '2026-10-22T10:30:00Z'])
+    match = index.resolve("Tuesday at ten thirty", now)
+    assert not match.exact and match.alternatives == ['2026-10-20T10:00:00Z', '2026-10-20T14:00:00Z']
+    print(f"✅ {len(booked)} phrases booked, vague ones offered alternatives")
+
+
+def test_cache_keeps_index():
+    """The index is built once per fetch and follows booked slots"""
+    print("\n🔍 Testing cached slot index...")
+
+    calls = []
+
+    async def loader():
+        calls.append(1)
+        return list(SLOTS)
+
+    async def scenario():
+        cache = SlotCache(ttl=30, stale_ttl=60)
+        key = ('123', '2025-07-07', '2025-07-14')
+        first = await cache.get_index(key, loader)
+        second = await cache.get_index(key, loader)
+        cache.invalidate_slot('2025-07-10T15:00:00.000Z')
+        third = await cache.get_index(key, loader)
+        return first, second, third
+
+    first, second, third = asyncio.run(scenario())
+    assert len(calls) == 1 and first is second
+    assert len(third) == len(SLOTS) - 1
+    assert not third.resolve("Thursday at 3 pm", NOW).exact
+    print("✅ One fetch, index rebuilt after a booking")
+
+
+if __name__ == "__main__":
+    test_parse_preferred_time()
+    test_resolve_slots()
+    test_unavailable_times_offer_alternatives()
+    test_unparsed_times_are_not_booked()
+    test_cache_keeps_index()
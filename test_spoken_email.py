@@ -0,0 +1,122 @@
+#!/usr/bin/env python3
+"""
+Test script to verify spoken email addresses are rebuilt from STT transcripts
+"""
+
+import asyncio
+import time
+
+from cal_integration import MeetingBookingHandler
+from spoken_email import SpokenEmailParser, parse_contact
+
+
+# Transcripts as Deepgram returned them, and the address the caller meant
+SPOKEN_EMAILS = {
+    "thinkout98@gmail.com": "thinkout98@gmail.com",
+    "My name is Francis and my email is thinkout98@gmail.com": "thinkout98@gmail.com",
+    "So the ninety eight is not is the numbers. So think out ninety eight. Nine eight. At Gmail dot com.":
+        "thinkout98@gmail.com",
+    "sholla dot alagbe at gmail dot com": "sholla.alagbe@gmail.com",
+    "john underscore doe at company dot co dot uk": "john_doe@company.co.uk",
+    "j o h n at outlook dot com": "john@outlook.com",
+    "It's mike dot smith at yahoo": "mike.smith@yahoo.com",
+    "m as in mike i k e at example dot org": "mike@example.org",
+    "bob at proton dot me": "bob@proton.me",
+    "jane dash doe seven seven at fastmail dot com": "jane-doe77@fastmail.com",
+    "joe at startup dot io": "joe@startup.io",
+    "I'm at home right now": None,
+    "Jane Doe, jane at gmail dot com": "jane@gmail.com",
+    "I am Victor Hugo, victor at gmail dot com": "victor@gmail.com",
+    "a l e x at gmail dot com": "alex@gmail.com",
+    "i v a n at yahoo dot com": "ivan@yahoo.com",
+    "my email is a b c one two three at gmail dot com": "abc123@gmail.com",
+    "double u double u at example dot com": "ww@example.com",
+    "double you a n g at gmail dot com": "wang@gmail.com",
+    "double e at x dot com": "ee@x.com",
+}
+
+
+def test_spoken_addresses():
+    """Spelled letters, NATO words, numbers and any domain are rebuilt"""
+    print("🔍 Testing spoken email corpus...")
+
+    for text, expected in SPOKEN_EMAILS.items():
+        assert parse_contact(text)['email'] == expected, text
+    print(f"✅ {len(SPOKEN_EMAILS)} transcripts parsed")
+
+
+def test_names():
+    """Names come from "my name is" or a transcript that is only a name"""
+    print("\n🔍 Testing name extraction...")
+
+    assert parse_contact("my name is francis")['name'] == 'Francis'
+    assert parse_contact("Hi, I'm Sholla and my email is sholla at gmail dot com") == {
+        'email': 'sholla@gmail.com', 'name': 'Sholla'}
+    assert parse_contact("Francis here")['name'] == 'Francis'
+    assert parse_contact("Dana.")['name'] == 'Dana'
+    assert parse_contact("yes please")['name'] is None
+    # NATO words are names after an intro
+    assert parse_contact("My name is Mike and my email is abc@x.com") == {'email': 'abc@x.com', 'name': 'Mike'}
+    assert parse_contact("My name is Mike Jones")['name'] == 'Mike'
+    assert parse_contact("This is Oscar")['name'] == 'Oscar'
+    # Capitalised words in a sentence are not names
+    for text in ("Sure, it is Dana", "Tell me about FlashPoint", "Sure.", "Thursday.", "I am free whenever"):
+        assert parse_contact(text)['name'] is None, text
+    print("✅ Names extracted")
+
+
+def test_incremental_transcripts():
+    """An address spelled over several transcripts carries over between feeds"""
+    print("\n🔍 Testing incremental spelling...")
+
+    parser = SpokenEmailParser()
+    assert parser.feed("t h i n k") is None and parser.in_progress
+    assert parser.feed("out ninety eight") is None
+    assert parser.feed("at gmail dot") is None and parser.in_progress
+    assert parser.feed("com") == 'thinkout98@gmail.com'
+    assert not parser.in_progress
+    print("✅ Address completed on the fourth transcript")
+
+
+def test_booking_flow_spelling():
+    """The booking flow keeps partial spelling in the session and finishes the address"""
+    print("\n🔍 Testing booking flow spelling...")
+
+    async def scenario():
+        handler = MeetingBookingHandler()
+        context = handler.booking_context.get_or_create('spell-room')
+        context.stage = 'collect_info'
+        replies = [await handler.handle_booking_flow(text, 'spell-room')
+                   for text in ("My name is Francis", "f r a n", "dot", "at gmail dot com")]
+        context = handler.booking_context.get('spell-room')
+        await handler.end_session('spell-room')
+        return replies, context
+
+    replies, context = asyncio.run(scenario())
+    assert replies[0].startswith("Thanks Francis")
+    assert replies[1] == "Got it, continue spelling..."
+    assert replies[2] == "Dot noted, continue..."
+    assert replies[3].startswith("Perfect!")
+    assert (context.name, context.email, context.stage) == ('Francis', 'fran@gmail.com', 'confirm_booking')
+    print("✅ Booking flow collected fran@gmail.com")
+
+
+def test_parse_speed():
+    """One pass per transcript stays well under a millisecond"""
+    print("\n🔍 Testing parse speed...")
+
+    corpus = list(SPOKEN_EMAILS) * 100
+    start = time.perf_counter()
+    for text in corpus:
+        parse_contact(text)
+    per = (time.perf_counter() - start) / len(corpus)
+    assert per < 1e-3
+    print(f"✅ {per * 1e6:.1f} µs per transcript")
+
+
+if __name__ == "__main__":
+    test_spoken_addresses()
+    test_names()
+    test_incremental_transcripts()
+    test_booking_flow_spelling()
+    test_parse_speed()
@@ -0,0 +1,167 @@
+#!/usr/bin/env python3
+"""
+Test script to verify booking state survives a move between worker processes
+"""
+
+import asyncio
+import os
+import sqlite3
+import tempfile
+
+from session_store import SessionStore
+from state_backend import MemoryStateBackend, SQLiteStateBackend, VersionConflict
+
+
+def test_memory_backend_versions():
+    """Saves based on an old version are rejected"""
+    print("🔍 Testing memory backend optimistic versioning...")
+
+    backend = MemoryStateBackend()
+    assert backend.save('room-a', {'stage': 'initial'}, 0) == 1
+    assert backend.save('room-a', {'stage': 'show_times'}, 1) == 2
+    try:
+        backend.save('room-a', {'stage': 'initial'}, 1)
+        assert False, "stale save should conflict"
+    except VersionConflict as e:
+        assert e.actual == 2
+    assert backend.load('room-a') == ({'stage': 'show_times'}, 2)
+    print("✅ Stale save rejected")
+
+
+def test_sqlite_handoff_between_processes():
+    """A second process picks up a room's progress from the shared file"""
+    print("\n🔍 Testing SQLite handoff between stores...")
+
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, 'state.sqlite3')
+        first = SessionStore(backend=SQLiteStateBackend(path))
+        state = first.get_or_create('room-a')
+        state.stage = 'collect_info'
+        state.name = 'Francis'
+        state.email_parts = ['f', 'r']
+        assert first.save(state)
+
+        second = SessionStore(backend=SQLiteStateBackend(path))
+        moved = second.get_or_create('room-a')
+        assert (moved.stage, moved.name, moved.email_parts, moved.version) == ('collect_info', 'Francis', ['f', 'r'], 1)
+        moved.stage = 'confirm_booking'
+        assert second.save(moved)
+
+        # The first process still holds version 1; its save loses and reloads
+        state.stage = 'initial'
+        assert not first.save(state)
+        assert state.stage == 'confirm_booking' and state.version == 2
+
+        second.remove('room-a')
+        assert SQLiteStateBackend(path).load('room-a') is None
+    print("✅ State moved between processes and conflicts resolved")
+
+
+def test_sqlite_batches_writes():
+    """Saves inside the event loop are coalesced into one transaction"""
+    print("\n🔍 Testing SQLite write batching...")
+
+    async def scenario(path):
+        backend = SQLiteStateBackend(path, batch_size=100, flush_interval=0.05)
+        version = 0
+        for stage in ('initial', 'show_times', 'collect_info'):
+            version = backend.save('room-a', {'stage': stage}, version)
+        backend.save('room-b', {'stage': 'initial'}, 0)
+        pending = backend.stats()['pending']
+        await asyncio.sleep(0.1)
+        return backend, pending
+
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, 'state.sqlite3')
+        backend, pending = asyncio.run(scenario(path))
+        stats = backend.stats()
+        assert pending == 2
+        assert stats['writes'] == 4 and stats['flushes'] == 1 and stats['pending'] == 0
+        assert SQLiteStateBackend(path).load('room-a') == ({'stage': 'collect_info'}, 3)
+    print("✅ Four saves written in one flush")
+
+
+def test_sqlite_lost_batch_forces_reload():
+    """A batched write that loses the race makes the next save conflict"""
+    print("\n🔍 Testing SQLite write-behind conflict detection...")
+
+    async def scenario(path):
+        slow = SQLiteStateBackend(path, batch_size=100, flush_interval=10)
+        slow.save('room-a', {'stage': 'show_times'}, 0)
+        other = SQLiteStateBackend(path)
+        other.save('room-a', {'stage': 'collect_info'}, 0)
+        other.flush()
+        lost = slow.flush()
+        try:
+            slow.save('room-a', {'stage': 'initial'}, 1)
+            conflicted = False
+        except VersionConflict:
+            conflicted = True
+        return lost, conflicted
+
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, 'state.sqlite3')
+        lost, conflicted = asyncio.run(scenario(path))
+        assert lost == ['room-a'] and conflicted
+        assert SQLiteStateBackend(path).load('room-a') == ({'stage': 'collect_info'}, 1)
+    print("✅ Lost write detected")
+
+
+def test_sqlite_lock_wait_off_event_loop():
+    """Waiting on another process's write lock does not stall the event loop"""
+    print("\n🔍 Testing SQLite writes while another process holds the lock...")
+
+    async def scenario(path):
+        backend = SQLiteStateBackend(path, batch_size=1)
+        other = sqlite3.connect(path, isolation_level=None)
+        other.execute('BEGIN IMMEDIATE')
+        loop = asyncio.get_running_loop()
+        # Only released if the loop keeps running while the save waits for the lock
+        loop.call_later(0.2, other.execute, 'COMMIT')
+        started = loop.time()
+        version = await backend.asave('room-a', {'stage': 'show_times'}, 0)
+        waited = loop.time() - started
+        record = await backend.aload('room-a')
+        await backend.adelete('room-a')
+        other.close()
+        return version, waited, record, backend.stats()
+
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, 'state.sqlite3')
+        SQLiteStateBackend(path).close()
+        version, waited, record, stats = asyncio.run(scenario(path))
+        print(f"Save waited {waited * 1000:.0f} ms for the lock")
+        assert version == 1 and 0.15 < waited < 2
+        assert record == ({'stage': 'show_times'}, 1)
+        assert stats['records'] == 0 and stats['flushes'] == 1
+    print("✅ Lock wait handled on the database thread")
+
+
+def test_job_end_keeps_stored_state():
+    """Ending a job flushes its pending writes and leaves the row for the next job"""
+    print("\n🔍 Testing session release at job end...")
+
+    async def scenario(path):
+        store = SessionStore(backend=SQLiteStateBackend(path, batch_size=100, flush_interval=10))
+        state = await store.aget_or_create('room-a')
+        state.stage = 'collect_info'
+        assert await store.asave(state)
+        released = await store.release('room-a')
+        return released, len(store)
+
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, 'state.sqlite3')
+        released, held = asyncio.run(scenario(path))
+        assert released and held == 0
+        assert SQLiteStateBackend(path).load('room-a') == ({'stage': 'collect_info', 'name': None,
+                                                             'email': None, 'email_parts': None}, 1)
+    print("✅ Pending write flushed and stored state kept")
+
+
+if __name__ == "__main__":
+    test_memory_backend_versions()
+    test_sqlite_handoff_between_processes()
+    test_sqlite_batches_writes()
+    test_sqlite_lost_batch_forces_reload()
+    test_sqlite_lock_wait_off_event_loop()
+    test_job_end_keeps_stored_state()
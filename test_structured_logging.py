@@ -0,0 +1,135 @@
+#!/usr/bin/env python3
+"""
+Test script to verify queue-backed JSON logging, correlation ids and debug rate limits
+"""
+
+import asyncio
+import json
+import logging
+import queue
+import time
+
+import structured_logging
+from structured_logging import (ContextFilter, DebugRateLimit, JsonFormatter, NonBlockingQueueHandler,
+                                parse_levels, set_log_context, setup_logging)
+
+
+class ListHandler(logging.Handler):
+    """Collects formatted records"""
+
+    def __init__(self):
+        super().__init__()
+        self.lines = []
+
+    def emit(self, record):
+        self.lines.append(self.format(record))
+
+
+def _record(level=logging.DEBUG, msg='hello %s', args=('world',), lineno=10, **extra):
+    record = logging.LogRecord('cal_integration', level, 'cal_integration.py', lineno, msg, args, None)
+    record.__dict__.update(extra)
+    return record
+
+
+def test_json_records_carry_context():
+    """Records are JSON with extra fields and the room/job of the task that logged them"""
+    print("🔍 Testing JSON records and correlation ids...")
+    formatter, context = JsonFormatter(), ContextFilter()
+
+    async def job(room):
+        set_log_context(room=room, job=f'AJ_{room}')
+        await asyncio.sleep(0)
+        record = _record(slot='2025-07-08T14:00:00Z')
+        context.filter(record)
+        return json.loads(formatter.format(record))
+
+    async def scenario():
+        return await asyncio.gather(job('portfolio-voice-1'), job('portfolio-voice-2'))
+
+    first, second = asyncio.run(scenario())
+    assert first['msg'] == 'hello world' and first['level'] == 'DEBUG' and first['logger'] == 'cal_integration'
+    assert first['slot'] == '2025-07-08T14:00:00Z'
+    assert (first['room'], first['job']) == ('portfolio-voice-1', 'AJ_portfolio-voice-1')
+    assert (second['room'], second['job']) == ('portfolio-voice-2', 'AJ_portfolio-voice-2')
+
+    outside = _record()
+    context.filter(outside)
+    assert 'room' not in json.loads(formatter.format(outside))
+    assert parse_levels(' cal_integration=debug, livekit=WARNING,bad') == {'cal_integration': 'DEBUG',
+                                                                           'livekit': 'WARNING'}
+    print("✅ Each room's records carry its own ids")
+
+
+def test_debug_rate_limit():
+    """Each call site gets `rate` debug lines per second; INFO is never limited"""
+    print("\n🔍 Testing debug rate limits...")
+    limit = DebugRateLimit(rate=5, sample=1.0)
+    passed = sum(limit.filter(_record()) for _ in range(20))
+    other_site = limit.filter(_record(lineno=11))
+    info = all(limit.filter(_record(level=logging.INFO)) for _ in range(20))
+    assert passed == 5 and other_site and info
+
+    time.sleep(0.25)
+    record = _record()
+    assert limit.filter(record) and record.suppressed == 15
+
+    sampled = DebugRateLimit(rate=0, sample=0.0)
+    assert not sampled.filter(_record()) and sampled.filter(_record(level=logging.WARNING))
+    print("✅ Debug lines limited per call site")
+
+
+def test_queue_handler_never_blocks():
+    """A full queue drops records and the next one through reports how many"""
+    print("\n🔍 Testing non-blocking queue handler...")
+    log_queue = queue.Queue(2)
+    handler = NonBlockingQueueHandler(log_queue)
+    started = time.perf_counter()
+    for i in range(5):
+        handler.handle(_record(level=logging.INFO, args=(i,)))
+    assert time.perf_counter() - started < 0.1
+    assert handler.dropped == 3
+    assert [log_queue.get_nowait().getMessage() for _ in range(2)] == ['hello 0', 'hello 1']
+
+    handler.handle(_record(level=logging.INFO, args=('again',)))
+    record = log_queue.get_nowait()
+    assert record.msg == 'hello again' and record.args is None and record.dropped_records == 3
+    print("✅ Records dropped, not waited for")
+
+
+def test_setup_logging_moves_handlers_behind_queue():
+    """Existing root handlers are drained by the listener thread, not called by the logger"""
+    print("\n🔍 Testing setup_logging...")
+    root = logging.getLogger()
+    saved_handlers, saved_level = root.handlers[:], root.level
+    saved_state = structured_logging._listener, structured_logging._queue_handler, structured_logging._listener_pid
+    structured_logging._listener = structured_logging._queue_handler = None
+    target = ListHandler()
+    target.setFormatter(JsonFormatter())
+    for handler in saved_handlers:
+        root.removeHandler(handler)
+    root.addHandler(target)
+    root.setLevel(logging.INFO)
+    try:
+        setup_logging()
+        setup_logging()
+        assert root.handlers == [structured_logging._queue_handler]
+        logging.getLogger('token_service').info("Token service listening on %s", '0.0.0.0:8080', extra={'workers': 2})
+        structured_logging._listener.stop()
+        line = json.loads(target.lines[-1])
+        assert line['msg'] == 'Token service listening on 0.0.0.0:8080' and line['workers'] == 2
+    finally:
+        for handler in root.handlers[:]:
+            root.removeHandler(handler)
+        for handler in saved_handlers:
+            root.addHandler(handler)
+        root.setLevel(saved_level)
+        (structured_logging._listener, structured_logging._queue_handler,
+         structured_logging._listener_pid) = saved_state
+    print("✅ Logging routed through the queue")
+
+
+if __name__ == "__main__":
+    test_json_records_carry_context()
+    test_debug_rate_limit()
+    test_queue_handler_never_blocks()
+    test_setup_logging_moves_handlers_behind_queue()
@@ -0,0 +1,71 @@
+#!/usr/bin/env python3
+"""
+Test script to verify precomputed LiveKit token minting
+"""
+
+import jwt
+
+from token_minter import TOKEN_TTL, TokenMinter
+
+SECRET = 'test-secret-test-secret-test-secret'
+
+
+def _jwt_encode(room_name, participant_name, now):
+    payload = {
+        'iss': 'test-key',
+        'sub': participant_name,
+        'iat': now,
+        'exp': now + TOKEN_TTL,
+        'room': room_name,
+        'video': {
+            'roomJoin': True,
+            'room': room_name,
+            'canPublish': True,
+            'canSubscribe': True,
+            'canPublishData': True
+        }
+    }
+    return jwt.encode(payload, SECRET, algorithm='HS256')
+
+
+def test_matches_jwt_encode():
+    """Minted tokens are byte-for-byte what jwt.encode produces"""
+    print("🔍 Testing TokenMinter against jwt.encode...")
+    minter = TokenMinter('test-key', SECRET)
+    for room, participant in [('portfolio-voice-1', 'ada'), ('voice-consultation', 'User-1720000000'),
+                              ('portfolio-voice-2', 'Zoë "the caller"'), ('a/b\\c', '日本')]:
+        assert minter.mint(room, participant, 1720000000) == _jwt_encode(room, participant, 1720000000)
+
+    claims = jwt.decode(minter.mint('portfolio-voice-1', 'ada'), SECRET, algorithms=['HS256'])
+    assert claims['exp'] - claims['iat'] == TOKEN_TTL and claims['video']['room'] == 'portfolio-voice-1'
+    print("✅ Tokens match jwt.encode")
+
+
+def test_mint_many():
+    """A batch shares one issue time and keys every token to its own participant"""
+    print("\n🔍 Testing TokenMinter.mint_many...")
+    minter = TokenMinter('test-key', SECRET)
+    tokens = minter.mint_many([('portfolio-voice-1', 'ada'), ('portfolio-voice-2', 'grace')])
+    claims = [jwt.decode(token, SECRET, algorithms=['HS256']) for token in tokens]
+    assert [c['sub'] for c in claims] == ['ada', 'grace']
+    assert claims[0]['iat'] == claims[1]['iat']
+    print("✅ Batch minted")
+
+
+def test_missing_credentials():
+    """Missing credentials fail up front with the error the endpoint used to return"""
+    print("\n🔍 Testing missing credentials...")
+    for key, secret in [(None, SECRET), ('test-key', None), ('', '')]:
+        try:
+            TokenMinter(key, secret)
+        except ValueError as e:
+            assert str(e) == "LiveKit API credentials not found"
+        else:
+            raise AssertionError("expected ValueError")
+    print("✅ Missing credentials rejected")
+
+
+if __name__ == "__main__":
+    test_matches_jwt_encode()
+    test_mint_many()
+    test_missing_credentials()
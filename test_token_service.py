@@ -0,0 +1,129 @@
+#!/usr/bin/env python3
+"""
+Test script to verify the async token service endpoints
+"""
+
+import asyncio
+import base64
+import hashlib
+import json
+import os
+
+import jwt
+from aiohttp.test_utils import TestClient, TestServer
+
+from token_service import WEBHOOK_PIPELINE, create_app
+
+SECRET = 'test-secret-test-secret-test-secret'
+
+
+def _with_credentials(scenario):
+    saved = {key: os.environ.get(key) for key in ('LIVEKIT_API_KEY', 'LIVEKIT_API_SECRET', 'LIVEKIT_URL')}
+    os.environ.update(LIVEKIT_API_KEY='test-key', LIVEKIT_API_SECRET=SECRET, LIVEKIT_URL='wss://test.livekit.cloud')
+    try:
+        return asyncio.run(scenario())
+    finally:
+        for key, value in saved.items():
+            if value is None:
+                os.environ.pop(key, None)
+            else:
+                os.environ[key] = value
+
+
+async def _client():
+    client = TestClient(TestServer(create_app()))
+    await client.start_server()
+    return client
+
+
+def test_generate_token():
+    """GET and POST return a LiveKit token for the requested room"""
+    print("🔍 Testing /generate-token...")
+
+    async def scenario():
+        client = await _client()
+        try:
+            got = await client.get('/generate-token', params={'roomName': 'portfolio-voice-1', 'participantName': 'ada'})
+            posted = await client.post('/generate-token', json={'roomName': 'portfolio-voice-2'})
+            preflight = await client.options('/generate-token')
+            return (got.status, await got.json(), got.headers['Access-Control-Allow-Origin'],
+                    posted.status, await posted.json(), preflight.headers['Access-Control-Allow-Methods'])
+        finally:
+            await client.close()
+
+    status, body, origin, post_status, post_body, methods = _with_credentials(scenario)
+    assert status == 200 and origin == '*'
+    claims = jwt.decode(body['token'], SECRET, algorithms=['HS256'])
+    assert claims['iss'] == 'test-key' and claims['sub'] == 'ada'
+    assert claims['video'] == {'roomJoin': True, 'room': 'portfolio-voice-1', 'canPublish': True,
+                               'canSubscribe': True, 'canPublishData': True}
+    assert body['livekitUrl'] == 'wss://test.livekit.cloud' and body['hasLivekitUrl']
+    assert post_status == 200 and post_body['roomName'] == 'portfolio-voice-2'
+    assert post_body['participantName'].startswith('User-')
+    assert methods == 'GET, POST, OPTIONS'
+    print("✅ Tokens issued over GET and POST")
+
+
+def _signed(body, secret=SECRET):
+    sha = base64.b64encode(hashlib.sha256(body).digest()).decode()
+    return {'Authorization': jwt.encode({'iss': 'test-key', 'sha256': sha}, secret, algorithm='HS256')}
+
+
+def test_health_and_webhook():
+    """Health answers, signed webhooks are acknowledged and bad ones rejected"""
+    print("\n🔍 Testing health and webhook routes...")
+    event = json.dumps({'id': 'EV_1', 'event': 'room_started', 'room': {'name': 'portfolio-voice-1'}}).encode()
+
+    async def scenario():
+        client = await _client()
+        try:
+            health = await client.get('/')
+            ok = await client.post('/webhook', data=event, headers=_signed(event))
+            retry = await client.post('/webhook', data=event, headers=_signed(event))
+            unsigned = await client.post('/webhook', data=event)
+            forged = await client.post('/webhook', data=event, headers=_signed(event, 'wrong-secret-wrong-secret-wrong-secret'))
+            tampered = await client.post('/webhook', data=event + b' ', headers=_signed(event))
+            bad = await client.post('/webhook', data=b'not json', headers=_signed(b'not json'))
+            pipeline = client.app[WEBHOOK_PIPELINE]
+            return (health.status, await health.text(), ok.status, await ok.json(), await retry.json(),
+                    [unsigned.status, forged.status, tampered.status, bad.status], pipeline)
+        finally:
+            await client.close()
+
+    health, text, ok, body, retry, rejected, pipeline = _with_credentials(scenario)
+    assert (health, ok) == (200, 200) and 'running' in text
+    assert body['queued'] and not retry['queued']
+    assert rejected == [401, 401, 401, 400]
+    # Cleanup drained the queue through the batch worker
+    assert pipeline.stats()['processed'] == 1 and pipeline.stats()['duplicates'] == 1
+    print(f"✅ Health and webhook routes, pipeline {pipeline.stats()}")
+
+
+def test_pipelined_requests():
+    """Two requests written back to back on one connection are both answered in order"""
+    print("\n🔍 Testing HTTP/1.1 pipelining...")
+
+    async def scenario():
+        client = await _client()
+        try:
+            reader, writer = await asyncio.open_connection(client.host, client.port)
+            request = f'GET /health HTTP/1.1\r\nHost: {client.host}\r\n\r\n'.encode()
+            writer.write(request * 2)
+            await writer.drain()
+            data = b''
+            while data.count(b'HTTP/1.1 200') < 2:
+                data += await asyncio.wait_for(reader.read(4096), 5)
+            writer.close()
+            return data
+        finally:
+            await client.close()
+
+    data = _with_credentials(scenario)
+    assert data.count(b'Voice AI Agent is running') == 2
+    print("✅ Both pipelined requests answered")
+
+
+if __name__ == "__main__":
+    test_generate_token()
+    test_health_and_webhook()
+    test_pipelined_requests()
@@ -0,0 +1,181 @@
+#!/usr/bin/env python3
+"""
+Test script to verify repeated utterances are served from the TTS audio cache
+"""
+
+import asyncio
+import os
+import tempfile
+
+from livekit.agents import tts
+
+from tts_cache import CachedTTS, TTSAudioCache, normalize_text
+
+
+class _CountingTTS(tts.TTS):
+    """Local TTS that emits 100 ms of PCM per character and counts synthesis calls"""
+
+    def __init__(self):
+        super().__init__(capabilities=tts.TTSCapabilities(streaming=False), sample_rate=24000, num_channels=1)
+        self.calls = 0
+
+    def synthesize(self, text, *, conn_options=tts.tts.DEFAULT_API_CONNECT_OPTIONS):
+        self.calls += 1
+        return _CountingStream(tts=self, input_text=text, conn_options=conn_options)
+
+
+class _CountingStream(tts.ChunkedStream):
+    async def _run(self, output_emitter):
+        output_emitter.initialize(request_id="test", sample_rate=24000, num_channels=1, mime_type="audio/pcm")
+        output_emitter.push(b'\x01\x00' * 2400 * len(self.input_text))
+
+
+class _StreamingTTS(_CountingTTS):
+    """Local streaming TTS: 100 ms of PCM per character, recording the text it streams"""
+
+    def __init__(self):
+        super().__init__()
+        self._capabilities = tts.TTSCapabilities(streaming=True)
+        self.streamed = []
+
+    def stream(self, *, conn_options=tts.tts.DEFAULT_API_CONNECT_OPTIONS):
+        return _StreamingStream(tts=self, conn_options=conn_options)
+
+
+class _StreamingStream(tts.SynthesizeStream):
+    async def _run(self, output_emitter):
+        output_emitter.initialize(request_id="test", sample_rate=24000, num_channels=1,
+                                  mime_type="audio/pcm", stream=True)
+        output_emitter.start_segment(segment_id="test")
+        async for data in self._input_ch:
+            if isinstance(data, str):
+                self._tts.streamed.append(data)
+                output_emitter.push(b'\x01\x00' * 2400 * len(data))
+        output_emitter.end_segment()
+
+
+def test_normalize_text():
+    """Whitespace differences map to the same utterance"""
+    print("🔍 Testing text normalisation...")
+    assert normalize_text("  Here are some\n available times:  ") == "Here are some available times:"
+    print("✅ Whitespace collapsed")
+
+
+def test_repeat_served_from_memory_then_disk():
+    """Second request hits memory, a fresh process hits disk, neither calls the provider"""
+    print("\n🔍 Testing TTS cache tiers...")
+    phrases = ("Hello there.",)
+
+    async def scenario(directory):
+        inner = _CountingTTS()
+        cached = CachedTTS(inner, voice="voice-a", cache=TTSAudioCache(directory, phrases=phrases))
+        first = await cached.synthesize("Hello there.").collect()
+        second = await cached.synthesize("Hello  there. ").collect()
+        memory_stats = cached.cache.stats()
+
+        restarted = CachedTTS(inner, voice="voice-a", cache=TTSAudioCache(directory, phrases=phrases))
+        third = await restarted.synthesize("Hello there.").collect()
+
+        other_voice = CachedTTS(inner, voice="voice-b", cache=TTSAudioCache(directory, phrases=phrases))
+        await other_voice.synthesize("Hello there.").collect()
+        return inner.calls, [first, second, third], memory_stats, restarted.cache.stats()
+
+    with tempfile.TemporaryDirectory() as directory:
+        calls, frames, memory_stats, disk_stats = asyncio.run(scenario(directory))
+
+    print(f"Memory stats: {memory_stats}, disk stats: {disk_stats}")
+    assert all(frame.data.tobytes() == frames[0].data.tobytes() for frame in frames)
+    assert memory_stats['hits'] == 1 and memory_stats['misses'] == 1
+    assert disk_stats['disk_hits'] == 1
+    # One synthesis for voice-a, one for voice-b
+    assert calls == 2
+    print("✅ Cached audio replayed without synthesis")
+
+
+def test_memory_tier_is_bounded():
+    """Least recently used entries leave memory first"""
+    print("\n🔍 Testing TTS cache memory LRU...")
+
+    async def scenario(cache):
+        for name in ('a', 'b', 'c'):
+            await cache.put(cache.key(name, 'v', 'm', 24000), b'\x00' * 100, 24000)
+        assert cache.stats()['memory_entries'] == 2 and cache.stats()['evictions'] == 1
+        # The evicted entry is still on disk
+        assert await cache.get(cache.key('a', 'v', 'm', 24000)) is not None
+
+    with tempfile.TemporaryDirectory() as directory:
+        cache = TTSAudioCache(directory, memory_bytes=250)
+        asyncio.run(scenario(cache))
+        assert cache.stats()['disk_hits'] == 1
+        assert cache.key('x' * 500, 'v', 'm', 24000) is None
+    print("✅ Memory tier evicts to disk, long sentences are not cached")
+
+
+def test_one_off_sentences_stay_off_disk():
+    """Only fixed phrases and sentences heard min_repeats times are written to disk"""
+    print("\n🔍 Testing TTS cache disk admission...")
+
+    def wav_files(directory):
+        return [name for _, _, files in os.walk(directory) for name in files if name.endswith('.wav')]
+
+    async def speak(directory, text, times):
+        for _ in range(times):
+            # A new cache per call, as each room runs in its own job process
+            cached = CachedTTS(_CountingTTS(), voice="v", cache=TTSAudioCache(directory, min_repeats=3))
+            await cached.synthesize(text).collect()
+            await cached.synthesize(text).collect()
+            assert cached.cache.stats()['hits'] == 1
+
+    with tempfile.TemporaryDirectory() as directory:
+        asyncio.run(speak(directory, "I have your name as Jane Doe.", 1))
+        asyncio.run(speak(directory, "Your email is jane at gmail dot com.", 5))
+        # Read-backs as they reach the TTS once cleaned for voice
+        asyncio.run(speak(directory, "Your email is janeatgmail.com.", 5))
+        asyncio.run(speak(directory, "So that's jane at gmail.com, right?", 5))
+        assert wav_files(directory) == []
+        asyncio.run(speak(directory, "Does that help?", 1))
+        assert len(wav_files(directory)) == 1
+        asyncio.run(speak(directory, "Let me check that for you.", 2))
+        assert len(wav_files(directory)) == 1
+        asyncio.run(speak(directory, "Let me check that for you.", 1))
+        assert len(wav_files(directory)) == 2
+        # Sightings are counted by hash; the text itself is only in the audio files
+        for root, _, files in os.walk(directory):
+            assert all('Jane' not in name for name in files)
+    print("✅ Fixed phrases and repeated sentences cached, one-off sentences kept in memory only")
+
+
+def test_streaming_misses_use_inner_stream():
+    """Cached sentences are replayed, the others stream from the inner TTS"""
+    print("\n🔍 Testing streaming through the TTS cache...")
+
+    async def scenario(directory):
+        inner = _StreamingTTS()
+        cached = CachedTTS(inner, voice="v", cache=TTSAudioCache(directory, phrases=("Does that help?",)))
+        assert cached.capabilities.streaming
+        await cached.cache.put(cached.cache.key("Does that help?", "v", cached.model, 24000),
+                               b'\x02\x00' * 240, 24000)
+        stream = cached.stream()
+        for delta in ("The project uses ", "React and Node. ", "Does that ", "help?"):
+            stream.push_text(delta)
+        stream.end_input()
+        pcm = b''.join([audio.frame.data.tobytes() async for audio in stream])
+        await stream.aclose()
+        return inner.streamed, pcm, cached.cache.stats()
+
+    with tempfile.TemporaryDirectory() as directory:
+        streamed, pcm, stats = asyncio.run(scenario(directory))
+
+    print(f"Streamed {streamed}, cache stats: {stats}")
+    assert streamed == ["The project uses React and Node."]
+    assert b'\x02\x00' * 240 in pcm
+    assert stats['hits'] == 1 and stats['misses'] == 1
+    print("✅ One sentence streamed, the cached one replayed")
+
+
+if __name__ == "__main__":
+    test_normalize_text()
+    test_repeat_served_from_memory_then_disk()
+    test_memory_tier_is_bounded()
+    test_one_off_sentences_stay_off_disk()
+    test_streaming_misses_use_inner_stream()
@@ -0,0 +1,100 @@
+#!/usr/bin/env python3
+"""
+Test script to verify voice text cleaning, including streaming deltas
+"""
+
+import asyncio
+
+from bench_voice_text import legacy_clean_text_for_voice
+from voice_text import VoiceTextStream, clean_reply_for_voice, clean_text_for_voice, clean_text_stream
+
+CORPUS = [
+    "**FlashPoint QR** is one of my *favorite* projects!",
+    "## Tech stack\n- Next.js & React\n- `TypeScript` with [MongoDB](https://mongodb.com)",
+    "Here's the code:\n```python\nprint('hi')\n```\nPretty simple, right?",
+    "Email me at hello@example.com, I'd love to chat.",
+    "__Clinical Assistant__ uses _voice-to-text_ transcription.",
+    "...   Sure thing!   ",
+    "A [link with **bold**](http://example.com) inside",
+    "Stray ** markers ** and {braces} (parens) ~tilde~",
+]
+
+
+# Live replies: intonation punctuation and addresses read back to the caller
+REPLIES = {
+    "Would Thursday at 10 AM work for you?": "Would Thursday at 10 AM work for you?",
+    "I have your email as jane_doe@gmail.com. Is that right?":
+        "I have your email as jane underscore doe at gmail.com. Is that right?",
+    "Booked for john@x.com.": "Booked for john at x.com.",
+    "**Great** question!": "Great question!",
+}
+
+
+def _chunks(text, size):
+    return [text[i:i + size] for i in range(0, len(text), size)]
+
+
+def test_matches_legacy_output():
+    """Single-pass cleaner produces the same speech text as the original function"""
+    print("🔍 Testing clean_text_for_voice against the original implementation...")
+    for text in CORPUS:
+        assert clean_text_for_voice(text) == legacy_clean_text_for_voice(text), text
+    print(f"✅ {len(CORPUS)} samples match")
+
+
+def test_streaming_split_markers():
+    """Markdown markers split across deltas are cleaned exactly like the full text"""
+    print("\n🔍 Testing streaming cleaner with split markers...")
+    for text in CORPUS + list(REPLIES):
+        expected = clean_reply_for_voice(text)
+        for size in (1, 2, 3, 5, 8):
+            stream = VoiceTextStream()
+            out = ''.join(stream.push(chunk) for chunk in _chunks(text, size)) + stream.flush()
+            assert out == expected, (text, size, out)
+    print("✅ Streaming output matches for every chunk size")
+
+
+def test_streaming_emits_early():
+    """Plain words are released before the reply is complete"""
+    print("\n🔍 Testing streaming latency...")
+    stream = VoiceTextStream()
+    assert stream.push("Sure, **Flash") == "Sure, Flash"
+    assert stream.push("Point** is great") == "Point is great"
+    assert stream.push(". [docs](http://x") == ""
+    assert stream.push(".com) here.") == ". docs here"
+    assert stream.flush() == "."
+    print("✅ Text is emitted as soon as it is unambiguous")
+
+
+def test_async_stream():
+    """clean_text_stream wraps an async iterator of LLM deltas"""
+    print("\n🔍 Testing async stream wrapper...")
+
+    async def deltas():
+        for chunk in ["**Hi", "** there", " `you`", "!"]:
+            yield chunk
+
+    async def collect():
+        return [piece async for piece in clean_text_stream(deltas())]
+
+    pieces = asyncio.run(collect())
+    assert ''.join(pieces) == "Hi there you!"
+    print(f"✅ Streamed pieces: {pieces}")
+
+
+def test_reply_keeps_punctuation_and_addresses():
+    """Streamed replies keep their closing '?' and read addresses out in full"""
+    print("\n🔍 Testing live reply cleaning...")
+    for text, expected in REPLIES.items():
+        assert clean_reply_for_voice(text) == expected, text
+    # The portfolio text keeps the original cleaning
+    assert clean_text_for_voice("Is that right?") == "Is that right"
+    print(f"✅ {len(REPLIES)} replies spoken as written")
+
+
+if __name__ == "__main__":
+    test_matches_legacy_output()
+    test_streaming_split_markers()
+    test_streaming_emits_early()
+    test_async_stream()
+    test_reply_keeps_punctuation_and_addresses()
@@ -0,0 +1,104 @@
+#!/usr/bin/env python3
+"""
+Test script to verify webhook events are queued, deduplicated and processed in batches
+"""
+
+import asyncio
+
+from webhook_pipeline import WebhookPipeline
+
+
+class RecordingHandler:
+    """Batch handler that records what it was given, optionally blocking until released"""
+
+    def __init__(self, blocked=False):
+        self.batches = []
+        self.release = asyncio.Event()
+        if not blocked:
+            self.release.set()
+
+    async def __call__(self, batch):
+        await self.release.wait()
+        self.batches.append([event['id'] for event in batch])
+
+
+def _event(i):
+    return {'id': f'EV_{i}', 'event': 'participant_joined', 'room': {'name': 'portfolio-voice-1'}}
+
+
+def test_batches_and_dedupe():
+    """A burst is handled in batches and a retried event id is processed once"""
+    print("🔍 Testing batching and dedupe...")
+
+    async def scenario():
+        handler = RecordingHandler()
+        pipeline = WebhookPipeline(handler, maxsize=100, batch_size=4, batch_interval=0.01)
+        pipeline.start()
+        statuses = [await pipeline.offer(_event(i)) for i in range(10)]
+        statuses.append(await pipeline.offer(_event(3)))
+        await pipeline.stop()
+        late = await pipeline.offer(_event(11))
+        return handler, pipeline, statuses, late
+
+    handler, pipeline, statuses, late = asyncio.run(scenario())
+    assert statuses == ['accepted'] * 10 + ['duplicate']
+    assert late == 'closed'
+    assert [event for batch in handler.batches for event in batch] == [f'EV_{i}' for i in range(10)]
+    assert all(len(batch) <= 4 for batch in handler.batches) and len(handler.batches) == 3
+    assert pipeline.stats()['processed'] == 10 and pipeline.stats()['duplicates'] == 1
+    print(f"✅ {len(handler.batches)} batches, stats {pipeline.stats()}")
+
+
+def test_drop_oldest_under_backpressure():
+    """A full queue waits briefly, then drops the oldest event and counts it"""
+    print("\n🔍 Testing drop-oldest backpressure...")
+
+    async def scenario():
+        handler = RecordingHandler(blocked=True)
+        pipeline = WebhookPipeline(handler, maxsize=3, batch_size=1, batch_interval=0, enqueue_timeout=0.01)
+        pipeline.start()
+        await pipeline.offer(_event(0))
+        await asyncio.sleep(0.01)  # worker holds EV_0 while the handler is blocked
+        statuses = [await pipeline.offer(_event(i)) for i in range(1, 6)]
+        # The retry of a dropped event is let through again
+        retried = await pipeline.offer(_event(1))
+        handler.release.set()
+        await pipeline.stop()
+        return handler, pipeline, statuses, retried
+
+    handler, pipeline, statuses, retried = asyncio.run(scenario())
+    assert statuses == ['accepted'] * 5 and retried == 'accepted'
+    assert pipeline.stats()['dropped'] == 3
+    assert [batch[0] for batch in handler.batches] == ['EV_0', 'EV_4', 'EV_5', 'EV_1']
+    print(f"✅ Oldest events dropped, stats {pipeline.stats()}")
+
+
+def test_failed_batch_does_not_stop_worker():
+    """A handler error is counted and later events are still processed"""
+    print("\n🔍 Testing handler failures...")
+
+    async def scenario():
+        seen = []
+
+        async def flaky(batch):
+            if batch[0]['id'] == 'EV_0':
+                raise RuntimeError('boom')
+            seen.extend(event['id'] for event in batch)
+
+        pipeline = WebhookPipeline(flaky, batch_size=1, batch_interval=0)
+        pipeline.start()
+        await pipeline.offer(_event(0))
+        await asyncio.sleep(0.01)
+        await pipeline.offer(_event(1))
+        await pipeline.stop()
+        return pipeline, seen
+
+    pipeline, seen = asyncio.run(scenario())
+    assert seen == ['EV_1'] and pipeline.stats()['failed_batches'] == 1
+    print("✅ Worker survives handler errors")
+
+
+if __name__ == "__main__":
+    test_batches_and_dedupe()
+    test_drop_oldest_under_backpressure()
+    test_failed_batch_does_not_stop_worker()
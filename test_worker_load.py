@@ -0,0 +1,83 @@
+#!/usr/bin/env python3
+"""
+Test script to verify the worker load report and the admission simulation
+"""
+
+import asyncio
+import os
+import tempfile
+import time
+
+import simulate_worker_load
+from worker_load import LoopLagProbe, WorkerLoad, read_loop_lag, report_load, score
+
+
+class FakeWorker:
+    def __init__(self, jobs):
+        self.active_jobs = [object()] * jobs
+
+
+def test_score_takes_most_saturated_signal():
+    """Any one saturated signal marks the worker loaded"""
+    print("🔍 Testing load score...")
+    assert score(0.2, 0.01, 500, 1, max_loop_lag=0.1, memory_budget_mb=2000, max_sessions=5) == 0.25
+    assert score(0.9, 0.01, 500, 1, 0.1, 2000, 5) == 0.9
+    assert abs(score(0.2, 0.08, 500, 1, 0.1, 2000, 5) - 0.8) < 1e-9
+    assert score(0.2, 0.01, 1800, 1, 0.1, 2000, 5) == 0.9
+    assert score(0.2, 0.01, 500, 4, 0.1, 2000, 5) == 0.8
+    assert score(0.2, 0.5, 9000, 40, 0.1, 2000, 5) == 1.0
+    # A zero limit switches that signal off
+    assert score(0.2, 0.01, 9000, 40, 0.1, 0, 0) == 0.2
+    print("✅ Load is the worst of CPU, lag, memory and sessions")
+
+
+def test_loop_lag_probe_publishes_to_worker():
+    """A job's blocked event loop shows up in the worker's reading, and goes away when it stops"""
+    print("\n🔍 Testing loop lag probe...")
+    directory = tempfile.mkdtemp()
+
+    async def scenario():
+        probe = LoopLagProbe(directory, interval=0.02)
+        probe.start()
+        await asyncio.sleep(0.05)
+        time.sleep(0.15)  # block the loop, as a CPU-bound callback would
+        await asyncio.sleep(0.05)
+        seen = read_loop_lag([os.getpid()], directory)
+        await probe.stop()
+        return probe.lag, seen, os.path.exists(probe.path)
+
+    lag, seen, still_there = asyncio.run(scenario())
+    assert lag >= 0.1 and seen >= 0.1
+    assert not still_there and read_loop_lag([os.getpid()], directory) == 0.0
+    print(f"✅ Lag {lag * 1000:.0f} ms published and cleared")
+
+
+def test_worker_load_sample():
+    """Sessions and RSS of the worker process tree feed the load"""
+    print("\n🔍 Testing worker load sample...")
+    load = WorkerLoad(max_sessions=5, memory_budget_mb=1e9, lag_dir=tempfile.mkdtemp())
+    sample = load.sample(sessions=4)
+    assert sample.rss_mb > 0 and sample.sessions == 4 and sample.load >= 0.8
+    assert WorkerLoad(max_sessions=5, memory_budget_mb=1, lag_dir=tempfile.mkdtemp()).sample(0).load == 1.0
+    assert 0.0 <= report_load(FakeWorker(1)) <= 1.0 and 0.0 <= report_load() <= 1.0
+    print(f"✅ Sample {load.stats()}")
+
+
+def test_simulated_admission():
+    """In the replayed arrivals, the combined load starves fewer sessions than CPU alone"""
+    print("\n🔍 Testing admission simulation...")
+    accept_all = simulate_worker_load.simulate(simulate_worker_load.accept_all, 1.0)
+    cpu_only = simulate_worker_load.simulate(simulate_worker_load.cpu_only, 0.7)
+    combined = simulate_worker_load.simulate(simulate_worker_load.combined, 0.75)
+    assert accept_all['unanswered'] == 0 and accept_all['degraded_share'] > 0.5
+    assert combined['degraded_session_s'] < cpu_only['degraded_session_s']
+    assert combined['peak_sessions'] <= 5
+    print(f"✅ Degraded session time: accept-all {accept_all['degraded_session_s']}s, "
+          f"cpu-only {cpu_only['degraded_session_s']}s, worker_load {combined['degraded_session_s']}s")
+
+
+if __name__ == "__main__":
+    test_score_takes_most_saturated_signal()
+    test_loop_lag_probe_publishes_to_worker()
+    test_worker_load_sample()
+    test_simulated_admission()
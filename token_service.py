@@ -0,0 +1,244 @@
+#!/usr/bin/env python3
+"""
+Async HTTP service for the frontend: LiveKit token generation, health checks and webhooks.
+
+Served by aiohttp from an event loop, so slow clients do not hold a thread each.
+Connections are kept alive between requests and HTTP/1.1 pipelined requests on
+one connection are answered in order. Set TOKEN_SERVICE_WORKERS to run several
+processes sharing the port (SO_REUSEPORT, Linux). Webhooks are verified and
+acknowledged at once, then logged in batches by a background worker.
+
+    python token_service.py
+"""
+
+import base64
+import hashlib
+import hmac
+import json
+import logging
+import multiprocessing
+import os
+import time
+from typing import Optional
+
+import jwt
+from aiohttp import web
+
+from structured_logging import setup_logging
+from token_minter import TokenMinter
+from webhook_pipeline import WebhookPipeline
+
+logger = logging.getLogger(__name__)
+
+
+TOKEN_SERVICE_WORKERS = int(os.getenv('TOKEN_SERVICE_WORKERS', '1'))
+TOKEN_SERVICE_KEEPALIVE = float(os.getenv('TOKEN_SERVICE_KEEPALIVE', '75'))
+WEBHOOK_VERIFY = os.getenv('WEBHOOK_VERIFY', 'true').lower() == 'true'
+
+WEBHOOK_PIPELINE = web.AppKey('webhook_pipeline', WebhookPipeline)
+
+CORS_HEADERS = {
+    'Access-Control-Allow-Origin': '*',
+    'Access-Control-Allow-Headers': 'Content-Type',
+}
+
+
+# Built from the LiveKit credentials on first use, then shared by every request in this process
+_token_minter: Optional[TokenMinter] = None
+
+
+def token_minter() -> TokenMinter:
+    global _token_minter
+    if _token_minter is None:
+        _token_minter = TokenMinter.from_env()
+    return _token_minter
+
+
+def generate_livekit_token(room_name, participant_name):
+    """Generate a LiveKit JWT token for frontend connections"""
+    return token_minter().mint(room_name, participant_name)
+
+
+def verify_webhook(body, auth_header):
+    """Verify webhook signature from LiveKit"""
+    api_key = os.environ.get('LIVEKIT_API_KEY')
+    api_secret = os.environ.get('LIVEKIT_API_SECRET')
+    if not auth_header or not api_secret:
+        return False
+
+    # LiveKit sends JWT token directly without "Bearer " prefix
+    token = auth_header[7:] if auth_header.startswith('Bearer ') else auth_header
+    try:
+        decoded = jwt.decode(token, api_secret, algorithms=['HS256'], issuer=api_key)
+    except jwt.InvalidTokenError as e:
+        logger.warning("Webhook JWT verification failed: %s", e)
+        return False
+
+    # LiveKit signs the base64 SHA-256 of the body; older tokens carried it hex-encoded as 'sha'
+    digest = hashlib.sha256(body).digest()
+    if 'sha256' in decoded:
+        return hmac.compare_digest(str(decoded['sha256']), base64.b64encode(digest).decode())
+    if 'sha' in decoded:
+        return hmac.compare_digest(str(decoded['sha']), digest.hex())
+    return True
+
+
+async def log_webhook_events(events):
+    """Log a batch of LiveKit webhook events; the agent uses automatic dispatch to join rooms"""
+    summary = []
+    for event in events:
+        room = event.get('room') or {}
+        participant = event.get('participant') or {}
+        summary.append({'event': event.get('event'), 'room': room.get('name'), 'participant': participant.get('identity')})
+    logger.info("Received %d webhook event(s)", len(events), extra={'events': summary})
+
+
+async def health(request):
+    """Health check endpoint"""
+    return web.Response(text='Voice AI Agent is running')
+
+
+async def generate_token(request):
+    """Generate LiveKit token for frontend connections"""
+
+    # Handle CORS preflight
+    if request.method == 'OPTIONS':
+        return web.Response(headers={**CORS_HEADERS, 'Access-Control-Allow-Methods': 'GET, POST, OPTIONS'})
+
+    try:
+        # Handle both GET and POST requests
+        if request.method == 'GET':
+            data = request.query
+        else:  # POST
+            try:
+                data = await request.json() or {}
+            except json.JSONDecodeError:
+                data = {}
+        room_name = data.get('roomName', 'voice-consultation')
+        participant_name = data.get('participantName', f'User-{int(time.time())}')
+
+        token = generate_livekit_token(room_name, participant_name)
+
+        livekit_url = os.environ.get('LIVEKIT_URL')
+
+        return web.json_response({
+            'token': token,
+            'roomName': room_name,
+            'participantName': participant_name,
+            'livekitUrl': livekit_url,
+            'hasToken': bool(token),
+            'hasLivekitUrl': bool(livekit_url)
+        }, headers=CORS_HEADERS)
+
+    except Exception as e:
+        return web.json_response({'error': str(e)}, status=500,
+                                 headers={'Access-Control-Allow-Origin': '*'})
+
+
+async def webhook(request):
+    """Verify a LiveKit webhook, queue it for the background worker and acknowledge at once"""
+
+    body = await request.read()
+    if WEBHOOK_VERIFY and not verify_webhook(body, request.headers.get('Authorization')):
+        return web.json_response({'error': 'Invalid webhook signature'}, status=401)
+
+    try:
+        event_data = json.loads(body.decode('utf-8'))
+    except (json.JSONDecodeError, UnicodeDecodeError) as e:
+        logger.warning("Webhook JSON decode error: %s", e)
+        return web.json_response({'error': 'Invalid JSON'}, status=400)
+    if not isinstance(event_data, dict):
+        return web.json_response({'error': 'Invalid JSON'}, status=400)
+
+    status = await request.app[WEBHOOK_PIPELINE].offer(event_data)
+    if status == 'closed':
+        # Shutting down: LiveKit retries the delivery
+        return web.json_response({'error': 'Shutting down'}, status=503)
+    return web.json_response({'status': 'ok', 'queued': status == 'accepted'})
+
+
+async def debug_webhook(request):
+    """Debug webhook without verification to understand LiveKit's format"""
+    try:
+        body = await request.read()
+        auth_header = request.headers.get('Authorization', '')
+        details = {
+            'content_type': request.content_type,
+            'content_length': len(body),
+            'authorization': f"{auth_header[:30]}... (truncated)",
+            'event_data': json.loads(body.decode('utf-8')),
+        }
+
+        # Analyze JWT token
+        if auth_header:
+            token = auth_header[7:] if auth_header.startswith('Bearer ') else auth_header
+            details['jwt_payload'] = jwt.decode(token, options={"verify_signature": False})
+            try:
+                jwt.decode(token, os.getenv('LIVEKIT_API_SECRET'), algorithms=['HS256'])
+                details['jwt_verified'] = True
+            except jwt.InvalidTokenError as e:
+                details['jwt_verified'] = False
+                details['jwt_error'] = str(e)
+
+        logger.info("Webhook debug request", extra=details)
+        return web.json_response({"status": "debug_ok"})
+
+    except Exception as e:
+        logger.error("Debug webhook error: %s", e)
+        return web.json_response({"error": str(e)}, status=500)
+
+
+def create_app() -> web.Application:
+    """The token/health/webhook application"""
+    app = web.Application()
+    app.router.add_get('/', health)
+    app.router.add_get('/health', health)
+    app.router.add_route('GET', '/generate-token', generate_token)
+    app.router.add_route('POST', '/generate-token', generate_token)
+    app.router.add_route('OPTIONS', '/generate-token', generate_token)
+    app.router.add_post('/webhook', webhook)
+    app.router.add_post('/debug-webhook', debug_webhook)
+
+    app[WEBHOOK_PIPELINE] = WebhookPipeline(log_webhook_events)
+    app.on_startup.append(_start_webhook_pipeline)
+    app.on_cleanup.append(_stop_webhook_pipeline)
+    return app
+
+
+async def _start_webhook_pipeline(app):
+    app[WEBHOOK_PIPELINE].start()
+
+
+async def _stop_webhook_pipeline(app):
+    await app[WEBHOOK_PIPELINE].stop()
+
+
+def _serve(host: str, port: int, reuse_port: bool):
+    # Each worker process drains its own log queue
+    setup_logging()
+    web.run_app(
+        create_app(),
+        host=host,
+        port=port,
+        reuse_port=reuse_port,
+        keepalive_timeout=TOKEN_SERVICE_KEEPALIVE,
+        print=None,
+    )
+
+
+def run(host: str = '0.0.0.0', port: int = None, workers: int = None):
+    """Serve until interrupted; with several workers each process accepts on the shared port"""
+    port = port or int(os.environ.get('PORT', 8080))
+    workers = max(1, workers or TOKEN_SERVICE_WORKERS)
+    setup_logging()
+    logger.info("Token service listening on %s:%d with %d worker(s), keep-alive %.0fs",
+                host, port, workers, TOKEN_SERVICE_KEEPALIVE)
+
+    # Extra workers die with this process
+    for _ in range(workers - 1):
+        multiprocessing.Process(target=_serve, args=(host, port, True), daemon=True).start()
+    _serve(host, port, workers > 1)
+
+
+if __name__ == '__main__':
+    run()
@@ -0,0 +1,396 @@
+import asyncio
+import hashlib
+import logging
+import os
+import re
+import threading
+import time
+import unicodedata
+from collections import OrderedDict
+from dataclasses import replace
+from typing import Dict, Optional, Tuple
+
+from livekit.agents import tokenize, tts, utils
+from livekit.agents.types import DEFAULT_API_CONNECT_OPTIONS, APIConnectOptions
+
+from filler_audio import read_wav, write_wav
+
+logger = logging.getLogger(__name__)
+
+
+# Shares the persistent volume with the filler clips so entries survive redeploys
+TTS_CACHE_DIR = os.getenv(
+    'TTS_CACHE_DIR',
+    '/data/tts-cache' if os.path.isdir('/data') else os.path.join(os.path.dirname(os.path.abspath(__file__)), 'tts-cache'),
+)
+
+_WHITESPACE = re.compile(r'\s+')
+# Email addresses are never written to disk, however often they are repeated. The text has
+# already been cleaned for voice by then, so "jane@gmail.com" may arrive as "jane at gmail.com"
+_ADDRESS = re.compile(
+    r'@|\bdot\s+(?:com|net|org|io|me|co)\b|\w\.(?:com|net|org|io|me|co|uk|dev|ai|edu)\b'
+    r'|\bat\s+(?:gmail|googlemail|yahoo|hotmail|outlook|icloud|aol|proton(?:mail)?|live)\b',
+    re.IGNORECASE,
+)
+
+# Fixed sentences the agent is told to use or that the tools return word for word;
+# these are written to disk on first use. Anything else only after TTS_CACHE_MIN_REPEATS.
+CACHED_PHRASES = (
+    "Great question!",
+    "Oh, that's a great question!",
+    "Does that help?",
+    "What else would you like to know?",
+    "Any other questions about that?",
+    "I'd love to schedule a consultation call to discuss your project!",
+    "To book this time, I'll need your name and email address.",
+    "Can you tell me your name and email so I can send you the calendar invite?",
+    "I'm having trouble reaching my calendar right now.",
+    "Please try again in a minute, or book directly on the website.",
+    "I'm sorry, but I don't see any available slots right now.",
+    "Please check back later or visit the website to book directly.",
+    "I couldn't find anything about that in the portfolio.",
+)
+# Sightings of other sentences are counted per hash, never by text, and forgotten after this
+SEEN_TTL = 7 * 24 * 3600
+
+
+def normalize_text(text: str) -> str:
+    """Canonical form of an utterance: NFC, single spaces, no surrounding whitespace"""
+    return _WHITESPACE.sub(' ', unicodedata.normalize('NFC', text)).strip()
+
+
+class TTSAudioCache:
+    """Content-addressed PCM cache with an LRU memory tier and a disk tier
+
+    Every sentence is kept in memory for the rest of the call. Only the fixed phrases,
+    and sentences heard min_repeats times, are written to disk, so one-off sentences
+    such as the read-back of a caller's name stay off the volume. Disk I/O runs in a
+    worker thread, never on the audio event loop.
+    """
+
+    def __init__(self, directory: Optional[str] = None, memory_bytes: Optional[int] = None,
+                 disk_bytes: Optional[int] = None, max_chars: Optional[int] = None,
+                 phrases=CACHED_PHRASES, min_repeats: Optional[int] = None):
+        self.directory = directory or TTS_CACHE_DIR
+        self.memory_bytes = (memory_bytes if memory_bytes is not None
+                             else int(float(os.getenv('TTS_CACHE_MEMORY_MB', '32')) * 1024 * 1024))
+        self.disk_bytes = (disk_bytes if disk_bytes is not None
+                           else int(float(os.getenv('TTS_CACHE_DISK_MB', '256')) * 1024 * 1024))
+        # Long one-off LLM sentences are not worth keeping
+        self.max_chars = max_chars if max_chars is not None else int(os.getenv('TTS_CACHE_MAX_CHARS', '200'))
+        self.phrases = frozenset(normalize_text(phrase) for phrase in phrases)
+        # 0 writes only the fixed phrases to disk
+        self.min_repeats = (min_repeats if min_repeats is not None
+                            else int(os.getenv('TTS_CACHE_MIN_REPEATS', '3')))
+
+        self._memory: 'OrderedDict[str, Tuple[bytes, int]]' = OrderedDict()
+        self._memory_used = 0
+        self._disk_used: Optional[int] = None
+        self._disk_lock = threading.Lock()
+        self._seen_pruned = False
+
+        self.hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        self.stores = 0
+        self.evictions = 0
+
+    def key(self, text: str, voice: str, model: str, sample_rate: int) -> Optional[str]:
+        """Cache key for an utterance, or None when it should not be cached"""
+        text = normalize_text(text)
+        if not text or len(text) > self.max_chars:
+            return None
+        return hashlib.sha256(f"{model}|{voice}|{sample_rate}|{text}".encode('utf-8')).hexdigest()
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.directory, key[:2], f"{key}.wav")
+
+    async def get(self, key: str) -> Optional[Tuple[bytes, int]]:
+        """Return (pcm, sample_rate) from memory or disk"""
+        entry = self._memory.get(key)
+        if entry is not None:
+            self._memory.move_to_end(key)
+            self.hits += 1
+            return entry
+
+        entry = await asyncio.to_thread(self._read, key)
+        if entry is None:
+            self.misses += 1
+            return None
+        self.disk_hits += 1
+        self._remember(key, entry)
+        return entry
+
+    async def persistent(self, text: str, key: str) -> bool:
+        """Whether an utterance may be written to disk: a fixed phrase, or one heard often enough"""
+        text = normalize_text(text)
+        if text in self.phrases:
+            return True
+        if self.min_repeats <= 0 or _ADDRESS.search(text):
+            return False
+        return await asyncio.to_thread(self._seen, key) >= self.min_repeats
+
+    async def put(self, key: str, pcm: bytes, sample_rate: int, persist: bool = True):
+        """Store synthesised audio in memory, and on disk when persist is set"""
+        if not pcm:
+            return
+        self._remember(key, (pcm, sample_rate))
+        if persist:
+            await asyncio.to_thread(self._store, key, pcm, sample_rate)
+
+    def _read(self, key: str) -> Optional[Tuple[bytes, int]]:
+        path = self._path(key)
+        try:
+            entry = read_wav(path)
+            # Recently used files survive disk pruning
+            os.utime(path)
+        except (FileNotFoundError, EOFError, ValueError, OSError):
+            return None
+        return entry
+
+    def _store(self, key: str, pcm: bytes, sample_rate: int):
+        try:
+            write_wav(self._path(key), pcm, sample_rate)
+        except OSError as e:
+            logger.warning("Could not write TTS cache entry: %s", e)
+            return
+        with self._disk_lock:
+            self.stores += 1
+            if self._disk_used is not None:
+                self._disk_used += len(pcm)
+            self._prune_disk()
+
+    def _seen(self, key: str) -> int:
+        """Count one more sighting of key in a marker file shared by every process; returns the count"""
+        if not self._seen_pruned:
+            self._seen_pruned = True
+            self._prune_seen()
+        path = os.path.join(self.directory, 'seen', key[:2], key)
+        try:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            # One byte appended per sighting; O_APPEND keeps concurrent writers from overwriting each other
+            fd = os.open(path, os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o644)
+            try:
+                os.write(fd, b'.')
+                return os.fstat(fd).st_size
+            finally:
+                os.close(fd)
+        except OSError as e:
+            logger.warning("Could not count TTS cache sighting: %s", e)
+            return 0
+
+    def _prune_seen(self):
+        cutoff = time.time() - SEEN_TTL
+        for root, _, files in os.walk(os.path.join(self.directory, 'seen')):
+            for name in files:
+                path = os.path.join(root, name)
+                try:
+                    if os.stat(path).st_mtime < cutoff:
+                        os.remove(path)
+                except FileNotFoundError:
+                    pass
+
+    def _remember(self, key: str, entry: Tuple[bytes, int]):
+        if key in self._memory:
+            self._memory.move_to_end(key)
+            return
+        self._memory[key] = entry
+        self._memory_used += len(entry[0])
+        while self._memory_used > self.memory_bytes and len(self._memory) > 1:
+            _, (pcm, _) = self._memory.popitem(last=False)
+            self._memory_used -= len(pcm)
+            self.evictions += 1
+
+    def _disk_entries(self):
+        entries = []
+        for root, dirs, files in os.walk(self.directory):
+            if root == self.directory and 'seen' in dirs:
+                dirs.remove('seen')
+            for name in files:
+                if name.endswith('.wav'):
+                    path = os.path.join(root, name)
+                    try:
+                        stat = os.stat(path)
+                    except FileNotFoundError:
+                        continue
+                    entries.append((stat.st_mtime, stat.st_size, path))
+        return entries
+
+    def _prune_disk(self):
+        if self._disk_used is None:
+            self._disk_used = sum(size for _, size, _ in self._disk_entries())
+        if self._disk_used <= self.disk_bytes:
+            return
+        # Drop least recently used files until the tier is back under 90% of its budget
+        entries = sorted(self._disk_entries())
+        self._disk_used = sum(size for _, size, _ in entries)
+        for _, size, path in entries:
+            if self._disk_used <= self.disk_bytes * 0.9:
+                break
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
+            self._disk_used -= size
+
+    def stats(self) -> Dict:
+        return {
+            'memory_entries': len(self._memory),
+            'memory_bytes': self._memory_used,
+            'hits': self.hits,
+            'disk_hits': self.disk_hits,
+            'misses': self.misses,
+            'stores': self.stores,
+            'evictions': self.evictions,
+        }
+
+
+class CachedTTS(tts.TTS):
+    """Wraps a TTS so repeated utterances are replayed from the audio cache
+
+    LLM output is split into sentences and each one is looked up on its own. A
+    sentence that misses goes to the inner TTS over its streaming connection when it
+    has one (Cartesia's websocket), else through synthesize().
+    """
+
+    def __init__(self, inner: tts.TTS, voice: str, cache: Optional[TTSAudioCache] = None):
+        super().__init__(
+            capabilities=tts.TTSCapabilities(streaming=inner.capabilities.streaming),
+            sample_rate=inner.sample_rate,
+            num_channels=inner.num_channels,
+        )
+        self.inner = inner
+        self.voice = voice
+        self.cache = cache or tts_audio_cache
+        self._sentence_tokenizer = tokenize.basic.SentenceTokenizer()
+
+    @property
+    def model(self) -> str:
+        return self.inner.model
+
+    @property
+    def provider(self) -> str:
+        return self.inner.provider
+
+    def synthesize(
+        self, text: str, *, conn_options: APIConnectOptions = DEFAULT_API_CONNECT_OPTIONS
+    ) -> '_CachedChunkedStream':
+        return _CachedChunkedStream(tts=self, input_text=text, conn_options=conn_options)
+
+    def stream(
+        self, *, conn_options: APIConnectOptions = DEFAULT_API_CONNECT_OPTIONS
+    ) -> '_CachedSynthesizeStream':
+        if not self.inner.capabilities.streaming:
+            raise NotImplementedError("the inner TTS does not stream; the session adapts synthesize()")
+        return _CachedSynthesizeStream(tts=self, conn_options=conn_options)
+
+    async def lookup(self, text: str) -> Tuple[Optional[str], Optional[Tuple[bytes, int]]]:
+        """Cache key and cached (pcm, sample_rate) for a sentence"""
+        key = self.cache.key(text, self.voice, self.model, self.sample_rate)
+        return key, (await self.cache.get(key) if key else None)
+
+    async def remember(self, text: str, key: Optional[str], chunks):
+        """Keep freshly synthesised audio, on disk too when the sentence qualifies"""
+        if key:
+            persist = await self.cache.persistent(text, key)
+            await self.cache.put(key, b''.join(chunks), self.sample_rate, persist=persist)
+
+    def prewarm(self) -> None:
+        self.inner.prewarm()
+
+    async def aclose(self) -> None:
+        await self.inner.aclose()
+
+
+class _CachedChunkedStream(tts.ChunkedStream):
+    def __init__(self, *, tts: CachedTTS, input_text: str, conn_options: APIConnectOptions):
+        super().__init__(tts=tts, input_text=input_text, conn_options=conn_options)
+        self._cached_tts = tts
+
+    async def _run(self, output_emitter: tts.AudioEmitter) -> None:
+        cached_tts = self._cached_tts
+        key, entry = await cached_tts.lookup(self.input_text)
+
+        output_emitter.initialize(
+            request_id=utils.shortuuid(),
+            sample_rate=cached_tts.sample_rate,
+            num_channels=cached_tts.num_channels,
+            mime_type='audio/pcm',
+        )
+        if entry is not None:
+            # Cache hit: no synthesis call, the audio is available immediately
+            output_emitter.push(entry[0])
+            return
+
+        chunks = []
+        # This stream already retries, so the inner provider call does not
+        inner_options = replace(self._conn_options, max_retry=0)
+        async with cached_tts.inner.synthesize(self.input_text, conn_options=inner_options) as stream:
+            async for audio in stream:
+                data = audio.frame.data.tobytes()
+                chunks.append(data)
+                output_emitter.push(data)
+        await cached_tts.remember(self.input_text, key, chunks)
+
+
+class _CachedSynthesizeStream(tts.SynthesizeStream):
+    """Streaming session: cached sentences are pushed at once, the rest stream from the inner TTS"""
+
+    def __init__(self, *, tts: CachedTTS, conn_options: APIConnectOptions):
+        super().__init__(tts=tts, conn_options=conn_options)
+        self._cached_tts = tts
+
+    async def _run(self, output_emitter: tts.AudioEmitter) -> None:
+        cached_tts = self._cached_tts
+        sentences = cached_tts._sentence_tokenizer.stream()
+        output_emitter.initialize(
+            request_id=utils.shortuuid(),
+            sample_rate=cached_tts.sample_rate,
+            num_channels=cached_tts.num_channels,
+            mime_type='audio/pcm',
+            stream=True,
+        )
+        output_emitter.start_segment(segment_id=utils.shortuuid())
+        # This stream already retries, so the inner provider call does not
+        inner_options = replace(self._conn_options, max_retry=0)
+
+        async def forward_input():
+            async for data in self._input_ch:
+                if isinstance(data, self._FlushSentinel):
+                    sentences.flush()
+                else:
+                    sentences.push_text(data)
+            sentences.end_input()
+
+        async def synthesize():
+            async for event in sentences:
+                text = event.token.strip()
+                if not text:
+                    continue
+                self._mark_started()
+                key, entry = await cached_tts.lookup(text)
+                if entry is not None:
+                    output_emitter.push(entry[0])
+                    output_emitter.flush()
+                    continue
+                chunks = []
+                async with cached_tts.inner.stream(conn_options=inner_options) as stream:
+                    stream.push_text(text)
+                    stream.end_input()
+                    async for audio in stream:
+                        data = audio.frame.data.tobytes()
+                        chunks.append(data)
+                        output_emitter.push(data)
+                output_emitter.flush()
+                await cached_tts.remember(text, key, chunks)
+
+        tasks = [asyncio.ensure_future(forward_input()), asyncio.ensure_future(synthesize())]
+        try:
+            await asyncio.gather(*tasks)
+        finally:
+            await sentences.aclose()
+            await utils.aio.cancel_and_wait(*tasks)
+
+
+# Process-wide cache; the disk tier is shared by every process on the machine
+tts_audio_cache = TTSAudioCache()
@@ -0,0 +1,170 @@
+import re
+from typing import AsyncIterable, AsyncIterator, Callable, Dict, List, Tuple
+
+
+# Markdown symbols that are never spoken. Opening brackets and backticks are matched
+# separately so a run of symbols cannot swallow the start of a link or code span.
+_STRIP_CHARS = r'*_#~\](){}'
+# Punctuation trimmed from the very start and end of a reply
+_EDGE_CHARS = '.,;:!? '
+
+_VOICE_PATTERN = re.compile(
+    r'(?=[*_#`~\[\](){}&@]|\s\s|[^\S ])(?:'               # only stop where there is work
+    r'(?P<fence>```[^`]*```)'                            # ```code blocks``` are dropped
+    r'|(?P<link>\[([^\]]+)\]\([^)]+\))'                 # [text](url) -> text
+    r'|(?P<code>`([^`]+)`)'                              # `inline code` -> inline code
+    r'|(?P<underscore>(?<=[A-Za-z0-9])_(?=[A-Za-z0-9]))' # john_doe, not _emphasis_
+    r'|(?P<strip>[' + _STRIP_CHARS + r']+|[\[`])'        # other markdown symbols
+    r'|(?P<space>\s{2,}|[^\S ])'                         # whitespace runs -> one space
+    r'|(?P<amp>&)'
+    r'|(?P<at>@))'
+)
+# Plain replies that need nothing but trimming skip the substitution entirely
+_NEEDS_CLEANING = re.compile(r'[*_#`~\[\](){}&@]|\s\s|[^\S ]').search
+_DOUBLE_SPACE = re.compile(r' {2,}')
+
+_REPLACEMENTS = {'strip': '', 'fence': '', 'space': ' ', 'amp': 'and', 'at': 'at', 'underscore': ''}
+# Live replies may read an address back to the caller, so its '@' and '_' are spoken
+_SPOKEN_REPLACEMENTS = dict(_REPLACEMENTS, at=' at ', underscore=' underscore ')
+
+# Streaming helpers: constructs that may still be completed by a later delta
+_OPENER = re.compile(r'```|`|\[')
+_LINK = re.compile(r'\[[^\]]+\]\([^)]+\)')
+_PARTIAL_LINK = re.compile(r'\[[^\]]*(?:\](?:\([^)]*)?)?\Z')
+# Trailing characters whose meaning depends on what follows them
+_UNSETTLED_TAIL = re.compile(r'[\s*_#`~\[\](){}.,;:!?]*\Z')
+# Give up waiting for a construct to close after this many characters
+_MAX_HOLD = 256
+
+
+def _replacer(replacements: Dict[str, str]) -> Callable[[re.Match], str]:
+    def replace(match: re.Match) -> str:
+        kind = match.lastgroup
+        replacement = replacements.get(kind)
+        if replacement is not None:
+            return replacement
+        # Links and inline code keep their (cleaned) inner text
+        return _clean_fragment(match.group(match.lastindex + 1), replace)
+    return replace
+
+
+_replace = _replacer(_REPLACEMENTS)
+_replace_spoken = _replacer(_SPOKEN_REPLACEMENTS)
+
+
+def _clean_fragment(text: str, replace: Callable[[re.Match], str] = _replace) -> str:
+    """Clean a fragment without trimming its edges"""
+    if not _NEEDS_CLEANING(text):
+        return text
+    text = _VOICE_PATTERN.sub(replace, text)
+    if '  ' in text:
+        # Removed markup between two spaces leaves a double space behind
+        text = _DOUBLE_SPACE.sub(' ', text)
+    return text
+
+
+def clean_text_for_voice(text: str) -> str:
+    """Remove markdown formatting and clean text for natural speech"""
+    return _clean_fragment(text).strip(_EDGE_CHARS)
+
+
+def clean_reply_for_voice(text: str) -> str:
+    """clean_text_for_voice for a live LLM reply, as clean_text_stream produces it
+
+    The closing '?' or '.' is kept for intonation, and addresses are read out
+    with " at " and "underscore".
+    """
+    return _clean_fragment(text, _replace_spoken).lstrip(_EDGE_CHARS).rstrip()
+
+
+def _scan_constructs(text: str) -> Tuple[int, List[Tuple[int, int]]]:
+    """Find where an unclosed code span, code block or link starts (len(text) if none)
+    and the spans of the complete ones before it"""
+    pos = 0
+    spans = []
+    while True:
+        match = _OPENER.search(text, pos)
+        if match is None:
+            return len(text), spans
+        start = match.start()
+        token = match.group()
+        if token == '[':
+            link = _LINK.match(text, start)
+            if link:
+                pos = link.end()
+                spans.append((start, pos))
+            elif _PARTIAL_LINK.match(text, start):
+                return start, spans
+            else:
+                pos = start + 1
+        else:
+            end = text.find(token, start + len(token))
+            if end < 0:
+                return start, spans
+            pos = end + len(token)
+            spans.append((start, pos))
+
+
+class VoiceTextStream:
+    """Incremental clean_reply_for_voice for LLM deltas streaming toward TTS"""
+
+    def __init__(self):
+        self._buffer = ''
+        self._started = False
+        # Last letter or digit already emitted, so "john" + "_doe" is still read as john underscore doe
+        self._before = ''
+
+    def push(self, delta: str) -> str:
+        """Add a delta and return the text that is safe to speak now"""
+        self._buffer += delta
+        limit, spans = _scan_constructs(self._buffer)
+        if len(self._buffer) - limit > _MAX_HOLD:
+            # Treat an unclosed bracket or backtick as a stray symbol
+            limit = len(self._buffer)
+
+        # Stop right after the last plain character so markup split across
+        # deltas is cleaned together with the rest of it
+        cut = _UNSETTLED_TAIL.search(self._buffer, 0, limit).start()
+        for start, end in reversed(spans):
+            if end <= cut:
+                break
+            if start < cut:
+                # Never split a complete link or code span
+                cut = _UNSETTLED_TAIL.search(self._buffer, 0, start).start()
+        if cut == 0:
+            return ''
+        chunk, self._buffer = self._buffer[:cut], self._buffer[cut:]
+        return self._emit(self._clean(chunk))
+
+    def flush(self) -> str:
+        """Return whatever is left once the reply is complete and reset for the next one"""
+        chunk, self._buffer = self._buffer, ''
+        text = self._emit(self._clean(chunk).rstrip())
+        self._started = False
+        self._before = ''
+        return text
+
+    def _clean(self, chunk: str) -> str:
+        before = self._before if chunk[:1] == '_' else ''
+        # A letter or digit is never rewritten, so it can be cleaned with the chunk and cut off again
+        text = _clean_fragment(before + chunk, _replace_spoken)[len(before):]
+        self._before = chunk[-1:] if chunk[-1:].isalnum() else ''
+        return text
+
+    def _emit(self, text: str) -> str:
+        if not self._started:
+            text = text.lstrip(_EDGE_CHARS)
+            self._started = bool(text)
+        return text
+
+
+async def clean_text_stream(text: AsyncIterable[str]) -> AsyncIterator[str]:
+    """Clean an async stream of LLM text deltas as they arrive"""
+    stream = VoiceTextStream()
+    async for delta in text:
+        cleaned = stream.push(delta)
+        if cleaned:
+            yield cleaned
+    tail = stream.flush()
+    if tail:
+        yield tail
@@ -0,0 +1,149 @@
+import asyncio
+import logging
+import os
+import time
+from collections import OrderedDict
+from typing import Awaitable, Callable, Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+
+WebhookBatchHandler = Callable[[List[Dict]], Awaitable[None]]
+
+WEBHOOK_QUEUE_SIZE = int(os.getenv('WEBHOOK_QUEUE_SIZE', '1000'))
+WEBHOOK_BATCH_SIZE = int(os.getenv('WEBHOOK_BATCH_SIZE', '50'))
+WEBHOOK_BATCH_INTERVAL = float(os.getenv('WEBHOOK_BATCH_INTERVAL', '0.05'))
+WEBHOOK_ENQUEUE_TIMEOUT = float(os.getenv('WEBHOOK_ENQUEUE_TIMEOUT', '0.05'))
+WEBHOOK_DEDUPE_WINDOW = float(os.getenv('WEBHOOK_DEDUPE_WINDOW', '600'))
+WEBHOOK_DEDUPE_MAX = 10000
+
+
+class WebhookPipeline:
+    """Bounded queue between the webhook endpoint and a background batch worker
+
+    offer() returns as soon as the event is queued, so the endpoint can acknowledge
+    LiveKit straight away. When the queue is full the producer waits up to
+    enqueue_timeout for the worker to make room, then drops the oldest queued event.
+    Event ids seen within the dedupe window are not queued again, so retried
+    deliveries are processed once per process.
+    """
+
+    def __init__(self,
+                 handler: WebhookBatchHandler,
+                 maxsize: Optional[int] = None,
+                 batch_size: Optional[int] = None,
+                 batch_interval: Optional[float] = None,
+                 enqueue_timeout: Optional[float] = None,
+                 dedupe_window: Optional[float] = None):
+        self.handler = handler
+        self.maxsize = maxsize if maxsize is not None else WEBHOOK_QUEUE_SIZE
+        self.batch_size = batch_size if batch_size is not None else WEBHOOK_BATCH_SIZE
+        self.batch_interval = batch_interval if batch_interval is not None else WEBHOOK_BATCH_INTERVAL
+        self.enqueue_timeout = enqueue_timeout if enqueue_timeout is not None else WEBHOOK_ENQUEUE_TIMEOUT
+        self.dedupe_window = dedupe_window if dedupe_window is not None else WEBHOOK_DEDUPE_WINDOW
+
+        self._queue: Optional[asyncio.Queue] = None
+        self._worker: Optional[asyncio.Task] = None
+        self._seen: 'OrderedDict[str, float]' = OrderedDict()
+        self._closed = False
+
+        self.accepted = 0
+        self.duplicates = 0
+        self.dropped = 0
+        self.processed = 0
+        self.batches = 0
+        self.failed_batches = 0
+
+    def start(self):
+        """Start the batch worker on the running event loop"""
+        if self._worker is None:
+            self._queue = asyncio.Queue(self.maxsize)
+            self._closed = False
+            self._worker = asyncio.ensure_future(self._run())
+
+    async def stop(self):
+        """Process whatever is already queued, then stop the worker"""
+        if self._worker is None:
+            return
+        self._closed = True
+        # The worker stops when it reaches this marker, after everything queued before it
+        await self._queue.put(None)
+        await self._worker
+        self._worker = None
+
+    async def offer(self, event: Dict) -> str:
+        """Queue an event: 'accepted', 'duplicate' for an id already seen, or 'closed'"""
+        if self._closed or self._worker is None:
+            return 'closed'
+        event_id = event.get('id')
+        if event_id:
+            self._prune()
+            if event_id in self._seen:
+                self.duplicates += 1
+                return 'duplicate'
+            self._seen[event_id] = time.monotonic()
+
+        try:
+            self._queue.put_nowait(event)
+        except asyncio.QueueFull:
+            try:
+                # Backpressure: give the worker a moment to drain before shedding load
+                await asyncio.wait_for(self._queue.put(event), self.enqueue_timeout)
+            except asyncio.TimeoutError:
+                try:
+                    dropped = self._queue.get_nowait()
+                    self.dropped += 1
+                    # Let LiveKit's retry of the dropped event through
+                    self._seen.pop(dropped.get('id'), None)
+                except asyncio.QueueEmpty:
+                    pass
+                self._queue.put_nowait(event)
+        self.accepted += 1
+        return 'accepted'
+
+    async def _run(self):
+        while True:
+            event = await self._queue.get()
+            if event is None:
+                return
+            batch = [event]
+            # Linger briefly so a burst is handled as one batch
+            if self._queue.qsize() < self.batch_size - 1 and self.batch_interval > 0:
+                await asyncio.sleep(self.batch_interval)
+            while len(batch) < self.batch_size and not self._queue.empty():
+                event = self._queue.get_nowait()
+                if event is None:
+                    await self._handle(batch)
+                    return
+                batch.append(event)
+            await self._handle(batch)
+
+    async def _handle(self, batch: List[Dict]):
+        self.batches += 1
+        try:
+            await self.handler(batch)
+            self.processed += len(batch)
+        except Exception as e:
+            self.failed_batches += 1
+            logger.exception("Webhook batch of %d failed: %s", len(batch), e)
+
+    def _prune(self):
+        cutoff = time.monotonic() - self.dedupe_window
+        while self._seen:
+            event_id, seen_at = next(iter(self._seen.items()))
+            if seen_at >= cutoff and len(self._seen) < WEBHOOK_DEDUPE_MAX:
+                break
+            del self._seen[event_id]
+
+    def stats(self) -> Dict:
+        """Queue counters for monitoring"""
+        return {
+            'accepted': self.accepted,
+            'duplicates': self.duplicates,
+            'dropped': self.dropped,
+            'processed': self.processed,
+            'batches': self.batches,
+            'failed_batches': self.failed_batches,
+            'queued': self._queue.qsize() if self._queue else 0,
+            'remembered': len(self._seen),
+        }
@@ -0,0 +1,199 @@
+import asyncio
+import logging
+import os
+import struct
+import tempfile
+import threading
+import time
+from typing import Dict, NamedTuple, Optional
+
+import psutil
+
+logger = logging.getLogger(__name__)
+
+# LiveKit stops dispatching rooms to a worker whose load is at or above this
+WORKER_LOAD_THRESHOLD = float(os.getenv('WORKER_LOAD_THRESHOLD', '0.75'))
+# Each signal is scaled so that reaching its limit counts as a load of 1.0
+WORKER_MAX_SESSIONS = int(os.getenv('WORKER_MAX_SESSIONS', '5'))
+WORKER_MAX_LOOP_LAG = float(os.getenv('WORKER_MAX_LOOP_LAG', '0.1'))
+# RSS budget for the worker and its job processes; agent_supervisor sets one per worker
+WORKER_MEMORY_BUDGET_MB = float(os.getenv('WORKER_MEMORY_BUDGET_MB', '0'))
+
+LAG_PROBE_INTERVAL = 0.25
+LAG_WINDOW = 8  # probes; the worst lag in the last ~2s is reported
+CPU_SAMPLE_INTERVAL = 0.5
+CPU_WINDOW = 5
+
+# Job processes publish their event-loop lag here; tmpfs where there is one
+LAG_DIR = os.getenv('WORKER_LOAD_DIR') or os.path.join(
+    '/dev/shm' if os.path.isdir('/dev/shm') else tempfile.gettempdir(), 'agent-loop-lag')
+_LAG_FORMAT = struct.Struct('<dd')  # lag seconds, written at (time.time())
+LAG_STALE_AFTER = 5.0
+
+
+class LoadSample(NamedTuple):
+    cpu: float
+    loop_lag: float
+    rss_mb: float
+    sessions: int
+    load: float
+
+
+def score(cpu: float, loop_lag: float, rss_mb: float, sessions: int,
+          max_loop_lag: float = WORKER_MAX_LOOP_LAG,
+          memory_budget_mb: float = 0,
+          max_sessions: int = WORKER_MAX_SESSIONS) -> float:
+    """Worker load in [0, 1]: the most saturated of CPU, loop lag, memory and sessions"""
+    parts = [cpu, loop_lag / max_loop_lag if max_loop_lag > 0 else 0.0]
+    if memory_budget_mb > 0:
+        parts.append(rss_mb / memory_budget_mb)
+    if max_sessions > 0:
+        parts.append(sessions / max_sessions)
+    return min(1.0, max(0.0, *parts))
+
+
+class LoopLagProbe:
+    """Measures how late the running event loop wakes up, and publishes it for the worker
+
+    Started from a job's entrypoint; the worker process reads it through read_loop_lag().
+    """
+
+    def __init__(self, directory: str = LAG_DIR, interval: float = LAG_PROBE_INTERVAL):
+        self.directory = directory
+        self.interval = interval
+        self.path = os.path.join(directory, str(os.getpid()))
+        self.lags = [0.0] * LAG_WINDOW
+        self._task: Optional[asyncio.Task] = None
+        self._fd: Optional[int] = None
+
+    @property
+    def lag(self) -> float:
+        return max(self.lags)
+
+    def start(self):
+        if self._task is not None:
+            return
+        try:
+            os.makedirs(self.directory, exist_ok=True)
+            self._fd = os.open(self.path, os.O_WRONLY | os.O_CREAT, 0o644)
+        except OSError as e:
+            logger.warning("Loop lag probe cannot publish to %s: %s", self.directory, e)
+        self._task = asyncio.ensure_future(self._run())
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        if self._fd is not None:
+            os.close(self._fd)
+            self._fd = None
+            try:
+                os.unlink(self.path)
+            except OSError:
+                pass
+
+    async def _run(self):
+        index = 0
+        while True:
+            expected = time.monotonic() + self.interval
+            await asyncio.sleep(self.interval)
+            self.lags[index % LAG_WINDOW] = max(0.0, time.monotonic() - expected)
+            index += 1
+            if self._fd is not None:
+                # 16 bytes to tmpfs; one pwrite so a reader never sees half a record
+                os.pwrite(self._fd, _LAG_FORMAT.pack(self.lag, time.time()), 0)
+
+
+def read_loop_lag(pids, directory: str = LAG_DIR) -> float:
+    """Worst fresh loop lag published by any of the given processes"""
+    worst = 0.0
+    now = time.time()
+    for pid in pids:
+        try:
+            with open(os.path.join(directory, str(pid)), 'rb') as f:
+                lag, written = _LAG_FORMAT.unpack(f.read(_LAG_FORMAT.size))
+        except (OSError, struct.error):
+            continue
+        if now - written <= LAG_STALE_AFTER:
+            worst = max(worst, lag)
+    return worst
+
+
+class WorkerLoad:
+    """Load reported to LiveKit for this worker process (see report_load)
+
+    CPU comes from LiveKit's cgroup-aware monitor, averaged on a background thread.
+    Memory is the RSS of the worker and all its job processes. Loop lag is the worst
+    any of its job processes published, and sessions is the number of active jobs.
+    """
+
+    def __init__(self,
+                 max_sessions: Optional[int] = None,
+                 max_loop_lag: Optional[float] = None,
+                 memory_budget_mb: Optional[float] = None,
+                 lag_dir: str = LAG_DIR):
+        self.max_sessions = max_sessions if max_sessions is not None else WORKER_MAX_SESSIONS
+        self.max_loop_lag = max_loop_lag if max_loop_lag is not None else WORKER_MAX_LOOP_LAG
+        budget = memory_budget_mb if memory_budget_mb is not None else WORKER_MEMORY_BUDGET_MB
+        self.memory_budget_mb = budget or psutil.virtual_memory().total / (1024 * 1024)
+        self.lag_dir = lag_dir
+
+        self._process = psutil.Process()
+        self._cpu_samples = []
+        self._lock = threading.Lock()
+        self._cpu_thread: Optional[threading.Thread] = None
+        self.last: Optional[LoadSample] = None
+
+    def _sample_cpu(self):
+        from livekit.agents.utils.hw import get_cpu_monitor
+        monitor = get_cpu_monitor()
+        while True:
+            value = monitor.cpu_percent(interval=CPU_SAMPLE_INTERVAL)
+            with self._lock:
+                self._cpu_samples = (self._cpu_samples + [value])[-CPU_WINDOW:]
+
+    def cpu(self) -> float:
+        if self._cpu_thread is None:
+            self._cpu_thread = threading.Thread(target=self._sample_cpu, name='worker-load-cpu', daemon=True)
+            self._cpu_thread.start()
+        with self._lock:
+            return sum(self._cpu_samples) / len(self._cpu_samples) if self._cpu_samples else 0.0
+
+    def sample(self, sessions: int) -> LoadSample:
+        processes = [self._process]
+        try:
+            processes += self._process.children(recursive=True)
+        except psutil.Error:
+            pass
+        rss = 0
+        for process in processes:
+            try:
+                rss += process.memory_info().rss
+            except psutil.Error:
+                pass
+        rss_mb = rss / (1024 * 1024)
+        lag = read_loop_lag((p.pid for p in processes), self.lag_dir)
+        cpu = self.cpu()
+        load = score(cpu, lag, rss_mb, sessions, self.max_loop_lag, self.memory_budget_mb, self.max_sessions)
+        self.last = LoadSample(cpu, lag, rss_mb, sessions, load)
+        return self.last
+
+    def stats(self) -> Dict:
+        """Most recent load sample for monitoring"""
+        return self.last._asdict() if self.last else {}
+
+
+_worker_load: Optional[WorkerLoad] = None
+
+
+def report_load(worker=None) -> float:
+    """WorkerOptions.load_fnc: LiveKit calls this from a thread in the worker process"""
+    global _worker_load
+    if _worker_load is None:
+        _worker_load = WorkerLoad()
+    sessions = len(worker.active_jobs) if worker is not None else 0
+    return _worker_load.sample(sessions).load